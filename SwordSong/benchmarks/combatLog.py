@@ -0,0 +1,89 @@
+# Plays fights through the combat system, archives their packed logs and replays every one of them
+# Run from the SwordSong folder: python -m benchmarks.combatLog
+import json
+import tempfile
+import time
+from pathlib import Path
+from services.database import Database
+from services.combadsys import combatSystem
+from services.combatLog import decodeLog, eventNames
+from services.combatReplay import replayCombat
+from services.dungeon.randomProvider import StandardRandomProvider
+
+dataDir = Path(__file__).parent.parent / "data"
+
+# === Picks the action of a turn, a mix of attacks, skills and the odd flee attempt ===
+def chooseAction(rng, combat, userID):
+    roll = rng.randint(1, 100)
+    if roll <= 5:
+        return "flee"
+    if roll <= 40:
+        return rng.choice(list(combat.defaultSkills))
+    return None
+
+def playFights(fights: int) -> dict:
+    with open(dataDir / "areas.json") as f:
+        areas = json.load(f)
+    with open(dataDir / "items.json") as f:
+        items = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        db = Database(Path(tempDir) / "bench.db")
+        combat = combatSystem(db, areas, items, rng = StandardRandomProvider(3))
+        policy = StandardRandomProvider(4)
+        userID = "bench"
+        db.createCharacter(userID, "Bench")
+
+        for _ in range(fights):
+            db.updateCharacter(userID, {"health": 200, "maxHealth": 200, "mana": 80})
+            combat.startCombat(userID, combat.spawnMonster(userID, "forest"))
+            while True:
+                action = chooseAction(policy, combat, userID)
+                if action == "flee":
+                    if combat.attemptFlee(userID):
+                        break
+                else:
+                    result = combat.processPlayerAttack(userID, action)
+                    if "error" in result:
+                        result = combat.processPlayerAttack(userID)
+                    if result.get("monsterDefeated"):
+                        combat.distributeRewards(userID, combat.getCombatState(userID).monster)
+                        break
+                if combat.processMonsterTurn(userID).get("playerDefeated"):
+                    break
+            combat.endCombat(userID)
+        combat.flushCombatLogs()
+        db.flush()
+
+        logs = db.getCombatLogs(userID, fights)
+        db.close()
+
+    replaySystem = combatSystem(None, areas, items)
+    start = time.perf_counter()
+    results = [replayCombat(replaySystem, row[5]) for row in logs]
+    replaySeconds = time.perf_counter() - start
+
+    blobBytes = sum(len(row[5]) for row in logs)
+    jsonBytes = 0
+    for row in logs:
+        header, events = decodeLog(row[5])
+        jsonBytes += len(json.dumps({"header": header, "events": [
+            {"event": eventNames[code], "arg": arg, "turn": turn, "value": value} for code, arg, turn, value in events
+        ]}, default = str))
+
+    return {
+        "fights": len(logs),
+        "events": sum(len(result["events"]) for result in results),
+        "matches": sum(result["matches"] for result in results),
+        "bytesPerFight": blobBytes / len(logs),
+        "jsonBytesPerFight": jsonBytes / len(logs),
+        "replayMicroseconds": replaySeconds / len(logs) * 1e6
+    }
+
+if __name__ == "__main__":
+    result = playFights(1000)
+    print(
+        f"{result['fights']} fights, {result['events']} events: {result['bytesPerFight']:.0f} bytes per fight packed, "
+        f"{result['jsonBytesPerFight']:.0f} as JSON ({result['jsonBytesPerFight'] / result['bytesPerFight']:.1f}x), "
+        f"{result['matches']}/{result['fights']} replays match, {result['replayMicroseconds']:.0f} us per replay"
+    )
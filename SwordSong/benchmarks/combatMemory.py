@@ -0,0 +1,72 @@
+# Measures the memory of 10k fights in progress, free-form dicts with copied monsters against CombatSession objects
+# Run from the SwordSong folder: python -m benchmarks.combatMemory
+import gc
+import json
+import tracemalloc
+from pathlib import Path
+from services.combadsys import combatSystem, SkillCooldowns
+from services.combatLog import encodeHeader
+from services.combatSession import CombatSession
+from services.dungeon.randomProvider import StandardRandomProvider
+
+dataDir = Path(__file__).parent.parent / "data"
+combats = 10000
+
+# === The combat state startCombat used to build, with the whole monster copied into it ===
+def oldCombat(userID: str, monster: dict, skillIndex: dict, seed: int) -> dict:
+    instance = monster.copy()
+    instance["currentHealth"] = instance["health"]
+    instance["maxHealth"] = instance["health"]
+    return {
+        "userID": userID,
+        "monster": instance,
+        "turn": "player",
+        "turnCount": 1,
+        "playerEffects": {},
+        "monsterEffects": {},
+        "skillCooldowns": SkillCooldowns(skillIndex),
+        "seed": seed,
+        "rng": None,
+        "checkpointTurn": 0
+    }
+
+def newCombat(userID: str, template, skillIndex: dict, seed: int) -> CombatSession:
+    return CombatSession(userID, template, SkillCooldowns(skillIndex), seed, None)
+
+# === What startCombat really keeps, the session plus the header of its combat log ===
+def loggedCombat(userID: str, template, skillIndex: dict, seed: int) -> CombatSession:
+    session = newCombat(userID, template, skillIndex, seed)
+    session.events = encodeHeader(session, skillIndex)
+    return session
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    combatsInProgress = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del combatsInProgress
+    return size
+
+def main():
+    with open(dataDir / "areas.json") as f:
+        areas = json.load(f)
+    combat = combatSystem(None, areas, {}, rng = StandardRandomProvider(1))
+    monsters = areas["areas"]["forest"]["monsters"]
+    userIDs = [str(100000000000000000 + i) for i in range(combats)] # <= Built up front so both sides only measure the fights
+
+    # The rng streams are left out on both sides, they cost the same for each design
+    oldSize = measure(lambda: {userID: oldCombat(userID, monsters[i % len(monsters)], combat.skillIndex, i) for i, userID in enumerate(userIDs)})
+    newSize = measure(lambda: {userID: newCombat(userID, combat.monsterTemplates[monsters[i % len(monsters)]["name"]], combat.skillIndex, i) for i, userID in enumerate(userIDs)})
+    loggedSize = measure(lambda: {userID: loggedCombat(userID, combat.monsterTemplates[monsters[i % len(monsters)]["name"]], combat.skillIndex, i) for i, userID in enumerate(userIDs)})
+
+    print(f"{combats} combats in progress")
+    print(f"  dict + copied monster: {oldSize / 1024:8.0f} KiB ({oldSize / combats:.0f} bytes per combat)")
+    print(f"  CombatSession:         {newSize / 1024:8.0f} KiB ({newSize / combats:.0f} bytes per combat)")
+    print(f"  reduction:             {(1 - newSize / oldSize) * 100:.0f}%")
+    print(f"  with the log header:   {loggedSize / 1024:8.0f} KiB ({loggedSize / combats:.0f} bytes per combat), {(1 - loggedSize / oldSize) * 100:.0f}% less") # <= The old dicts had no combat log
+
+if __name__ == "__main__":
+    main()
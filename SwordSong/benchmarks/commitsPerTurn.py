@@ -0,0 +1,62 @@
+# Measures how many sqlite commits and writes a combat turn costs with and without the write-behind queue
+# Run from the SwordSong folder: python -m benchmarks.commitsPerTurn
+import json
+import tempfile
+import time
+from pathlib import Path
+from services.database import Database
+from services.combadsys import combatSystem
+from services.dungeon.randomProvider import StandardRandomProvider
+
+dataDir = Path(__file__).parent.parent / "data"
+
+def runTurns(durability: str, turns: int) -> dict:
+    with open(dataDir / "areas.json") as f:
+        areas = json.load(f)
+    with open(dataDir / "items.json") as f:
+        items = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tempDir:
+        db = Database(Path(tempDir) / "bench.db", durability = durability)
+        combat = combatSystem(db, areas, items, rng = StandardRandomProvider(1)) # <= Same fights for both modes
+        userID = "bench"
+        db.createCharacter(userID, "Bench")
+        db.updateCharacter(userID, {"health": 10 ** 9, "maxHealth": 10 ** 9, "mana": 10 ** 9})
+        db.flush()
+
+        commitsBefore = db.writes.commitCount
+        mutationsBefore = db.writes.mutationCount
+        fights = 0
+        start = time.perf_counter()
+        for turn in range(turns):
+            if not combat.getCombatState(userID):
+                combat.startCombat(userID, combat.spawnMonster(userID, "forest"))
+                fights += 1
+
+            skillName = "Power Strike" if turn % 4 == 0 else None # <= Mixes in a skill so the cooldown writes are counted as well
+            result = combat.processPlayerAttack(userID, skillName)
+            if result.get("monsterDefeated"):
+                combat.endCombat(userID)
+                continue
+            combat.processMonsterTurn(userID)
+        elapsed = time.perf_counter() - start
+        commits = db.writes.commitCount - commitsBefore
+        mutations = db.writes.mutationCount - mutationsBefore
+        db.close()
+
+        return {
+            "durability": durability,
+            "turns": turns,
+            "commits": commits,
+            "commitsPerTurn": commits / turns,
+            "writesPerTurn": mutations / turns,
+            "writesPerFight": mutations / fights,
+            "turnsPerSecond": turns / elapsed
+        }
+
+if __name__ == "__main__":
+    for durability in ("immediate", "grouped"):
+        result = runTurns(durability, 2000)
+        print(f"{result['durability']:>9}: {result['commits']:>5} commits for {result['turns']} turns "
+              f"({result['commitsPerTurn']:.2f} per turn, {result['turnsPerSecond']:.0f} turns/s), "
+              f"{result['writesPerTurn']:.2f} writes per turn, {result['writesPerFight']:.1f} per fight")
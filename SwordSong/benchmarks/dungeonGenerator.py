@@ -0,0 +1,44 @@
+# Tracks how long the dungeon generator takes as the grid grows
+# Run from the SwordSong folder: python -m benchmarks.dungeonGenerator
+import timeit
+from collections import deque
+from services.dungeon.config import DungeonConfig
+from services.dungeon.generator import DungeonGenerator, directionBits
+from services.dungeon.miniTest import MiniDungeon
+from services.dungeon.randomProvider import StandardRandomProvider
+
+sizes = [(9, 7), (25, 25), (50, 50), (100, 100), (200, 200)]
+steps = {1: -1, 2: 1, 4: 1, 8: -1}
+
+# === Checks that every room can be reached from the entrance and that every door goes both ways ===
+def reachable(layout) -> int:
+    width = layout.width
+    seen = {layout.entrance}
+    queue = deque([layout.entrance])
+    while queue:
+        cell = queue.popleft()
+        for bit in directionBits.values():
+            if layout.connections[cell] & bit:
+                neighbor = cell + (steps[bit] * width if bit in (1, 4) else steps[bit])
+                assert layout.roomTypes[neighbor], "A door leads into solid rock"
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+    return len(seen)
+
+def main():
+    for width, height in sizes:
+        config = DungeonConfig(width = width, height = height)
+        seeds = iter(range(10 ** 6))
+        repeat = 20 if width * height < 10000 else 5
+        generateSeconds = min(timeit.repeat(lambda: DungeonGenerator(config, StandardRandomProvider(next(seeds))).generate(), number = 1, repeat = repeat))
+        dungeonSeconds = min(timeit.repeat(lambda: MiniDungeon(config = config, seed = next(seeds)), number = 1, repeat = repeat))
+        layout = DungeonGenerator(config, StandardRandomProvider(1)).generate()
+        assert reachable(layout) == layout.roomCount
+        print(
+            f"{width:>3}x{height:<3}: {layout.roomCount:>6} rooms, generate {generateSeconds * 1000:7.2f} ms, "
+            f"with the grid {dungeonSeconds * 1000:7.2f} ms, main path {layout.depth[layout.goal]} steps"
+        )
+
+if __name__ == "__main__":
+    main()
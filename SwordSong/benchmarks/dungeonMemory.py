@@ -0,0 +1,70 @@
+# Measures what one dungeon costs to hold, a dict of Room objects against the flat DungeonGrid
+# Run from the SwordSong folder: python -m benchmarks.dungeonMemory
+import gc
+import timeit
+import tracemalloc
+from services.dungeon.config import DungeonConfig
+from services.dungeon.generator import DungeonGenerator, directionBits, roomTypeOrder
+from services.dungeon.grid import DungeonGrid
+from services.dungeon.models import Position
+from services.dungeon.randomProvider import StandardRandomProvider
+
+sizes = [(9, 7), (50, 50), (200, 200)]
+
+# === The Room MiniDungeon used to keep per cell, with its own connections dict ===
+class OldRoom:
+    def __init__(self, roomType, position, config):
+        self.roomType = roomType
+        self.position = position
+        self.config = config
+        self.visited = False
+        self.cleared = False
+        self.connections = {d: False for d in ("north", "south", "east", "west")}
+
+def oldRooms(layout, roomData) -> dict:
+    rooms = {}
+    width = layout.width
+    for cell, code in enumerate(layout.roomTypes):
+        if not code:
+            continue
+        position = Position(cell % width, cell // width)
+        roomType = roomTypeOrder[code - 1]
+        room = OldRoom(roomType, position, roomData[roomType])
+        mask = layout.connections[cell]
+        for direction, bit in directionBits.items():
+            room.connections[direction] = bool(mask & bit)
+        rooms[position] = room
+    return rooms
+
+# The layout arrays are copied on the grid side, so both sides pay for everything they keep
+def newGrid(layout, roomData) -> DungeonGrid:
+    return DungeonGrid(layout.width, layout.height, bytearray(layout.roomTypes), bytearray(layout.connections), roomData)
+
+def measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    dungeon = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del dungeon
+    return size
+
+def main():
+    for width, height in sizes:
+        config = DungeonConfig(width = width, height = height)
+        layout = DungeonGenerator(config, StandardRandomProvider(1)).generate()
+        newGrid(layout, config.roomData) # <= Warms up the emoji tables and the imports outside of the measurement
+        oldSize = measure(lambda: oldRooms(layout, config.roomData))
+        newSize = measure(lambda: newGrid(layout, config.roomData))
+        repeat = 20 if width * height < 10000 else 5
+        oldSeconds = min(timeit.repeat(lambda: oldRooms(layout, config.roomData), number = 1, repeat = repeat))
+        newSeconds = min(timeit.repeat(lambda: newGrid(layout, config.roomData), number = 1, repeat = repeat))
+        print(
+            f"{width:>3}x{height:<3} ({layout.roomCount:>5} rooms): Room dict {oldSize / 1024:9.1f} KiB {oldSeconds * 1000:7.2f} ms, "
+            f"grid {newSize / 1024:7.1f} KiB {newSeconds * 1000:6.3f} ms, {(1 - newSize / oldSize) * 100:.0f}% less memory"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Compares starting a dungeon from the pool with generating it on the event loop, at a steady rate of .dungeon commands
+# Run from the SwordSong folder: python -m benchmarks.dungeonPool
+import asyncio
+import time
+from services.dungeon.config import DungeonConfig
+from services.dungeon.miniTest import MiniDungeon
+from services.dungeon.pool import DungeonPool
+from services.dungeon.randomProvider import StandardRandomProvider
+
+sizes = [(9, 7), (50, 50), (100, 100)]
+starts = 40
+interval = 0.05 # <= Seconds between two .dungeon commands
+
+def percentile(samples, share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+async def measure(width: int, height: int):
+    config = DungeonConfig(width = width, height = height)
+    seeds = StandardRandomProvider(1)
+    inline = []
+    for _ in range(starts):
+        start = time.perf_counter()
+        MiniDungeon(config = config, seed = seeds.randint(0, 2 ** 32 - 1))
+        inline.append(time.perf_counter() - start)
+
+    pool = DungeonPool(StandardRandomProvider(1), size = 8, workers = 1)
+    pool.warm(config)
+    while pool.stats()["ready"] < pool.size:
+        await asyncio.sleep(0.01)
+    pooled = []
+    for _ in range(starts):
+        start = time.perf_counter()
+        await pool.take(config)
+        pooled.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    stats = pool.stats()
+    pool.close()
+
+    print(
+        f"{width:>3}x{height:<3}: inline p50 {percentile(inline, 0.5) * 1000:6.2f} ms p95 {percentile(inline, 0.95) * 1000:6.2f} ms, "
+        f"pool p50 {percentile(pooled, 0.5) * 1000:6.3f} ms p95 {percentile(pooled, 0.95) * 1000:6.3f} ms, "
+        f"hit rate {stats['hitRate'] * 100:3.0f}%, refill {stats['refillAvgMs']:6.1f} ms avg {stats['refillMaxMs']:6.1f} ms max"
+    )
+
+def main():
+    for width, height in sizes:
+        asyncio.run(measure(width, height))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Compares drawing the whole map on every move with the row cached renderer, along a random walk
+# Run from the SwordSong folder: python -m benchmarks.mapRenderer
+import random
+import time
+from services.dungeon.config import DungeonConfig
+from services.dungeon.miniTest import MiniDungeon
+
+sizes = [(9, 7), (50, 50), (200, 200)]
+moves = 500
+
+# === What getASCII used to do: every cell of the grid concatenated again on every call ===
+def fullMap(dungeon: MiniDungeon) -> str:
+    grid = dungeon.grid
+    out = []
+    for y in range(grid.height):
+        line = ""
+        for cell in range(y * grid.width, (y + 1) * grid.width):
+            if cell == dungeon.playerCell:
+                line += "👤"
+            elif grid.isVisited(cell):
+                line += grid.emoji(cell)
+            else:
+                line += "🟫"
+        out.append(line)
+    return "\n".join(out)
+
+def walk(dungeon: MiniDungeon, draw) -> float:
+    rng = random.Random(7)
+    elapsed = 0.0
+    for _ in range(moves):
+        if rng.random() < 0.2:
+            dungeon.currentRoom.clear()
+        else:
+            dungeon.movePlayer(rng.choice(("north", "south", "east", "west")))
+        start = time.perf_counter()
+        draw(dungeon)
+        elapsed += time.perf_counter() - start
+    return elapsed / moves
+
+def main():
+    for width, height in sizes:
+        config = DungeonConfig(width = width, height = height)
+        fullSeconds = walk(MiniDungeon(config = config, seed = 1), fullMap)
+        cached = MiniDungeon(config = config, seed = 1)
+        cachedSeconds = walk(cached, MiniDungeon.getASCII)
+        print(
+            f"{width:>3}x{height:<3}: full map {fullSeconds * 1e6:9.1f} us ({len(fullMap(cached)):>6} chars), "
+            f"row cache {cachedSeconds * 1e6:6.1f} us ({len(cached.getASCII()):>3} chars), "
+            f"{cached.renderer.rowsDrawn / moves:.2f} rows drawn per move"
+        )
+
+if __name__ == "__main__":
+    main()
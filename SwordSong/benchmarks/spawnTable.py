@@ -0,0 +1,46 @@
+# Compares the old weighted list spawn with the compiled alias spawn table
+# Run from the SwordSong folder: python -m benchmarks.spawnTable
+import random
+import timeit
+from collections import Counter
+from services.spawnTable import SpawnTable
+
+rarityWeight = {"common": 60, "uncommon": 25, "rare": 12, "legendary": 3}
+rarities = ["common", "uncommon", "rare", "legendary"]
+
+def makeMonsters(count: int) -> list:
+    rng = random.Random(count)
+    monsters = [{"name": f"Monster {i}", "rarity": rng.choice(rarities)} for i in range(count)]
+    monsters += [{"name": f"Boss {i}", "rarity": "boss"} for i in range(max(1, count // 50))]
+    return monsters
+
+# === The way spawnMonster picked a monster before the spawn tables ===
+def oldSpawn(monsters: list) -> dict:
+    availableMonsters = []
+    for monster in monsters:
+        if monster["rarity"] != "boss":
+            availableMonsters.extend([monster] * rarityWeight[monster["rarity"]])
+    return random.choice(availableMonsters)
+
+def maxShareError(table: SpawnTable, draws: int) -> float:
+    counts = Counter(table.spawnRegular()["name"] for _ in range(draws))
+    total = sum(rarityWeight[monster["rarity"]] for monster in table.regular)
+    return max(abs(counts[monster["name"]] / draws - rarityWeight[monster["rarity"]] / total) for monster in table.regular)
+
+def main():
+    random.seed(7)
+    spawns = 2000
+    for count in (7, 100, 500):
+        monsters = makeMonsters(count)
+        compileSeconds = min(timeit.repeat(lambda: SpawnTable(monsters, rarityWeight), number = 1, repeat = 5))
+        table = SpawnTable(monsters, rarityWeight)
+        oldSeconds = min(timeit.repeat(lambda: oldSpawn(monsters), number = spawns, repeat = 5))
+        newSeconds = min(timeit.repeat(table.spawnRegular, number = spawns, repeat = 5))
+        print(
+            f"{count:>4} monsters: old {oldSeconds / spawns * 1e6:8.2f} us/spawn, "
+            f"alias {newSeconds / spawns * 1e6:6.2f} us/spawn ({oldSeconds / newSeconds:.0f}x), "
+            f"compile {compileSeconds * 1000:.2f} ms, max share error {maxShareError(table, 200000):.4f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Compares the timer wheel with scanning a dict of deadlines, for the idle sessions of the reaper
+# Run from the SwordSong folder: python -m benchmarks.timerWheel
+import random
+import time
+from services.timerWheel import TimerWheel
+
+timeout = 300.0
+
+# === What a reaper without the wheel would do: one deadline per session and a full scan every tick ===
+class ScanReaper:
+    def __init__(self):
+        self.deadlines = {}
+
+    def schedule(self, key, delay, now):
+        self.deadlines[key] = now + delay
+
+    def cancel(self, key):
+        return self.deadlines.pop(key, None) is not None
+
+    def advance(self, now):
+        expired = [key for key, deadline in self.deadlines.items() if deadline <= now]
+        for key in expired:
+            del self.deadlines[key]
+        return expired
+
+# === Every session gets touched a few times, half of them end on their own and the rest is reaped ===
+def run(timers, sessions: int, seconds: int) -> tuple:
+    rng = random.Random(sessions)
+    now = 0.0
+    operations = 0
+    reaped = 0
+    tickTime = 0.0
+    perSecond = sessions // seconds
+    start = time.perf_counter()
+    for second in range(seconds + int(timeout) + 1):
+        now = float(second)
+        if second < seconds:
+            for index in range(perSecond):
+                key = second * perSecond + index
+                timers.schedule(key, timeout, now)
+                operations += 1
+            for _ in range(perSecond * 4):
+                key = rng.randrange((second + 1) * perSecond)
+                if rng.random() < 0.1:
+                    timers.cancel(key)
+                else:
+                    timers.schedule(key, timeout, now)
+                operations += 1
+        tickStart = time.perf_counter()
+        reaped += len(timers.advance(now))
+        tickTime += time.perf_counter() - tickStart
+    total = time.perf_counter() - start
+    return (total - tickTime) / operations, tickTime / (seconds + int(timeout) + 1), reaped
+
+def main():
+    for sessions in (1000, 10000, 100000):
+        seconds = 600
+        scanOp, scanTick, scanReaped = run(ScanReaper(), sessions, seconds)
+        wheelOp, wheelTick, wheelReaped = run(TimerWheel(1.0, 512), sessions, seconds)
+        print(
+            f"{sessions:>6} sessions: scan {scanOp * 1e6:.2f} us/op {scanTick * 1e6:8.1f} us/tick, "
+            f"wheel {wheelOp * 1e6:.2f} us/op {wheelTick * 1e6:6.1f} us/tick ({scanTick / wheelTick:.0f}x), "
+            f"reaped {scanReaped}/{wheelReaped}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# Compares the old f-string UPDATE path with the cached UpdateBuilder
+# Run from the SwordSong folder: python -m benchmarks.updateBuilder
+import random
+import sqlite3
+import timeit
+from services.migrations import runMigrations
+from services.updateBuilder import UpdateBuilder
+
+columns = ["health", "mana", "coins", "xp", "level", "attack", "defense"]
+
+def makeUpdates(count: int) -> list:
+    rng = random.Random(1)
+    updates = []
+    for _ in range(count):
+        keys = rng.sample(columns, rng.randint(1, 4))
+        rng.shuffle(keys) # <= Callers pass the keys in any order
+        updates.append({key: rng.randint(1, 100) for key in keys})
+    return updates
+
+def oldBuild(userID: str, updates: dict):
+    setValues = ", ".join([f"{k} = ?" for k in updates.keys()])
+    query = f"UPDATE characters SET {setValues} WHERE userID = ?"
+    values = list(updates.values()) + [userID]
+    return query, values
+
+def main():
+    conn = sqlite3.connect(":memory:", cached_statements = 256)
+    runMigrations(conn)
+    conn.executemany("INSERT INTO characters (userID, name) VALUES (?, ?)", [(str(i), f"bench{i}") for i in range(100)])
+    conn.commit()
+    builder = UpdateBuilder.fromSchema(conn, "characters", "userID")
+    updates = makeUpdates(10000)
+
+    def runOld():
+        for i, update in enumerate(updates):
+            conn.execute(*oldBuild(str(i % 100), update))
+
+    def runBuilder():
+        for i, update in enumerate(updates):
+            conn.execute(*builder.build(str(i % 100), update))
+
+    oldStatements = len({oldBuild("0", update)[0] for update in updates})
+    newStatements = len({builder.build("0", update)[0] for update in updates})
+    print(f"distinct statements: old {oldStatements}, builder {newStatements}")
+
+    for name, func in (("old f-string", runOld), ("UpdateBuilder", runBuilder)):
+        seconds = min(timeit.repeat(func, number = 1, repeat = 5))
+        print(f"{name:>13}: {seconds * 1000:.1f} ms for {len(updates)} updates ({len(updates) / seconds:.0f}/s)")
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,18 @@ class CombatCog(commands.Cog):
         self.bot = bot
         self.db = bot.db
         self.combat = bot.combatSystem
+        bot.reaper.register("combat", self.reapCombats)
+
+    # === Ends the fights the reaper found idle, like the ones whose message never got sent ===
+    async def reapCombats(self, userIDs):
+        ended = await self.db.run(self.combat.reapCombats, userIDs)
+        print(f"Reaped {ended} abandoned fights")
         
     @commands.command(name = "fight")
     async def fight(self, ctx):
         print("The fight command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
+        character = await self.db.getCharacter(userID)
 
         if not character:
             embed = discord.Embed(
@@ -25,7 +31,16 @@ class CombatCog(commands.Cog):
             )
             await ctx.send(embed = embed)
             return
-        if self.combat.getCombatState(userID):
+        combatState = await self.db.run(self.combat.loadCombat, userID) # <= Brings back a fight that was running before a restart
+        if combatState and combatState.resumed:
+            combatState.resumed = False
+            combatView = CombatView(self.bot, userID)
+            embed = await combatView.updateEmbed()
+            embed.title = "⚔️ Your fight continues! ⚔️"
+            message = await ctx.send(embed = embed, view = combatView)
+            combatView.message = message
+            return
+        if combatState:
             embed = discord.Embed(
                 title = "You are already in combat!",
                 description = "You're already fighting a monster, watch out!",
@@ -43,7 +58,7 @@ class CombatCog(commands.Cog):
             return
         
         currentArea = character.get("currentArea", "forest")
-        monster = self.combat.spawnMonster(userID, currentArea)
+        monster = await self.db.run(self.combat.spawnMonster, userID, currentArea)
         if not monster:
             embed = discord.Embed(
                 title = f"There were no monsters found in {currentArea}!",
@@ -53,19 +68,19 @@ class CombatCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
-        combatState = self.combat.startCombat(userID, monster)
+        combatState = await self.db.run(self.combat.startCombat, userID, monster)
         combatView = CombatView(self.bot, userID)
         embed = discord.Embed(
             title = "❗Watch out! You ran into a monster❗",
-            description = f"A wild **{monster["name"]}** appears!\n\n{monster["description"]}",
+            description = f"A wild **{monster.name}** appears!\n\n{monster.description}",
             color = discord.Color.dark_red()
         )
         embed.add_field(
             name = "Monster's Stats",
-            value = f"❤️ Health: {monster["currentHealth"]}/{monster["maxHealth"]}\n"
-                    f"⚔️ Attack: {monster["attack"]}\n"
-                    f"🛡️ Defense: {monster["defense"]}\n"
-                    f"🌟 Rarity: {monster["rarity"]}",
+            value = f"❤️ Health: {combatState.monsterHealth}/{monster.health}\n"
+                    f"⚔️ Attack: {monster.attack}\n"
+                    f"🛡️ Defense: {monster.defense}\n"
+                    f"🌟 Rarity: {monster.rarity}",
             inline = True
         )
         embed.add_field(
@@ -85,9 +100,7 @@ class CombatCog(commands.Cog):
     async def rest(self, ctx):
         print("The rest command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
-        currentHealth = character["health"]
-        maxHealth = character["maxHealth"]
+        character = await self.db.getCharacter(userID)
         ticks = 10
         percentPerTick = 10
         if not character:
@@ -99,6 +112,18 @@ class CombatCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
+        # The fight holds the character in memory, so resting now would be overwritten when it ends
+        if await self.db.run(self.combat.loadCombat, userID):
+            embed = discord.Embed(
+                title = "You can't rest in the middle of a fight!",
+                description = "There's a monster right in front of you! Finish the fight or flee before you rest.",
+                color = discord.Color.red()
+            )
+            await ctx.send(embed = embed)
+            return
+
+        currentHealth = character["health"]
+        maxHealth = character["maxHealth"]
         if currentHealth >= maxHealth:
             embed = discord.Embed(
                 title = "You are already at full health!",
@@ -121,9 +146,11 @@ class CombatCog(commands.Cog):
         message = await ctx.send(embed = embed)
 
         for i in range(ticks):
+            if self.combat.getCombatState(userID):
+                break # <= A fight started while resting
             healAmount = int(maxHealth * (percentPerTick / maxHealth))
             newHealth = min(currentHealth + healAmount, maxHealth)
-            self.db.updateCharacter(userID, {"health": newHealth})
+            await self.db.updateCharacter(userID, {"health": newHealth})
             currentHealth = newHealth
             
             embed.set_field_at(
@@ -1,7 +1,7 @@
 import discord
 import asyncio
 from discord.ext import commands
-from view.commandsView import HelpView, StartView, ProfileView, InventoryView, LeaveGuildView
+from view.commandsView import HelpView, StartView, ProfileView, InventoryView, LeaveGuildView, profileEmbed, inventoryEmbed
 
 class CommandsCog(commands.Cog):
     def __init__(self, bot):
@@ -52,8 +52,8 @@ class CommandsCog(commands.Cog):
     async def profile(self, ctx):
         print("Profile command was called by", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
-        if not character:
+        snapshot = await self.db.getPlayerSnapshot(userID)
+        if not snapshot:
             embed = discord.Embed(
                 title = "You're not part of the guild.",
                 description = "You're not part of SwordSong, so you're not able to view the guilds profile system.",
@@ -62,24 +62,8 @@ class CommandsCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
-        embed = discord.Embed(
-            title = f"{character["name"]}'s Profile",
-            color = discord.Color.blue()
-        )
-
-        embed.add_field(name = "📈 Level", value = character["level"], inline = True)
-        embed.add_field(name = "✨ XP", value = f"{character['xp']}/{character['xpToLevel']}", inline = True)
-        embed.add_field(name = "🌲 Area", value = character.get("currentArea", "forest").capitalize(), inline = True)
-
-        embed.add_field(name = "❤️ Health", value = f"{character['health']}/{character['maxHealth']}", inline = True)
-        embed.add_field(name = "⚔️ Attack", value = character["attack"], inline = True)
-        embed.add_field(name = "🛡️ Defense", value = character["defense"], inline = True)
-
-        embed.add_field(name = "💰 Coins", value = f"{character['coins']} coins", inline = True)
-        embed.add_field(name = "🔮 Mana", value = f"{character.get('mana', 50)}/{character.get('maxMana', 50)}", inline = True)
-        embed.add_field(name = "\u200b", value = "\u200b", inline = True)
-
-        view = ProfileView(self.bot, character)
+        embed = profileEmbed(snapshot)
+        view = ProfileView(self.bot, snapshot)
         message = await ctx.send(embed = embed, view = view)
         view.message = message
 
@@ -87,8 +71,8 @@ class CommandsCog(commands.Cog):
     async def inventory(self, ctx):
         print("inventory command was called by", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
-        if not character:
+        snapshot = await self.db.getPlayerSnapshot(userID)
+        if not snapshot:
             embed = discord.Embed(
                 title = "You're not part of the guild",
                 description = "You're not part of SwordSong, so you don't have the guild's magic backpack.",
@@ -97,62 +81,8 @@ class CommandsCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
-        equipment = self.db.getEquipment(userID)
-        items = self.db.getInventory(userID)
-        equipText = "\n".join([f"{slot.title()}: {item or 'Empty'}" for slot, item in equipment.items()])
-        embed = discord.Embed(
-            title = f"{character['name']}'s Inventory",
-            color = discord.Color.blue()
-        )
-        embed.add_field(
-            name = "🛡️ Equipment 🛡️",
-            value = equipText or "No Equipment",
-            inline = False
-        )
-
-        if items:
-            itemsList = [f"{name}: {qty}" for name, qty in items]
-            if len(itemsList) > 10:
-                mid = len(itemsList) // 2
-                firstHalf = "\n".join(itemsList[:mid])
-                secondHalf = "\n".join(itemsList[mid:])
-
-                embed.add_field(
-                    name = "🎒 Items ",
-                    value = firstHalf,
-                    inline = True
-                )
-                embed.add_field(
-                    name = " Items 🎒",
-                    value = secondHalf,
-                    inline = True
-                )
-            else:
-                embed.add_field(
-                    name = "🎒 Items 🎒",
-                    value = "\n".join(itemsList),
-                    inline = True
-                )
-        
-            embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{character['coins']} coins",
-                inline = True
-            )
-        else:
-            embed.add_field(
-                name = "🎒 Items 🎒",
-                value = "Empty",
-                inline = True
-            )
-            embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{character['coins']} coins",
-                inline = True
-            )
-
-        embed.set_footer(text = f"Current Area: {character.get('currentArea', 'forest').capitalize()}")
-        view = InventoryView(self.bot, character)
+        embed = inventoryEmbed(snapshot)
+        view = InventoryView(self.bot, snapshot)
         message = await ctx.send(embed = embed, view = view)
         view.message = message
     
@@ -160,7 +90,7 @@ class CommandsCog(commands.Cog):
     async def leaveguild(self, ctx):
         print("Character reset command was called by", ctx.author.name)
         userID = str(ctx.author.id)
-        if not self.db.getCharacter(userID):
+        if not await self.db.getCharacter(userID):
             embed = discord.Embed(
                 title = "You're already not part of the guild!",
                 description = "You're not part of SwordSong, so you're not able to leave the guild.",
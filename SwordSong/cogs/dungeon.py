@@ -1,20 +1,42 @@
+import time
 import discord
 from discord.ext import commands
 from services.dungeon.miniTest import MiniDungeon
 from services.dungeon.randomProvider import StandardRandomProvider
-from view.dungeonView import DungeonView, dungeonView
+from view.dungeonView import DungeonView, dungeonView, resumeDungeonView
 
 class DungeonCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
         self.activeDungeon = {}
+        self.dungeonResumeWindow = 3600 # <= Seconds a checkpointed run can still be resumed after a restart or reap
+        bot.reaper.register("dungeon", self.reapDungeons)
+
+    # === Brings back the checkpointed run of the user, None when there is none or it can't be resumed ===
+    async def resumeDungeon(self, userID: str):
+        row = await self.db.getDungeon(userID)
+        if not row:
+            return None
+        state, updatedAt = row
+        view = resumeDungeonView(self.bot, userID, state) if time.time() - updatedAt <= self.dungeonResumeWindow else None
+        if view is None:
+            await self.db.deleteDungeon(userID) # <= Too old, or the dungeon config changed so the seed gives another layout
+        return view
+
+    # === Drops the dungeons the reaper found idle, their checkpoints stay so the run can be resumed ===
+    async def reapDungeons(self, userIDs):
+        for userID in userIDs:
+            view = self.activeDungeon.pop(userID, None)
+            if view and not view.is_finished():
+                view.stop()
+        print(f"Reaped {len(userIDs)} abandoned dungeons")
 
     @commands.command(name = "dungeon")
     async def dungeonCommand(self, ctx):
         print("Dungeon command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
+        character = await self.db.getCharacter(userID)
         if not character:
             embed = discord.Embed(
                 title = "You're not part of the guild!",
@@ -24,6 +46,10 @@ class DungeonCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
+        if userID in self.activeDungeon and self.activeDungeon[userID].is_finished():
+            del self.activeDungeon[userID] # <= The dungeon was left or timed out without another button press
+            self.bot.reaper.release("dungeon", userID)
+
         if userID in self.activeDungeon:
             embed = discord.Embed(
                 title = "🪨 Already in a Dungeon! 🪨",
@@ -43,15 +69,21 @@ class DungeonCog(commands.Cog):
             return
         
         try:
-            view = dungeonView(self.bot, userID)
-            embed = view.createDungeonEmbed()
+            view = await self.resumeDungeon(userID)
+            resumed = view is not None
+            if not resumed:
+                view = await dungeonView(self.bot, userID)
+            embed = await view.createDungeonEmbed()
             embed.set_footer(text = "💡 Use the buttons below to navigate and interact!")
 
             message = await ctx.send(embed = embed, view = view)
             view.message = message
             self.activeDungeon[userID] = view
-            view.addToActionLog("You entered the dungeon!")
-            updatedEmbed = view.createDungeonEmbed()
+            self.bot.reaper.track("dungeon", userID)
+            view.addToActionLog("You found your way back into the dungeon!" if resumed else "You entered the dungeon!")
+            if not resumed:
+                await view.saveProgress()
+            updatedEmbed = await view.createDungeonEmbed()
             updatedEmbed.set_footer(text = "💡 Use the buttons below to navigate and interact!")
             await message.edit(embed = updatedEmbed, view = view)
         except Exception as e:
@@ -67,7 +99,7 @@ class DungeonCog(commands.Cog):
     async def dungeonInfo(self, ctx):
         print("Dungeon Info command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
+        character = await self.db.getCharacter(userID)
         if not character:
             embed = discord.Embed(
                 title = "You're not part of the guild!",
@@ -123,6 +155,9 @@ class DungeonCog(commands.Cog):
                 view = self.activeDungeon[userID]
                 if view.is_finished():
                     del self.activeDungeon[userID]
+                    self.bot.reaper.release("dungeon", userID)
+                else:
+                    self.bot.reaper.touch("dungeon", userID)
 
 async def setup(bot):
     await bot.add_cog(DungeonCog(bot))
\ No newline at end of file
@@ -8,14 +8,13 @@ class ShopCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
-        self.shopItems = bot.shopItems
-        self.areas = bot.areas
+        self.catalog = bot.catalog
 
     @commands.command(name="shop")
     async def shop(self, ctx, page: int = 1):
         print("Shop command was called by:", ctx.author)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
+        character = await self.db.getCharacter(userID)
         
         if not character:
             embed = discord.Embed(
@@ -26,15 +25,14 @@ class ShopCog(commands.Cog):
             return await ctx.send(embed = embed)
         
         view = ShopView(self.bot, userID, page)
-        embed = view.createEmbed()
+        embed = await view.createEmbed()
         await ctx.send(embed = embed, view = view)
     
     @commands.command(name = "buy")
     async def buy(self, ctx, *, itemName: str):
         print("Buy command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
-        shopItems = self.shopItems
+        character = await self.db.getCharacter(userID)
         if not character:
             embed = discord.Embed(
                 title = "You're not in the guild.",
@@ -44,7 +42,7 @@ class ShopCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
-        item = next((item for item in shopItems if item["name"].lower() == itemName.lower()), None)
+        item = self.catalog.shopItem(itemName)
 
         if not item:
             embed = discord.Embed(
@@ -63,10 +61,7 @@ class ShopCog(commands.Cog):
             await ctx.send(embed = embed)
             return
         
-        if self.db.addItem(userID, item["name"], 1):
-            newCoins = character["coins"] - item["buyPrice"]
-            self.db.updateCharacter(userID, {"coins": newCoins})
-
+        if await self.db.buyItem(userID, item["name"], item["buyPrice"]):
             embed = discord.Embed(
                 title = "Thank you for your purchase!",
                 description = f"You bought {item['name']} for {item['buyPrice']} coins!",
@@ -85,9 +80,8 @@ class ShopCog(commands.Cog):
     async def sell(self, ctx, *, itemName: str):
         print("Sell command was called by:", ctx.author.name)
         userID = str(ctx.author.id)
-        character = self.db.getCharacter(userID)
-        shopItems = self.shopItems
-        inventory = self.db.getInventory(userID)
+        character = await self.db.getCharacter(userID)
+        inventory = await self.db.getInventory(userID)
         inventoryDict = dict(inventory) if inventory else {}
 
         if not character:
@@ -114,25 +108,7 @@ class ShopCog(commands.Cog):
             await ctx.send(embed = embed)
             return
 
-        item = None
-        for shopItem in shopItems:
-            if shopItem["name"].lower() == actualItemName.lower():
-                item = shopItem
-                break
-        
-        if not item:
-            for area in self.areas.values():
-                for monster in area["monsters"]:
-                    loot = monster["lootTable"].get(actualItemName)
-                    if loot:
-                        item = {
-                            "name": actualItemName,
-                            "sellPrice": loot["sellPrice"],
-                            "desciption": loot["description"]
-                        }
-                        break
-                if item:
-                    break
+        item = self.catalog.sellableItem(actualItemName)
 
         if not item:
             embed = discord.Embed(
@@ -154,11 +130,8 @@ class ShopCog(commands.Cog):
             await ctx.send(embed = embed)
             return
 
-        removalSuccess = self.db.removeItem(userID, actualItemName, 1)
-        if removalSuccess:
-            newCoins = character["coins"] + sellPrice
-            self.db.updateCharacter(userID, {"coins": newCoins})
-    
+        saleSuccess = await self.db.sellItem(userID, actualItemName, sellPrice)
+        if saleSuccess:
             embed = discord.Embed(
                 title = "Item sold!",
                 description = f"You sold **{actualItemName}** for {sellPrice} coins!",
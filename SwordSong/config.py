@@ -14,6 +14,26 @@ dataDir = botDir / "data"
 dataDir.mkdir(exist_ok = True)
 dataBasePath = Path(os.getenv("dataBasePath", dataDir / "game.db"))
 
+# === Database durability knobs ===
+dbDurability = os.getenv("dbDurability", "grouped") # <= "grouped" batches the frequent writes into one commit, "immediate" commits every write
+dbFlushInterval = float(os.getenv("dbFlushInterval", 0.25)) # <= The max amount of seconds a grouped write waits before it's committed
+dbMaxPendingWrites = int(os.getenv("dbMaxPendingWrites", 100)) # <= Commits early once this many writes are waiting
+dbSynchronous = os.getenv("dbSynchronous", "NORMAL") # <= Use FULL to fsync every commit
+
+# === Character cache limits ===
+characterCacheSize = int(os.getenv("characterCacheSize", 1024)) # <= Max amount of characters kept in memory
+characterCacheTTL = float(os.getenv("characterCacheTTL", 300)) # <= Seconds before an idle character is loaded from the database again
+
+# === Session reaper ===
+sessionTimeout = float(os.getenv("sessionTimeout", 300)) # <= Idle seconds before an abandoned fight or dungeon is ended, keep it above the 180 second view timeouts
+
+# === Dungeon pool ===
+dungeonPoolSize = int(os.getenv("dungeonPoolSize", 4)) # <= Dungeons generated ahead of time per dungeon config
+dungeonPoolWorkers = int(os.getenv("dungeonPoolWorkers", 1)) # <= Worker processes that refill the pool
+
+# === Randomness ===
+rngSeed = int(os.getenv("rngSeed")) if os.getenv("rngSeed") else None # <= Set it to replay the same spawns, fights and dungeons
+
 intents = discord.Intents.default()
 intents.members = True
 intents.message_content = True
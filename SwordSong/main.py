@@ -1,8 +1,14 @@
 import discord
-from config import TOKEN, botDir, dataDir, intents, dataBasePath, initialExtensions
+from config import TOKEN, botDir, dataDir, intents, dataBasePath, initialExtensions, dbDurability, dbFlushInterval, dbMaxPendingWrites, dbSynchronous, characterCacheSize, characterCacheTTL, rngSeed, sessionTimeout, dungeonPoolSize, dungeonPoolWorkers
 from discord.ext import commands
-from services.database import Database
+from services.asyncDatabase import AsyncDatabase
 from services.combadsys import combatSystem
+from services.catalog import GameCatalog
+from services.levelCurve import LevelCurve
+from services.dungeon.defaults import defaultDungeonConfig
+from services.dungeon.pool import DungeonPool
+from services.dungeon.randomProvider import StandardRandomProvider
+from services.sessionReaper import SessionReaper
 import json
 import os
 import sys
@@ -13,6 +19,8 @@ try:
         areas = json.load(f)
     with open(dataDir / 'items.json', 'r') as f:
         items = json.load(f)
+    with open(dataDir / 'levels.json', 'r') as f:
+        levels = json.load(f)
 except FileNotFoundError as e:
     print(f"Error the required JSON file was not found: {e}")
     exit(1)
@@ -26,12 +34,28 @@ client = commands.Bot(
     help_command=None,
    case_insensitive=True
 )
-db = Database(dataBasePath)
-combatSystems = combatSystem(db, areas, items)
+rng = StandardRandomProvider(rngSeed) # <= Root stream, every combat and dungeon session gets its own seed from it
+dungeonPool = DungeonPool(rng, dungeonPoolSize, dungeonPoolWorkers) # <= Takes one draw from the root stream to seed its own, before anything else reads it
+dungeonPool.warm(defaultDungeonConfig) # <= Forks the workers now, before the database starts its threads
+db = AsyncDatabase(
+    dataBasePath,
+    durability = dbDurability,
+    flushInterval = dbFlushInterval,
+    maxPendingWrites = dbMaxPendingWrites,
+    synchronous = dbSynchronous,
+    cacheSize = characterCacheSize,
+    cacheTTL = characterCacheTTL
+)
+reaper = SessionReaper(sessionTimeout) # <= The cogs register how their sessions are ended
+combatSystems = combatSystem(db.sync, areas, items, rng = rng, reaper = reaper, levelCurve = LevelCurve(levels)) # <= Combat logic is blocking, so the cogs run it through db.run()
 client.db = db
 client.combatSystem = combatSystems
+client.rng = rng
+client.reaper = reaper
+client.dungeonPool = dungeonPool
 client.shopItems = items["shop"]
 client.areas = areas["areas"]
+client.catalog = GameCatalog(areas, items) # <= Name indexes for the shop, loot and monsters
 
 async def loadExtensions():
     for ext in initialExtensions:
@@ -57,7 +81,14 @@ async def on_command_error(ctx, error):
 
 async def main():
     await loadExtensions()
-    await client.start(TOKEN)
+    reaper.start()
+    try:
+        await client.start(TOKEN)
+    finally:
+        await reaper.stop()
+        await db.run(combatSystems.flushCombatLogs) # <= The last batch of combat logs isn't full yet
+        await db.close()
+        dungeonPool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from .database import Database
+
+class AsyncDatabase:
+    def __init__(self, dataPath, maxWorkers: int = 4, **options):
+        # Every query runs on the executor threads, the reads spread over the reader pool while the writes queue on the writer
+        self._executor = ThreadPoolExecutor(max_workers = maxWorkers, thread_name_prefix = "swordsong-db")
+        self.sync: Database = self._executor.submit(Database, dataPath, maxWorkers, **options).result()
+
+    # === Runs a blocking call on the database executor ===
+    async def run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    # === Runs func(db, *args) as one unit of work on the database executor ===
+    async def runInTransaction(self, func, *args):
+        def unitOfWork():
+            with self.sync.transaction():
+                return func(self.sync, *args)
+        return await self.run(unitOfWork)
+
+    # === Character methods ===
+    async def createCharacter(self, userID: str, name: str) -> bool:
+        return await self.run(self.sync.createCharacter, userID, name)
+
+    async def getCharacter(self, userID: str) -> dict:
+        return await self.run(self.sync.getCharacter, userID)
+
+    async def updateCharacter(self, userID: str, updates: dict) -> bool:
+        return await self.run(self.sync.updateCharacter, userID, updates)
+
+    async def deleteCharacter(self, userID: str) -> bool:
+        return await self.run(self.sync.deleteCharacter, userID)
+
+    # === Inventory and equipment methods ===
+    async def getInventory(self, userID: str) -> list:
+        return await self.run(self.sync.getInventory, userID)
+
+    async def addItem(self, userID: str, itemName: str, quantity: int = 1) -> bool:
+        return await self.run(self.sync.addItem, userID, itemName, quantity)
+
+    async def addItems(self, userID: str, items: list[tuple[str, int]]) -> bool:
+        return await self.run(self.sync.addItems, userID, items)
+
+    async def removeItem(self, userID: str, itemName: str, quantity: int = 1) -> bool:
+        return await self.run(self.sync.removeItem, userID, itemName, quantity)
+
+    async def equipItem(self, userID: str, slot: str, itemName: str) -> bool:
+        return await self.run(self.sync.equipItem, userID, slot, itemName)
+
+    async def getEquipment(self, userID: str) -> dict[str, str]:
+        return await self.run(self.sync.getEquipment, userID)
+
+    async def unequipItem(self, userID: str, slot: str) -> bool:
+        return await self.run(self.sync.unequipItem, userID, slot)
+
+    # === Shop methods ===
+    async def buyItem(self, userID: str, itemName: str, price: int) -> bool:
+        return await self.run(self.sync.buyItem, userID, itemName, price)
+
+    async def sellItem(self, userID: str, itemName: str, price: int) -> bool:
+        return await self.run(self.sync.sellItem, userID, itemName, price)
+
+    # === Fight stats and skill cooldown methods ===
+    async def initializeFightStats(self, userID: str) -> bool:
+        return await self.run(self.sync.initializeFightStats, userID)
+
+    async def getFightStats(self, userID: str) -> dict:
+        return await self.run(self.sync.getFightStats, userID)
+
+    async def updateFightStats(self, userID: str, updates: dict) -> bool:
+        return await self.run(self.sync.updateFightStats, userID, updates)
+
+    async def setSkillCooldown(self, userID: str, skillName: str, turns: int) -> bool:
+        return await self.run(self.sync.setSkillCooldown, userID, skillName, turns)
+
+    async def getSkillCooldown(self, userID: str, skillName: str) -> int:
+        return await self.run(self.sync.getSkillCooldown, userID, skillName)
+
+    async def isSkillOnCooldown(self, userID: str, skillName: str) -> bool:
+        return await self.run(self.sync.isSkillOnCooldown, userID, skillName)
+
+    async def updateSkillCooldown(self, userID: str) -> bool:
+        return await self.run(self.sync.updateSkillCooldown, userID)
+
+    async def saveSkillCooldowns(self, userID: str, cooldowns: dict) -> bool:
+        return await self.run(self.sync.saveSkillCooldowns, userID, cooldowns)
+
+    async def getALlSkillCooldown(self, userID: str) -> dict:
+        return await self.run(self.sync.getALlSkillCooldown, userID)
+
+    # === Active combat checkpoint methods ===
+    async def saveActiveCombat(self, userID: str, state: bytes) -> bool:
+        return await self.run(self.sync.saveActiveCombat, userID, state)
+
+    async def getActiveCombat(self, userID: str):
+        return await self.run(self.sync.getActiveCombat, userID)
+
+    async def deleteActiveCombat(self, userID: str) -> bool:
+        return await self.run(self.sync.deleteActiveCombat, userID)
+
+    # === Combat log archive methods ===
+    async def archiveCombatLogs(self, rows: list) -> bool:
+        return await self.run(self.sync.archiveCombatLogs, rows)
+
+    async def getCombatLogs(self, userID: str, limit: int = 10) -> list:
+        return await self.run(self.sync.getCombatLogs, userID, limit)
+
+    async def getCombatLog(self, logID: int):
+        return await self.run(self.sync.getCombatLog, logID)
+
+    # === Dungeon run methods ===
+    async def saveDungeon(self, userID: str, state: tuple) -> bool:
+        return await self.run(self.sync.saveDungeon, userID, state)
+
+    async def getDungeon(self, userID: str):
+        return await self.run(self.sync.getDungeon, userID)
+
+    async def deleteDungeon(self, userID: str) -> bool:
+        return await self.run(self.sync.deleteDungeon, userID)
+
+    # === Player snapshot methods ===
+    async def getPlayerSnapshot(self, userID: str):
+        return await self.run(self.sync.getPlayerSnapshot, userID)
+
+    # === Returns the character cache counters ===
+    def cacheStats(self) -> dict:
+        return self.sync.characterCache.stats()
+
+    # === Commits the writes that are waiting in the write-behind queue ===
+    async def flush(self):
+        await self.run(self.sync.flush)
+
+    # === Flushes the pending writes, closes the connections and shuts the executor down ===
+    async def close(self):
+        await self.run(self.sync.close)
+        self._executor.shutdown(wait = True)
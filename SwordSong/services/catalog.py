@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional
+
+# === Indexed view over areas.json and items.json, every name lookup is a single dict hit ===
+class GameCatalog:
+    def __init__(self, areasData: Dict, itemsData: Dict):
+        self.shopItems: List[Dict] = itemsData.get("shop", []) # <= Kept in file order for the shop pages
+        self.areas: Dict = areasData.get("areas", {})
+
+        self.shopByName: Dict[str, Dict] = {}
+        self.lootByName: Dict[str, Dict] = {}
+        self.monsterByName: Dict[str, Dict] = {}
+        self.monstersByArea: Dict[str, Dict[str, List[Dict]]] = {} # <= area -> rarity -> monsters
+        self.sellPrices: Dict[str, int] = {}
+        self.build()
+
+    @staticmethod
+    def key(name: str) -> str:
+        return name.strip().casefold()
+
+    # === (Re)builds every index from the loaded data ===
+    def build(self):
+        self.shopByName = {}
+        self.lootByName = {}
+        self.monsterByName = {}
+        self.monstersByArea = {}
+
+        for item in self.shopItems:
+            self.shopByName.setdefault(self.key(item["name"]), item)
+
+        for areaName, area in self.areas.items():
+            byRarity = self.monstersByArea.setdefault(areaName, {})
+            for monster in area["monsters"]:
+                byRarity.setdefault(monster["rarity"], []).append(monster)
+                self.monsterByName.setdefault(self.key(monster["name"]), monster)
+
+                for lootName, loot in monster.get("lootTable", {}).items():
+                    # The first monster that drops the item decides its price, just like the old scan did
+                    self.lootByName.setdefault(self.key(lootName), {
+                        "name": lootName,
+                        "sellPrice": loot.get("sellPrice", 0),
+                        "description": loot.get("description", "")
+                    })
+
+        # Shop prices win over loot prices for items that are both
+        self.sellPrices = {name: loot["sellPrice"] for name, loot in self.lootByName.items()}
+        self.sellPrices.update({name: item.get("sellPrice", 0) for name, item in self.shopByName.items()})
+
+    # === Lookups ===
+    def shopItem(self, name: str) -> Optional[Dict]:
+        return self.shopByName.get(self.key(name))
+
+    def lootItem(self, name: str) -> Optional[Dict]:
+        return self.lootByName.get(self.key(name))
+
+    # === The shop entry of the item, or its loot entry when the shop doesn't sell it ===
+    def sellableItem(self, name: str) -> Optional[Dict]:
+        key = self.key(name)
+        return self.shopByName.get(key) or self.lootByName.get(key)
+
+    def sellPrice(self, name: str) -> int:
+        return self.sellPrices.get(self.key(name), 0)
+
+    def monster(self, name: str) -> Optional[Dict]:
+        return self.monsterByName.get(self.key(name))
+
+    def monstersIn(self, area: str, rarity: Optional[str] = None) -> List[Dict]:
+        byRarity = self.monstersByArea.get(area, {})
+        if rarity is not None:
+            return byRarity.get(rarity, [])
+        return [monster for monsters in byRarity.values() for monster in monsters]
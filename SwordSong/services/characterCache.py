@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict
+
+class CharacterCache:
+    def __init__(self, maxSize: int = 1024, ttl: float = 300.0, copyEntries: bool = True):
+        self.maxSize = max(1, maxSize)
+        self.copyEntries = copyEntries # <= Immutable entries like the player snapshots can be handed out as they are
+        self.ttl = ttl # <= Seconds an entry stays fresh, the write-through keeps it correct so this only bounds idle entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict() # <= userID -> (expiresAt, character), oldest first
+        self._lock = threading.Lock()
+        self._generation = 0 # <= Bumped on every write so a slow read can't put back stale data
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # === Returns a copy of the cached character or None on a miss ===
+    def get(self, userID: str):
+        with self._lock:
+            entry = self._entries.get(userID)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expiresAt, character = entry
+            if expiresAt < time.monotonic():
+                del self._entries[userID]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(userID)
+            self.hits += 1
+            return dict(character) if self.copyEntries else character
+
+    # === Token to hand back to put() after loading a character from the database ===
+    def generation(self) -> int:
+        return self._generation
+
+    # === Stores a character that was loaded from the database ===
+    def put(self, userID: str, character, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return # <= A write happened while the character was being loaded
+
+            self._entries[userID] = (time.monotonic() + self.ttl, dict(character) if self.copyEntries else character)
+            self._entries.move_to_end(userID)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last = False)
+                self.evictions += 1
+
+    # === Applies the updates to the cached character (write-through) ===
+    def update(self, userID: str, updates: Dict):
+        with self._lock:
+            self._generation += 1
+            entry = self._entries.get(userID)
+            if entry is not None:
+                entry[1].update(updates)
+
+    # === Drops the character from the cache ===
+    def invalidate(self, userID: str):
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(userID, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    # === Returns the cache counters ===
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.maxSize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": self.hits / lookups if lookups else 0.0
+            }
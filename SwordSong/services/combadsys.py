@@ -1,14 +1,66 @@
-import random
 import json
+import threading
+import time
+import zlib
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from .spawnTable import SpawnTable, compileSpawnTables
+from .combatSession import CombatSession, MonsterTemplate
+from .levelCurve import LevelCurve
+from .combatLog import encodeHeader, outcomeOf, PLAYER, MONSTER, CHECKPOINT, FLEE, XP, COINS, LOOT, LEVEL, END
+from .dungeon.randomProvider import RandomProvider, StandardRandomProvider
+
+damageRoll = (0.8, 1.2) # <= Every hit is randomized between 80% and 120%
+
+# === The base damage formula, works on plain numbers and on numpy arrays so the simulator can share it ===
+def baseDamage(attack, defense, multiplier = 1.0):
+    return attack * multiplier - (defense * 0.5)
+
+# === Per combat skill cooldowns, one byte per skill so a turn tick never has to touch the database ===
+class SkillCooldowns:
+    __slots__ = ("skillIndex", "turns")
+
+    def __init__(self, skillIndex: Dict[str, int], remaining: Optional[Dict[str, int]] = None):
+        self.skillIndex = skillIndex # <= Shared skillName -> slot mapping from the combat system
+        self.turns = bytearray(len(skillIndex))
+        for skillName, turns in (remaining or {}).items():
+            if skillName in skillIndex:
+                self.turns[skillIndex[skillName]] = min(max(turns, 0), 255)
+
+    def get(self, skillName: str) -> int:
+        index = self.skillIndex.get(skillName)
+        return self.turns[index] if index is not None else 0
+
+    def set(self, skillName: str, turns: int):
+        self.turns[self.skillIndex[skillName]] = min(max(turns, 0), 255)
+
+    # === Reduces every running cooldown by 1 turn ===
+    def tick(self):
+        for index, turns in enumerate(self.turns):
+            if turns:
+                self.turns[index] = turns - 1
+
+    # === Only the skills that are still on cooldown ===
+    def toDict(self) -> Dict[str, int]:
+        return {skillName: self.turns[index] for skillName, index in self.skillIndex.items() if self.turns[index]}
 
 class combatSystem:
-    def __init__(self, db, areasData, itemsData):
+    def __init__(self, db, areasData, itemsData, rng: RandomProvider = None, rngFactory = StandardRandomProvider, reaper = None, levelCurve: LevelCurve = None):
         self.db = db
         self.areas = areasData
         self.item = itemsData
         self.activeCombats = {}
+        self.rng = rng or StandardRandomProvider() # <= Root stream, spawns and the seeds of the combat sessions come from it
+        self.rngFactory = rngFactory # <= Builds the seeded stream of one combat session
+        self.reaper = reaper # <= Ends the fights that were abandoned without their view timing out
+        self.levelCurve = levelCurve or LevelCurve.load() # <= XP thresholds and stat gains from levels.json
+        self.fleeChance = 70 # <= Percent chance to get away from a monster
+        self.checkpointEvery = 5 # <= Turns between two checkpoints of a fight, so it doesn't cost a write every turn
+        self.combatResumeWindow = 3600 # <= Seconds a checkpointed fight can still be resumed after a restart
+        self.archiveBatchSize = 25 # <= Finished combat logs are written to the archive this many at a time
+        self.pendingLogs = []
+        self._logLock = threading.Lock()
+        self._sessionLocks = [threading.Lock() for _ in range(64)] # <= Striped by user, so a session doesn't carry a lock of its own
 
         self.rarityWeight = { # <= Sets the weight of the rarities of the different monsters
             "common": 60,
@@ -45,74 +97,266 @@ class combatSystem:
                 "description": "Take 50% for 3 turns"
             }
         }
+        self.skillIndex = {skillName: index for index, skillName in enumerate(self.defaultSkills)}
+        self.spawnTables = compileSpawnTables(self.areas, self.rarityWeight) # <= Compiled once, spawnMonster only samples them
+        self.monsterTemplates = self._indexMonsters() # <= Shared by every fight, a checkpoint only stores the monster name
 
-    # === Creates a monster instance with HP tracking ===
-    def _createMonsterInstance(self, monsterTemplate: Dict) -> Dict:
-        monster = monsterTemplate.copy()
-        monster["currentHealth"] = monster["health"]
-        monster["maxHealth"] = monster["health"]
-        return monster
+    # === Swaps in new area data and recompiles the spawn tables ===
+    def reloadAreas(self, areasData: Dict):
+        self.areas = areasData
+        self.spawnTables = compileSpawnTables(self.areas, self.rarityWeight)
+        self.monsterTemplates = self._indexMonsters()
+
+    def _indexMonsters(self) -> Dict[str, MonsterTemplate]:
+        templates = {}
+        for area in self.areas["areas"].values():
+            for monster in area["monsters"]:
+                templates.setdefault(monster["name"], MonsterTemplate.fromDict(monster))
+        return templates
+
+    # === The shared template of a monster from the area data ===
+    def _template(self, monster: Dict) -> MonsterTemplate:
+        template = self.monsterTemplates.get(monster["name"])
+        if template is None:
+            template = self.monsterTemplates[monster["name"]] = MonsterTemplate.fromDict(monster)
+        return template
+
+    # === Gets the spawn table of the area, it is only rebuilt when the monsters of the area were replaced ===
+    def _spawnTable(self, area: str) -> SpawnTable:
+        monsters = self.areas["areas"][area]["monsters"]
+        table = self.spawnTables.get(area)
+        if table is None or not table.isCurrent(monsters):
+            table = SpawnTable(monsters, self.rarityWeight)
+            self.spawnTables[area] = table
+        return table
+
+    # === Gives out a new seeded stream, the seed is kept so the session can be replayed ===
+    def newSessionRandom(self) -> Tuple[int, RandomProvider]:
+        seed = self.rng.randint(0, 2 ** 32 - 1)
+        return seed, self.rngFactory(seed)
+
+    # === The stream of the users combat session, or the root stream when they're not fighting ===
+    def _random(self, userID: str) -> RandomProvider:
+        session = self.activeCombats.get(userID)
+        return session.rng if session else self.rng
 
     # === Spawns monsters based on the rarity system and boss logic ===
-    def spawnMonster(self, userID: str, area: str = "forest") -> Dict:
+    def spawnMonster(self, userID: str, area: str = "forest") -> Optional[MonsterTemplate]:
         # Checks the fight count for spawning in a boss monster
         fightStats = self.db.getFightStats(userID)
         if not fightStats:
             self.db.initializeFightStats(userID)
             fightStats = {"fightsSinceBoss": 0, "totalFights": 0}
 
+        spawnTable = self._spawnTable(area)
+
         # Forces a boss to spawn every 15 fights
         if fightStats["fightsSinceBoss"] > 14:
-            monsters = [m for m in self.areas["areas"][area]["monsters"] if m["rarity"] == "boss"]
-            if monsters:
-                selectedMonster = random.choice(monsters)
+            selectedMonster = spawnTable.spawnBoss(self.rng)
+            if selectedMonster:
                 self.db.updateFightStats(userID, {"fightsSinceBoss": 0})
-                return self._createMonsterInstance(selectedMonster)
+                return self._template(selectedMonster)
         
         # Spawns the regular monsters based on the rarity
-        availableMonsters = []
-        for monster in self.areas["areas"][area]["monsters"]:
-            if monster["rarity"] != "boss":
-                weight = self.rarityWeight[monster["rarity"]]
-                availableMonsters.extend([monster] * weight)
-
-        if not availableMonsters:
+        selectedMonster = spawnTable.spawnRegular(self.rng)
+        if not selectedMonster:
             return None
-        
-        selectedMonster = random.choice(availableMonsters)
 
         # Updates the fight stats in the db
         self.db.updateFightStats(userID, {
             "totalFights": fightStats["totalFights"] + 1,
             "fightsSinceBoss": fightStats["fightsSinceBoss"] + 1
         })
-        return self._createMonsterInstance(selectedMonster)
+        return self._template(selectedMonster)
     
     # === Initializes a new combat session ===
-    def startCombat(self, userID: str, monster: Dict) -> Dict:
-       combatState = {
-            "userID": userID,
-            "monster": monster,
-            "turn": "player",
-            "turnCount": 1,
-            "playerEffects": {}, # <= Stores temporary stats like defensive stance or burn effects for in the future
-            "monsterEffects": {}
-        }
-       
-       self.activeCombats[userID] = combatState
-       return combatState
+    def startCombat(self, userID: str, monster: MonsterTemplate) -> CombatSession:
+        seed, rng = self.newSessionRandom()
+        session = CombatSession(
+            userID,
+            monster,
+            SkillCooldowns(self.skillIndex, self.db.getALlSkillCooldown(userID)), # <= Loaded once, saved again at the end
+            seed,
+            rng,
+            character = self.db.getCharacter(userID) # <= Only flushed at checkpoints and when the fight ends
+        )
+        session.events = encodeHeader(session, self.skillIndex)
+
+        self.activeCombats[userID] = session
+        self._track(userID)
+        self.checkpointCombat(userID)
+        return session
     
-    # === Fetches the current combat state for a user ===
-    def getCombatState(self, userID: str) -> Optional[Dict]:
+    # === The turns run on the database executor, so two clicks of one user can land on different threads ===
+    def _sessionLock(self, userID: str) -> threading.Lock:
+        return self._sessionLocks[hash(userID) % len(self._sessionLocks)]
+
+    # === Restarts the idle timer of the fight ===
+    def _track(self, userID: str):
+        if self.reaper is not None:
+            self.reaper.track("combat", userID)
+
+    # === Fetches the current combat session for a user ===
+    def getCombatState(self, userID: str) -> Optional[CombatSession]:
         return self.activeCombats.get(userID)
+
+    # === Fetches the combat session, and brings back a checkpointed fight when it's not in memory (after a restart) ===
+    def loadCombat(self, userID: str) -> Optional[CombatSession]:
+        session = self.activeCombats.get(userID)
+        if session:
+            return session
+
+        row = self.db.getActiveCombat(userID)
+        if not row:
+            return None
+
+        blob, updatedAt = row
+        try:
+            data = json.loads(zlib.decompress(blob))
+        except (zlib.error, ValueError) as e:
+            print(f"The combat checkpoint of {userID} could not be read: {e}")
+            self.db.deleteActiveCombat(userID)
+            return None
+
+        template = self.monsterTemplates.get(data["m"])
+        if template is None or time.time() - updatedAt > self.combatResumeWindow:
+            # The fight is over, the cooldowns are kept just like endCombat would do
+            with self.db.transaction(defer = True):
+                self.db.saveSkillCooldowns(userID, data["cd"])
+                self.db.deleteActiveCombat(userID)
+            return None
+
+        session = CombatSession(
+            userID,
+            template,
+            SkillCooldowns(self.skillIndex, data["cd"]),
+            data["s"],
+            self.rngFactory(data["s"]),
+            monsterHealth = data["hp"],
+            turn = data["t"],
+            turnCount = data["n"],
+            playerEffects = data["pe"],
+            monsterEffects = data["me"],
+            character = self.db.getCharacter(userID) # <= The checkpoint flushed the character, so the database is up to date
+        )
+        session.checkpointTurn = data["n"]
+        session.resumed = True # <= The old discord view is gone, so the cog has to attach a new one
+        session.events = encodeHeader(session, self.skillIndex) # <= The log of a resumed fight starts from the checkpoint
+        self.activeCombats[userID] = session
+        self._track(userID)
+        return session
+
+    # === Packs the combat session into a small compressed blob ===
+    def _serializeCombat(self, session: CombatSession) -> bytes:
+        data = {
+            "m": session.monster.name,
+            "hp": session.monsterHealth,
+            "t": session.turn,
+            "n": session.turnCount,
+            "pe": session.playerEffects,
+            "me": session.monsterEffects,
+            "cd": session.skillCooldowns.toDict(),
+            "s": session.seed
+        }
+        return zlib.compress(json.dumps(data, separators = (",", ":")).encode())
+
+    # === Saves the in memory combat data of a user to the database ===
+    def checkpointCombat(self, userID: str):
+        session = self.activeCombats.get(userID)
+        if session:
+            # Reseeds the session from its own stream, so a resumed fight rolls exactly what this one would have
+            session.seed = session.rng.randint(0, 2 ** 32 - 1)
+            session.rng = self.rngFactory(session.seed)
+            session.checkpointTurn = session.turnCount
+            session.record(CHECKPOINT, 0, session.seed)
+            if self.db is None:
+                return # <= A replay only needs the new stream
+            with self.db.transaction(defer = True):
+                self.flushCharacter(userID)
+                self.db.saveActiveCombat(userID, self._serializeCombat(session))
+
+    # === Writes the net health and mana changes of the fight to the database ===
+    def flushCharacter(self, userID: str):
+        session = self.activeCombats.get(userID)
+        if session:
+            self._flushSession(userID, session)
+
+    def _flushSession(self, userID: str, session: CombatSession):
+        if session.dirtyMask:
+            self.db.updateCharacter(userID, session.takeCharacterUpdates())
     
     # === Ends the combat session after its over and clean it up ===
     def endCombat(self, userID: str):
-        if userID in self.activeCombats:
-            del self.activeCombats[userID]
+        # Taken out in one step, so when the timeout, the view and the reaper end the same fight only one of them does the work
+        session = self.activeCombats.pop(userID, None)
+        if session is None:
+            return
+
+        eventsLength = len(session.events or b"")
+        dirtyMask = session.dirtyMask
+        outcome = outcomeOf(session)
+        try:
+            with self.db.transaction(defer = True) as unit: # <= Character, cooldowns and checkpoint land together with the group commit
+                session.record(END, outcome)
+                self._flushSession(userID, session)
+                self.db.saveSkillCooldowns(userID, session.skillCooldowns.toDict())
+                self.db.deleteActiveCombat(userID)
+        except Exception:
+            self._restoreSession(userID, session, eventsLength, dirtyMask)
+            raise
+        if unit.failed:
+            self._restoreSession(userID, session, eventsLength, dirtyMask)
+            return
+
+        self._archiveLog(userID, session, outcome) # <= Only a fight that really ended gets archived
+        if self.reaper is not None:
+            self.reaper.release("combat", userID)
+
+    # === Puts the session of a rolled back endCombat back, so the fight can still be ended later ===
+    def _restoreSession(self, userID: str, session: CombatSession, eventsLength: int, dirtyMask: int):
+        self._rewindSession(session, eventsLength, dirtyMask)
+        self.activeCombats.setdefault(userID, session)
+        print(f"Ending the combat of {userID} was rolled back, the session was kept")
+
+    # === Drops the events a rolled back unit recorded and marks the fields it flushed as dirty again ===
+    def _rewindSession(self, session: CombatSession, eventsLength: int, dirtyMask: int):
+        if session.events is not None:
+            del session.events[eventsLength:]
+        session.dirtyMask |= dirtyMask
+
+    # === Queues the log of a finished fight, a full batch is written in one statement ===
+    def _archiveLog(self, userID: str, session: CombatSession, outcome: int):
+        with self._logLock:
+            self.pendingLogs.append((userID, session.monster.name, outcome, session.turnCount, int(time.time()), bytes(session.events or b"")))
+            full = len(self.pendingLogs) >= self.archiveBatchSize
+        if full:
+            self.flushCombatLogs()
+
+    # === Writes the queued combat logs, also called on shutdown ===
+    def flushCombatLogs(self):
+        with self._logLock:
+            rows, self.pendingLogs = self.pendingLogs, []
+        if rows and not self.db.archiveCombatLogs(rows):
+            print(f"{len(rows)} combat logs could not be archived")
+
+    # === Ends every fight the reaper found idle, each one in its own unit that rides the group commit ===
+    def reapCombats(self, userIDs: List[str]) -> int:
+        ended = 0
+        for userID in userIDs:
+            if userID not in self.activeCombats:
+                continue
+            try:
+                self.endCombat(userID) # <= Its own deferred unit, so one failing fight doesn't roll back the others
+            except Exception as e:
+                print(f"Error reaping the combat of {userID}: {e}")
+            if userID in self.activeCombats:
+                self._track(userID) # <= The session was put back, so the reaper tries it again later
+            else:
+                ended += 1
+        return ended
 
     # === Calculates the damage that is done with skill multipliers and randomizations ===
-    def calculateDamage(self, attackerStats: Dict, defenderStats: Dict, skillData: Optional[Dict] = None) -> int:
+    def calculateDamage(self, attackerStats: Dict, defenderStats: Dict, skillData: Optional[Dict] = None, rng: RandomProvider = None) -> int:
         baseAttack = attackerStats.get("attack", 10)
         baseDefense = defenderStats.get("defense", 0)
 
@@ -120,24 +364,31 @@ class combatSystem:
         if skillData and "damageMultiplier" in skillData: # <- Applies the skill multiplier
             multiplier = skillData["damageMultiplier"] 
 
-        baseDamage = baseAttack * multiplier - (defenderStats["defense"] * 0.5) # <- The base damage formula
-        finalDamage = baseDamage * random.uniform(0.8, 1.2) # <- Adds a randomization to the damage (80%, 120%)
+        finalDamage = baseDamage(baseAttack, defenderStats["defense"], multiplier) * (rng or self.rng).uniform(*damageRoll) # <- Adds a randomization to the damage (80%, 120%)
 
         return max(1, int(finalDamage)) # <- Ensures the minimum damage deal is 1
     
     # === Processes the player's attack turns ===
     def processPlayerAttack(self, userID: str, skillName: Optional[str] = None) -> Dict:
         # Checks if the user is in combat
-        combatState = self.activeCombats.get(userID)
-        if not combatState:
+        session = self.activeCombats.get(userID)
+        if not session:
             return{"error": "There is no active combat found"}
-        
-        # Checks if the user has a character in the database
-        character = self.db.getCharacter(userID)
+        self._track(userID)
+
+        # The turn is checked and taken in one step, so a second click can't attack twice in the same turn
+        with self._sessionLock(userID):
+            if session.turn != "player" or session.monsterHealth <= 0:
+                return {"error": "It's not your turn"}
+            return self._playerAttack(session, skillName)
+
+    def _playerAttack(self, session: CombatSession, skillName: Optional[str]) -> Dict:
+        # Checks if the user has a character, it's held by the session for the whole fight
+        character = session.character
         if not character:
             return {"error": "Character is not found"}
         
-        monster = combatState["monster"]
+        monster = session.monster
         result = {
             "action": skillName or "attack",
             "damage": 0,
@@ -149,8 +400,8 @@ class combatSystem:
         skillData = None
         if skillName and skillName in self.defaultSkills:
             # Checks if the skill is on cooldown
-            if self.db.isSkillOnCooldown(userID, skillName):
-                cooldownLeft = self.db.getSkillCooldown(userID, skillName)
+            cooldownLeft = session.skillCooldowns.get(skillName)
+            if cooldownLeft > 0:
                 return {"error": f"{skillName} is still on cooldown for {cooldownLeft} more turns"}
             
             skillData = self.defaultSkills[skillName]
@@ -161,16 +412,16 @@ class combatSystem:
             
             # This will apply the new mana ammount to the character after using a skill
             newMana = character["mana"] - skillData["manaCost"]
-            self.db.updateCharacter(userID, {"mana": newMana})
+            session.updateCharacter({"mana": newMana})
 
             # After the skill has been cast this will apply a cooldown
-            self.db.setSkillCooldown(userID, skillName, skillData["cooldown"])
+            session.skillCooldowns.set(skillName, skillData["cooldown"])
 
         # This will handle the heal skill
         if skillName == "Healing Pulse":
             healAmount = int(character["maxHealth"] * skillData["healPercent"])
             newHealth = min(character["maxHealth"], character["health"] + healAmount)
-            self.db.updateCharacter(userID, {"health": newHealth})
+            session.updateCharacter({"health": newHealth})
 
             result["action"] = "heal"
             result["healAmount"] = healAmount
@@ -178,7 +429,7 @@ class combatSystem:
 
         # This will handle the defensive stance skill
         elif skillName == "Defensive Stance":
-            combatState["playerEffects"]["defensiveStance"] = skillData["duration"]
+            session.playerEffects["defensiveStance"] = skillData["duration"]
 
             result["action"] = "defensiveStance"
             result["message"] = "You have entered a defensive stance!"
@@ -191,40 +442,48 @@ class combatSystem:
             }
 
             monsterStats = {
-                "attack": monster["attack"],
-                "defense": monster["defense"]
+                "attack": monster.attack,
+                "defense": monster.defense
             }
 
-            damage = self.calculateDamage(playerStats, monsterStats, skillData)
-            monster["currentHealth"] -= damage
+            damage = self.calculateDamage(playerStats, monsterStats, skillData, session.rng)
+            session.monsterHealth -= damage
 
             result["damage"] = damage
-            result["message"] = f"You have dealt {damage} damage to the {monster["name"]}!"
+            result["message"] = f"You have dealt {damage} damage to the {monster.name}!"
 
             if skillName:
-                result["message"] = f"You used {skillName} and dealth {damage} damage to the {monster["name"]}!"
+                result["message"] = f"You used {skillName} and dealth {damage} damage to the {monster.name}!"
+
+        session.record(PLAYER, self.skillIndex[skillName] + 1 if skillName in self.skillIndex else 0, result.get("healAmount", result["damage"]))
 
         # Checks if the monster is defeated
-        if monster["currentHealth"] <= 0:
+        if session.monsterHealth <= 0:
             result["monsterDefeated"] = True
             return result
         
         # If it's not defeated it will switch to the monsters turn
-        combatState["turn"] = "monster"
+        session.turn = "monster"
         return result
     
     # === Processes the monsters turn ===
     def processMonsterTurn(self, userID: str) -> Dict:
-        combatState = self.activeCombats.get(userID)
-        if not combatState:
+        session = self.activeCombats.get(userID)
+        if not session:
             return {"error": "No is no active combat found"}
-        
-        character = self.db.getCharacter(userID)
-        monster = combatState["monster"]
+
+        with self._sessionLock(userID):
+            if session.turn != "monster":
+                return {"error": "It's not the monster's turn"}
+            return self._monsterTurn(userID, session)
+
+    def _monsterTurn(self, userID: str, session: CombatSession) -> Dict:
+        character = session.character
+        monster = session.monster
 
         monsterStats = {
-            "attack": monster["attack"],
-            "defense": monster["defense"]
+            "attack": monster.attack,
+            "defense": monster.defense
         }
 
         playerStats = {
@@ -234,23 +493,24 @@ class combatSystem:
 
         # Checks for defensive stance, if the user has defensive stance on applies the damage reduction
         damageReduction = 1.0
-        if "defensiveStance" in combatState["playerEffects"]:
+        if "defensiveStance" in session.playerEffects:
             damageReduction = 0.5
-            combatState["playerEffects"]["defensiveStance"] -= 1
-            if combatState["playerEffects"]["defensiveStance"] <= 0:
-                del combatState["playerEffects"]["defensiveStance"]
+            session.playerEffects["defensiveStance"] -= 1
+            if session.playerEffects["defensiveStance"] <= 0:
+                del session.playerEffects["defensiveStance"]
 
         # Calculates the damage the monster will do to the user
-        damage = self.calculateDamage(monsterStats, playerStats)
+        damage = self.calculateDamage(monsterStats, playerStats, rng = session.rng)
         damage = int(damage * damageReduction)
 
         # Applies the damage
         newHealth = character["health"] - damage
-        self.db.updateCharacter(userID, {"health": newHealth})
+        session.updateCharacter({"health": newHealth})
+        session.record(MONSTER, 0, damage)
 
         result = {
             "damage": damage,
-            "message": f"The {monster["name"]} attacked you for {damage} damage!",
+            "message": f"The {monster.name} attacked you for {damage} damage!",
             "playerHealth": newHealth
         }
 
@@ -260,82 +520,110 @@ class combatSystem:
             return result
         
         # If the user is still alive updates the turn count + skill cooldowns
-        combatState["turnCount"] += 1
-        combatState["turn"] = "player"
-        self.db.updateSkillCooldown(userID)
+        session.turnCount += 1
+        session.turn = "player"
+        session.skillCooldowns.tick()
+
+        if session.turnCount - session.checkpointTurn >= self.checkpointEvery:
+            self.checkpointCombat(userID)
 
         return result
     
+    # === Rolls if the user gets away from the monster ===
+    def attemptFlee(self, userID: str) -> bool:
+        session = self.activeCombats.get(userID)
+        if not session:
+            return self.rng.randint(1, 100) <= self.fleeChance
+
+        with self._sessionLock(userID):
+            if session.turn != "player" or session.monsterHealth <= 0:
+                return False
+            escaped = session.rng.randint(1, 100) <= self.fleeChance
+            session.record(FLEE, 1 if escaped else 0)
+            if not escaped:
+                session.turn = "monster" # <= A failed flee costs the turn
+        return escaped
+
     # === Gives the user the rewards after winning the battle ===
-    def distributeRewards(self, userID: str, monster: Dict) -> Dict:
-        character = self.db.getCharacter(userID)
+    def distributeRewards(self, userID: str, monster: MonsterTemplate) -> Dict:
+        session = self.activeCombats.get(userID)
+        eventsLength = len(session.events or b"") if session else 0
+        dirtyMask = session.dirtyMask if session else 0
+
+        # The XP, coins, level up and loot are one unit of work so they land in a single commit
+        try:
+            with self.db.transaction() as unit:
+                self.flushCharacter(userID) # <= The rewards build on the health and mana the fight left over
+                character = self.db.getCharacter(userID)
+                rewards = self.rollRewards(userID, monster)
+
+                # Adds the XP, a big reward can go up several levels at once
+                updates, levelUP = self.levelCurve.applyXP(character, rewards["xp"])
+                updates["coins"] = character["coins"] + rewards["coins"]
+                if levelUP:
+                    rewards["levelUP"] = levelUP
+                    if session:
+                        session.record(LEVEL, 0, levelUP["newLevel"])
+            
+                # Inserts the whole loot roll in one batch
+                if monster.lootTable:
+                    self.db.addItems(userID, [(item["name"], item["quantity"]) for item in rewards["items"]])
+            
+                # Applies the level up update to the character
+                self.db.updateCharacter(userID, updates)
+        except Exception:
+            if session:
+                self._rewindSession(session, eventsLength, dirtyMask)
+            raise
+
+        if unit.failed:
+            # Nothing was saved, so the fight keeps its health and mana changes for endCombat and the rewards aren't shown
+            if session:
+                self._rewindSession(session, eventsLength, dirtyMask)
+            return {"error": "Your rewards could not be saved"}
+
+        if session:
+            session.character.update(updates) # <= Keeps the session copy in line without flushing it again
+        return rewards
+
+    # === Rolls the coins and the loot of a won fight, this part doesn't touch the database so the replayer can use it ===
+    def rollRewards(self, userID: str, monster: MonsterTemplate) -> Dict:
+        rng = self._random(userID)
+        session = self.activeCombats.get(userID)
         rewards = {
-            "xp": monster["xpReward"],
-            "coins": random.randint(monster["xpReward"] // 2, monster["xpReward"]),
+            "xp": monster.xpReward,
+            "coins": rng.randint(monster.xpReward // 2, monster.xpReward),
             "items": []
         }
+        if session:
+            session.record(XP, 0, rewards["xp"])
+            session.record(COINS, 0, rewards["coins"])
 
-        # Calculates the character is getting and checks for level up
-        newXP = character["xp"] + rewards["xp"]
-        newCoins = character["coins"] + rewards["coins"]
-        updates = {"xp": newXP, "coins": newCoins}
-
-        # Checks for level up
-        levelUP = False
-        if newXP >= character["xpToLevel"]:
-            newLevel = character["level"] + 1
-            remainingXP = newXP - character["xpToLevel"]
-            newXPToLevel = character["xpToLevel"] + (newLevel * 50) # Sets the scaling for levelup
-
-            # If the user lavel's up the stats increase
-            newMaxHealth = character["maxHealth"] + 20
-            newAttack = character["attack"] + 4
-            newDefense = character["defense"] + 2
-            newMana = character.get("maxMana", 50) + 10
-
-            updates.update({
-                "level": newLevel,
-                "xp": remainingXP,
-                "xpToLevel": newXPToLevel,
-                "maxHealth": newMaxHealth,
-                "health": newMaxHealth, # <= refreshes the health back to full
-                "attack": newAttack,
-                "defense": newDefense,
-                "maxMana": newMana,
-                "mana": newMana # <= Refreses the mana back to full
-            })
-
-            levelUP = True
-            rewards["levelUP"] = {
-                "newLevel": newLevel,
-                "healthIncrease": 20,
-                "attackIncrease": 4,
-                "defenseIncrease": 2,
-                "manaIncrease": 10
-            }
-        
         # Handles loot drops
-        if "lootTable" in monster:
-            for itemName, lootData in monster["lootTable"].items():
-                if random.randint(1, 100) <= lootData["chance"]:
-                    quantity = lootData["quantity"]
-                    if isinstance(quantity, list):
-                        quantity = random.randint(quantity[0], quantity[1])
-
-                    self.db.addItem(userID, itemName, quantity)
-                    rewards["items"].append({"name": itemName, "quantity": quantity})
-        
-        # Applies the level up update to the character
-        self.db.updateCharacter(userID, updates)
+        for lootIndex, (itemName, lootData) in enumerate(monster.lootTable.items()):
+            if rng.randint(1, 100) <= lootData["chance"]:
+                quantity = lootData["quantity"]
+                if isinstance(quantity, list):
+                    quantity = rng.randint(quantity[0], quantity[1])
+
+                rewards["items"].append({"name": itemName, "quantity": quantity})
+                if session:
+                    session.record(LOOT, lootIndex, quantity)
         return rewards
     
     # === Checks all the skills that are not on cooldown ===
     def getAvailableSkills(self, userID: str) -> List[Dict]:
         available = []
-        character = self.db.getCharacter(userID)
+        session = self.activeCombats.get(userID)
+        if session:
+            character = session.character
+            cooldowns = session.skillCooldowns
+        else:
+            character = self.db.getCharacter(userID)
+            cooldowns = SkillCooldowns(self.skillIndex, self.db.getALlSkillCooldown(userID))
 
         for skillName, skillData in self.defaultSkills.items():
-            cooldownRemaining = self.db.getSkillCooldown(userID, skillName)
+            cooldownRemaining = cooldowns.get(skillName)
             canUse = (cooldownRemaining == 0 and character.get("mana", 0) >= skillData.get("manaCost", 0))
 
             available.append({
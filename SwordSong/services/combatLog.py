@@ -0,0 +1,101 @@
+import struct
+from typing import Dict, List, Tuple
+
+# Packed event stream of one fight: a header with the starting state, then one 8 byte record per event
+logVersion = 1
+
+# === Event codes ===
+PLAYER = 1 # <= arg: skill slot + 1 (0 is a normal attack), value: damage or heal amount
+MONSTER = 2 # <= value: damage the player took
+CHECKPOINT = 3 # <= value: the new seed the session was reseeded with
+FLEE = 4 # <= arg: 1 when the player got away
+XP = 5 # <= value: xp reward
+COINS = 6 # <= value: coin reward
+LOOT = 7 # <= arg: index in the loot table of the monster, value: quantity
+LEVEL = 8 # <= value: the new level
+END = 9 # <= arg: the outcome
+
+eventNames = {PLAYER: "player", MONSTER: "monster", CHECKPOINT: "checkpoint", FLEE: "flee", XP: "xp", COINS: "coins", LOOT: "loot", LEVEL: "level", END: "end"}
+
+# === Outcomes ===
+VICTORY = 0
+DEFEAT = 1
+FLED = 2
+ABANDONED = 3 # <= Timed out or reaped
+outcomeNames = ("victory", "defeat", "fled", "abandoned")
+
+eventFormat = struct.Struct("<BBHI") # <= code, arg, turn, value
+headerFormat = struct.Struct("<BBIHiiiiiiB") # <= version, resumed, seed, turnCount, monsterHealth, health, mana, maxHealth, attack, defense, defensiveStance
+
+# === Packs the state a fight starts (or resumes) from, everything the replayer needs besides the monster template ===
+def encodeHeader(session, skillIndex: Dict[str, int]) -> bytearray:
+    character = session.character or {}
+    cooldowns = [(skillIndex[skillName], turns) for skillName, turns in session.skillCooldowns.toDict().items()]
+    name = session.monster.name.encode()[:255]
+
+    header = bytearray(headerFormat.pack(
+        logVersion,
+        1 if session.resumed else 0,
+        session.seed,
+        min(session.turnCount, 0xFFFF),
+        session.monsterHealth,
+        character.get("health", 0),
+        character.get("mana", 0),
+        character.get("maxHealth", 0),
+        character.get("attack", 0),
+        character.get("defense", 0),
+        min(session.playerEffects.get("defensiveStance", 0), 255)
+    ))
+    header.append(len(cooldowns))
+    for slot, turns in cooldowns:
+        header += bytes((slot, turns))
+    header.append(len(name))
+    header += name
+    return header
+
+def packEvent(code: int, arg: int, turn: int, value: int) -> bytes:
+    return eventFormat.pack(code, arg, min(turn, 0xFFFF), value & 0xFFFFFFFF)
+
+# === Unpacks a stored log into its header and a list of (code, arg, turn, value) events ===
+def decodeLog(blob: bytes) -> Tuple[Dict, List[Tuple[int, int, int, int]]]:
+    (version, resumed, seed, turnCount, monsterHealth, health, mana, maxHealth, attack, defense, stance) = headerFormat.unpack_from(blob, 0)
+    if version != logVersion:
+        raise ValueError(f"Unknown combat log version: {version}")
+
+    offset = headerFormat.size
+    cooldownCount = blob[offset]
+    offset += 1
+    cooldowns = {blob[offset + index * 2]: blob[offset + index * 2 + 1] for index in range(cooldownCount)} # <= skill slot -> turns
+    offset += cooldownCount * 2
+    nameLength = blob[offset]
+    offset += 1
+    monster = bytes(blob[offset:offset + nameLength]).decode()
+    offset += nameLength
+
+    if (len(blob) - offset) % eventFormat.size:
+        raise ValueError("The combat log is cut off")
+    events = list(eventFormat.iter_unpack(blob[offset:]))
+
+    header = {
+        "resumed": bool(resumed),
+        "seed": seed,
+        "turnCount": turnCount,
+        "monster": monster,
+        "monsterHealth": monsterHealth,
+        "character": {"health": health, "mana": mana, "maxHealth": maxHealth, "attack": attack, "defense": defense},
+        "defensiveStance": stance,
+        "cooldowns": cooldowns
+    }
+    return header, events
+
+# === The outcome of a fight from the last events in its log ===
+def outcomeOf(session) -> int:
+    if session.monsterHealth <= 0:
+        return VICTORY
+    if session.character and session.character.get("health", 1) <= 0:
+        return DEFEAT
+    if session.events and len(session.events) >= eventFormat.size:
+        code, arg, turn, value = eventFormat.unpack_from(session.events, len(session.events) - eventFormat.size)
+        if code == FLEE and arg:
+            return FLED
+    return ABANDONED
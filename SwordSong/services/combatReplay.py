@@ -0,0 +1,117 @@
+# Replays an archived fight through the combat system and checks that every roll comes out the same
+# Run from the SwordSong folder: python -m services.combatReplay --user 1234 --last 5
+import argparse
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .combadsys import combatSystem, SkillCooldowns
+from .combatLog import decodeLog, outcomeOf, eventFormat, eventNames, outcomeNames, PLAYER, MONSTER, CHECKPOINT, FLEE, XP, LEVEL, END
+from .combatSession import CombatSession
+from .database import Database
+
+dataDir = Path(__file__).parent.parent / "data"
+replayKey = "replay"
+
+# === Plays the logged actions again on a combat system without a database and compares the event streams ===
+def replayCombat(system: combatSystem, blob: bytes) -> Dict:
+    header, events = decodeLog(blob)
+    template = system.monsterTemplates.get(header["monster"])
+    if template is None:
+        raise ValueError(f"The monster {header['monster']} is not in the area data anymore")
+
+    slotNames = list(system.skillIndex)
+    session = CombatSession(
+        replayKey,
+        template,
+        SkillCooldowns(system.skillIndex, {slotNames[slot]: turns for slot, turns in header["cooldowns"].items()}),
+        header["seed"],
+        system.rngFactory(header["seed"]),
+        monsterHealth = header["monsterHealth"],
+        turnCount = header["turnCount"],
+        playerEffects = {"defensiveStance": header["defensiveStance"]} if header["defensiveStance"] else {},
+        character = dict(header["character"])
+    )
+    session.checkpointTurn = header["turnCount"] if header["resumed"] else 0
+    system.activeCombats[replayKey] = session
+    try:
+        for code, arg, turn, value in events:
+            if code == PLAYER:
+                system.processPlayerAttack(replayKey, slotNames[arg - 1] if arg else None)
+            elif code == MONSTER:
+                system.processMonsterTurn(replayKey)
+            elif code == CHECKPOINT and session.checkpointTurn != turn:
+                system.checkpointCombat(replayKey) # <= The checkpoint at the start of the fight, the others come from processMonsterTurn
+            elif code == FLEE:
+                system.attemptFlee(replayKey)
+            elif code == XP:
+                system.rollRewards(replayKey, template) # <= Also logs the coins and the loot
+            elif code == LEVEL:
+                session.record(LEVEL, 0, value) # <= Depends on the XP in the database, so it's taken over as it is
+            elif code == END:
+                session.record(END, outcomeOf(session))
+    finally:
+        system.activeCombats.pop(replayKey, None)
+
+    replayed = list(eventFormat.iter_unpack(bytes(session.events)))
+    mismatch = next((index for index, (expected, got) in enumerate(zip(events, replayed)) if expected != got), None)
+    if mismatch is None and len(events) != len(replayed):
+        mismatch = min(len(events), len(replayed))
+
+    return {
+        "header": header,
+        "events": events,
+        "replayed": replayed,
+        "matches": mismatch is None,
+        "firstMismatch": mismatch
+    }
+
+def describeEvent(event, slotNames: List[str]) -> str:
+    code, arg, turn, value = event
+    name = eventNames.get(code, str(code))
+    if code == PLAYER:
+        return f"turn {turn:>3} {name:<10} {slotNames[arg - 1] if arg else 'attack'}: {value}"
+    if code == FLEE:
+        return f"turn {turn:>3} {name:<10} {'escaped' if arg else 'failed'}"
+    if code == END:
+        return f"turn {turn:>3} {name:<10} {outcomeNames[arg] if arg < len(outcomeNames) else arg}"
+    return f"turn {turn:>3} {name:<10} {value}" + (f" (slot {arg})" if arg else "")
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description = "Replays archived fights and checks them against the combat system")
+    parser.add_argument("--db", type = Path, default = dataDir / "game.db")
+    parser.add_argument("--user", help = "Replay the newest fights of this user")
+    parser.add_argument("--id", type = int, help = "Replay one combat log")
+    parser.add_argument("--last", type = int, default = 1, help = "How many of the newest fights of the user")
+    parser.add_argument("--events", action = "store_true", help = "Print every event")
+    parser.add_argument("--areas-file", type = Path, default = dataDir / "areas.json")
+    args = parser.parse_args(argv)
+    if args.user is None and args.id is None:
+        parser.error("Give a --user or an --id")
+
+    with open(args.areas_file, "r") as f:
+        areasData = json.load(f)
+    system = combatSystem(None, areasData, {})
+    slotNames = list(system.skillIndex)
+
+    db = Database(args.db, durability = "immediate")
+    try:
+        rows = [db.getCombatLog(args.id)] if args.id is not None else db.getCombatLogs(args.user, args.last)
+    finally:
+        db.close()
+
+    for row in filter(None, rows):
+        logID, monster, outcome, turns, endedAt, blob = row
+        result = replayCombat(system, blob)
+        status = "matches" if result["matches"] else f"differs at event {result['firstMismatch']}"
+        print(f"#{logID} {datetime.fromtimestamp(endedAt):%Y-%m-%d %H:%M} {monster}, {outcomeNames[outcome]} after {turns} turns, {len(blob)} bytes: replay {status}")
+        if args.events or not result["matches"]:
+            for index, event in enumerate(result["events"]):
+                marker = "!" if index == result["firstMismatch"] else " "
+                print(f"  {marker} {describeEvent(event, slotNames)}")
+            if not result["matches"] and result["firstMismatch"] < len(result["replayed"]):
+                print(f"    replayed: {describeEvent(result['replayed'][result['firstMismatch']], slotNames)}")
+
+if __name__ == "__main__":
+    main()
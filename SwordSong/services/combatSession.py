@@ -0,0 +1,93 @@
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, List, Mapping
+from .combatLog import packEvent
+
+# === Read only monster data from areas.json, one instance is shared by every fight against that monster ===
+@dataclass(frozen = True, slots = True)
+class MonsterTemplate:
+    name: str
+    health: int
+    attack: int
+    defense: int
+    xpReward: int
+    rarity: str
+    description: str
+    lootTable: Mapping[str, Mapping]
+
+    @classmethod
+    def fromDict(cls, data: Dict) -> "MonsterTemplate":
+        return cls(
+            name = data["name"],
+            health = data["health"],
+            attack = data["attack"],
+            defense = data["defense"],
+            xpReward = data["xpReward"],
+            rarity = data["rarity"],
+            description = data.get("description", ""),
+            lootTable = MappingProxyType({itemName: MappingProxyType(dict(loot)) for itemName, loot in data.get("lootTable", {}).items()})
+        )
+
+# === Bit per character field for the dirty masks of the sessions, handed out the first time a field changes ===
+characterFieldBits: Dict[str, int] = {}
+_fieldBitsLock = threading.Lock()
+
+def fieldBit(field: str) -> int:
+    bit = characterFieldBits.get(field)
+    if bit is None:
+        with _fieldBitsLock:
+            bit = characterFieldBits.setdefault(field, 1 << len(characterFieldBits))
+    return bit
+
+# === One fight in progress, only the fields that change during the fight live here ===
+class CombatSession:
+    __slots__ = (
+        "userID", "monster", "monsterHealth", "turn", "turnCount",
+        "playerEffects", "monsterEffects", "skillCooldowns",
+        "seed", "rng", "checkpointTurn", "resumed",
+        "character", "dirtyMask", "events"
+    )
+
+    def __init__(self, userID: str, monster: MonsterTemplate, skillCooldowns, seed: int, rng, monsterHealth: int = None, turn: str = "player", turnCount: int = 1, playerEffects: Dict = None, monsterEffects: Dict = None, character: Dict = None):
+        self.userID = userID
+        self.monster = monster # <= Shared template, never changed
+        self.monsterHealth = monster.health if monsterHealth is None else monsterHealth
+        self.turn = turn
+        self.turnCount = turnCount
+        self.playerEffects = playerEffects if playerEffects is not None else {} # <= Stores temporary stats like defensive stance or burn effects for in the future
+        self.monsterEffects = monsterEffects if monsterEffects is not None else {}
+        self.skillCooldowns = skillCooldowns
+        self.seed = seed
+        self.rng = rng # <= Every roll of this fight comes from its own stream
+        self.checkpointTurn = 0
+        self.resumed = False # <= Set when the fight was brought back from a checkpoint
+        self.character = character # <= Loaded once when the fight starts, the turns only change this copy
+        self.dirtyMask = 0 # <= fieldBit of every character field that changed since the last flush, an int instead of a set per session
+        self.events = None # <= Packed event log of the fight, startCombat fills in the header and it's archived when the fight ends
+
+    @property
+    def monsterMaxHealth(self) -> int:
+        return self.monster.health
+
+    # === Changes the in memory character, the database gets the net result on the next flush ===
+    def updateCharacter(self, updates: Dict):
+        self.character.update(updates)
+        for field in updates:
+            self.dirtyMask |= fieldBit(field)
+
+    @property
+    def dirtyFields(self) -> List[str]:
+        return [field for field, bit in characterFieldBits.items() if self.dirtyMask & bit]
+
+    # === Appends one packed event to the log of the fight ===
+    def record(self, code: int, arg: int = 0, value: int = 0):
+        if self.events is None:
+            self.events = bytearray()
+        self.events += packEvent(code, arg, self.turnCount, value)
+
+    # === Hands out the changed fields and marks them as flushed ===
+    def takeCharacterUpdates(self) -> Dict:
+        updates = {field: self.character[field] for field in self.dirtyFields}
+        self.dirtyMask = 0
+        return updates
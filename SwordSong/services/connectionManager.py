@@ -0,0 +1,75 @@
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+class ConnectionManager:
+    def __init__(self, dataPath, readers: int = 4, synchronous: str = "NORMAL", cacheSizeKB: int = 16000, mmapSize: int = 256 * 1024 * 1024):
+        self.dbPath = Path(dataPath)
+        self.maxReaders = max(1, readers)
+        self.cacheSizeKB = cacheSizeKB
+        self.mmapSize = mmapSize
+
+        # One serialized writer connection, all the writes are going through this one
+        self.writerLock = threading.RLock()
+        self.writerConn = self._connect()
+        self.writerConn.execute("PRAGMA journal_mode = WAL")
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
+        self.writerConn.execute(f"PRAGMA synchronous = {synchronous.upper()}") # <= NORMAL is safe with WAL, only the last commits can be lost on a power cut
+
+        # Read only connections are opened lazily up to maxReaders
+        self._readers = queue.LifoQueue()
+        self._readerCount = 0
+        self._readerLock = threading.Lock()
+        self._allReaders = []
+
+    # === Opens a new connection with the tuned pragmas ===
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.dbPath, check_same_thread = False, timeout = 10, cached_statements = 256)
+        conn.execute(f"PRAGMA cache_size = -{self.cacheSizeKB}") # <= Negative value means KiB instead of pages
+        conn.execute(f"PRAGMA mmap_size = {self.mmapSize}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    # === Gives out a read only connection from the pool ===
+    @contextmanager
+    def reader(self):
+        conn = self._acquireReader()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _acquireReader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._readerLock:
+            if self._readerCount < self.maxReaders:
+                conn = self._connect()
+                conn.execute("PRAGMA query_only = ON")
+                self._readerCount += 1
+                self._allReaders.append(conn)
+                return conn
+
+        return self._readers.get() # <= The pool is full, wait for a reader to be handed back
+
+    # === Gives out the writer connection, only one thread can hold it at a time ===
+    @contextmanager
+    def writer(self):
+        with self.writerLock:
+            yield self.writerConn
+
+    # === Closes every connection in the pool ===
+    def close(self):
+        with self.writerLock:
+            self.writerConn.close()
+        with self._readerLock:
+            for conn in self._allReaders:
+                conn.close()
+            self._allReaders.clear()
+            self._readerCount = 0
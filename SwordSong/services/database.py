@@ -1,123 +1,47 @@
 import sqlite3
+import time
 from pathlib import Path
+from .connectionManager import ConnectionManager
+from .writeBehind import WriteBehindQueue
+from .characterCache import CharacterCache
+from .migrations import runMigrations
+from .updateBuilder import UpdateBuilder
+from .playerSnapshot import PlayerSnapshot
 
 class Database:
-    def __init__(self, dataPath):
+    def __init__(self, dataPath, readers: int = 4, durability: str = "grouped", flushInterval: float = 0.25, maxPendingWrites: int = 100, synchronous: str = "NORMAL", cacheSize: int = 1024, cacheTTL: float = 300.0):
         self.dbPath = Path(dataPath)
-        self.conn = sqlite3.connect(self.dbPath)
-        self.cursor = self.conn.cursor()
+        self.characterCache = CharacterCache(cacheSize, cacheTTL)
+        self.snapshotCache = CharacterCache(cacheSize, cacheTTL, copyEntries = False)
+        self.connections = ConnectionManager(self.dbPath, readers = readers, synchronous = synchronous)
         self.setupDatabase()
+        self.writes = WriteBehindQueue(self.connections, durability, flushInterval, maxPendingWrites)
+        self.writes.onRollback = self._onUnitRollback
+        self.writes.onMutation = self.snapshotCache.invalidate # <= Any write to a player makes their snapshot stale
 
     # === Seting up the database ===
     def setupDatabase(self):
+        with self.connections.writer() as conn:
+            runMigrations(conn)
 
-        # === Creates a character table ===
-        self.cursor.execute(''' 
-            CREATE TABLE IF NOT EXISTS characters (
-                userID TEXT PRIMARY KEY,
-                name TEXT NOT NULL,
-                level INTEGER DEFAULT 1,
-                xp INTEGER DEFAULT 0,
-                xpToLevel INTEGER DEFAULT 100,
-                health INTEGER DEFAULT 100,
-                maxHealth INTEGER DEFAULT 100,
-                attack INTEGER DEFAULT 10,
-                defense INTEGER DEFAULT 5,
-                coins INTEGER DEFAULT 0,
-                currentArea TEXT DEFAULT 'forest'
-            )''')
-        
-        # === Creates the inventory table ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS inventory (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                userID TEXT,
-                itemName TEXT,
-                quantity INTEGER DEFAULT 1,
-                FOREIGN KEY (userID) REFERENCES characters(userID)
-            )''')
-        
-        # === Created the equipment table ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS equipment (
-                userID TEXT,
-                slot TEXT,
-                itemName TEXT,
-                FOREIGN KEY (userID) REFERENCES characters(userID),
-                PRIMARY KEY (userID, slot)
-            )''')
-        
-        # === Creates the monster table ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS monsters (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                area TEXT,
-                health INTEGER,
-                attack INTEGER,
-                defense INTEGER,
-                xpReward INTEGER,
-                type TEXT,
-                effect TEXT,
-                description TEXT
-            )''')
-        
-        # === Creates the shop items table ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS shopItems (
-                itemName TEXT PRIMARY KEY,
-                buyPrice INTEGER,
-                sellPrice INTEGER,
-                type TEXT,
-                effect TEXT,
-                description TEXT
-            )''')
-        
-        # === Creates a table to track the amount of fights the character did ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS fightStats (
-                userID TEXT PRIMARY KEY,
-                totalFights INTEGER DEFAULT 0,
-                fightsSinceBoss INTEGER DEFAULT 0,
-                lastFightTimestamp INTEGER DEFAULT 0,
-                FOREIGN KEY (userID) REFERENCES characters(userID)
-            )''')
-        
-        # === A table to track the cooldowns of the skills of the character ===
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS skillCooldowns (
-                userID TEXT,
-                skillName TEXT,
-                turnsRemaining INTEGER DEFAULT 0,
-                PRIMARY KEY (userID, skillName),
-                FOREIGN KEY (userID) REFERENCES characters(userID)
-            )''')
-        
-        # === Add a mana colums to already existing characters before i added mana ===
-        try:
-            self.cursor.execute("ALTER TABLE characters ADD COLUMN mana INTEGER DEFAULT 50")
-            self.cursor.execute("ALTER TABLE characters ADD COLUMN maxMana INTEGER DEFAULT 50")
-        except sqlite3.OperationalError:
-            pass
-        
-        self.conn.commit()
+            # The update builders only accept the columns that exist in the migrated schema
+            self.characterUpdates = UpdateBuilder.fromSchema(conn, "characters", "userID")
+            self.fightStatsUpdates = UpdateBuilder.fromSchema(conn, "fightStats", "userID")
 
     # === Creates a new character into the databse ===
     def createCharacter(self, userID: str, name: str):
         try:
-            self.cursor.execute(
-                "INSERT INTO characters (userID, name) VALUES (?, ?)",
-                (userID, name)
-            )
-
-            equipmentSlots = ["weapon", "offhand", "helmet", "chestplate", "leggings", "boots"]
-            for slot in equipmentSlots:
-                self.cursor.execute(
-                    "INSERT INTO equipment (userID, slot, itemName) VALUES (?, ?, ?)",
-                    (userID, slot, None)
+            with self.writes.mutation(userID) as conn:
+                conn.execute(
+                    "INSERT INTO characters (userID, name) VALUES (?, ?)",
+                    (userID, name)
                 )
 
-            self.conn.commit()
+                equipmentSlots = ["weapon", "offhand", "helmet", "chestplate", "leggings", "boots"]
+                conn.executemany(
+                    "INSERT INTO equipment (userID, slot, itemName) VALUES (?, ?, ?)",
+                    [(userID, slot, None) for slot in equipmentSlots]
+                )
             return True
         except sqlite3.IntegrityError:
             print(f"The character with the userID: {userID} already exists.")
@@ -128,14 +52,23 @@ class Database:
         
     # === Fetches the character data from the database ===
     def getCharacter(self, userID: str) -> dict:
+        character = self.characterCache.get(userID)
+        if character is not None:
+            return character
+
         try:
-            self.cursor.execute("SELECT * FROM characters WHERE userID = ?", (userID,))
-            result = self.cursor.fetchone()
-            if not result:
-                return None
-            
-            colums = [description[0] for description in self.cursor.description]
-            return dict(zip(colums, result))
+            generation = self.characterCache.generation()
+            with self.writes.readerFor(userID) as conn:
+                cursor = conn.execute("SELECT * FROM characters WHERE userID = ?", (userID,))
+                result = cursor.fetchone()
+                if not result:
+                    return None
+                
+                colums = [description[0] for description in cursor.description]
+                character = dict(zip(colums, result))
+
+            self.characterCache.put(userID, character, generation)
+            return character
         except sqlite3.Error as e:
             print(f"There was a database error while fetching the character: {e}")
 
@@ -145,43 +78,51 @@ class Database:
             return True
         
         try:
-            setValues = ", ".join([f"{k} = ?" for k in updates.keys()])
-            query = f"UPDATE characters SET {setValues} WHERE userID = ?"
-            values = list(updates.values()) + [userID]
-
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            return self.cursor.rowcount > 0 # Only returns True if it actually updated
-        except sqlite3.Error as e:
+            with self.writes.mutation(userID, defer = True) as conn:
+                query, values = self.characterUpdates.build(userID, updates) # <= Built inside the mutation, so rejected updates fail the enclosing unit of work
+                cursor = conn.execute(query, values)
+            self.characterCache.update(userID, updates)
+            return cursor.rowcount > 0 # Only returns True if it actually updated
+        except (sqlite3.Error, ValueError, TypeError) as e:
             print(f"There was an error while updating the character with userID: {userID}: {e}")
             return False
         
     # === Deletes a character from the database ===
     def deleteCharacter(self, userID: str) -> bool:
         try:
-            self.cursor.execute("DELETE FROM characters WHERE userID = ?", (userID,))
-            self.cursor.execute("DELETE FROM inventory WHERE userID = ?", (userID,))
-            self.cursor.execute("DELETE FROM equipment WHERE userID = ?", (userID,))
-            self.conn.commit()
+            with self.writes.mutation(userID) as conn:
+                conn.execute("DELETE FROM characters WHERE userID = ?", (userID,))
+                conn.execute("DELETE FROM inventory WHERE userID = ?", (userID,))
+                conn.execute("DELETE FROM equipment WHERE userID = ?", (userID,))
+                conn.execute("DELETE FROM activeCombats WHERE userID = ?", (userID,))
+                conn.execute("DELETE FROM combatLogs WHERE userID = ?", (userID,))
+                conn.execute("DELETE FROM dungeonRuns WHERE userID = ?", (userID,))
+            self.characterCache.invalidate(userID)
             return True
         
         except sqlite3.Error as e:
             print("There was an error while delting the character: {e}")
-            self.conn.rollback()
             return False
         
     # === Fetches the inventory data of a character ===
     def getInventory(self, userID: str) -> list:
         try:
-            self.cursor.execute("SELECT itemName, quantity FROM inventory WHERE userID = ?", (userID,))
-            return self.cursor.fetchall()
+            with self.writes.readerFor(userID) as conn:
+                return conn.execute("SELECT itemName, quantity FROM inventory WHERE userID = ?", (userID,)).fetchall()
         except sqlite3.Error as e:
             print(f"There was a database error while fetching the inventory: {e}")
             return []
     
     # === Adds an item to the inventory of a character ===
     def addItem(self, userID: str, itemName: str, quantity: int = 1) -> bool:
-        if quantity <= 0:
+        return self.addItems(userID, [(itemName, quantity)])
+
+    # === Adds a batch of items to the inventory of a character in one transaction ===
+    def addItems(self, userID: str, items: list[tuple[str, int]]) -> bool:
+        if not items:
+            return True
+
+        if any(quantity <= 0 for _, quantity in items):
             print("The quantity must be greater than 0.")
             return False
         
@@ -190,20 +131,16 @@ class Database:
             return False
         
         try:
-            self.cursor.execute("SELECT quantity FROM inventory WHERE userID = ? AND itemName = ?", (userID, itemName))
-            existing = self.cursor.fetchone()
-
-            if existing:
-                newQuantity = existing[0] + quantity
-                self.cursor.execute("UPDATE inventory SET quantity = ? WHERE userID = ? AND itemName = ?", (newQuantity, userID, itemName))
-            
-            else:
-                self.cursor.execute("INSERT INTO inventory (userID, itemName, quantity) VALUES (?, ?, ?)", (userID, itemName, quantity))
-            
-            self.conn.commit()
+            with self.writes.mutation(userID) as conn:
+                conn.executemany(
+                    "INSERT INTO inventory (userID, itemName, quantity) VALUES (?, ?, ?) "
+                    "ON CONFLICT (userID, itemName) DO UPDATE SET quantity = quantity + excluded.quantity",
+                    [(userID, itemName, quantity) for itemName, quantity in items]
+                )
             return True
         except sqlite3.Error as e:
-            print(f"There was an error while adding the item {itemName} to the inventory of {userID}: {e}")
+            itemNames = ", ".join(itemName for itemName, _ in items)
+            print(f"There was an error while adding the items {itemNames} to the inventory of {userID}: {e}")
             return False
 
     # === Removes an item from the inventory of a character ===
@@ -213,28 +150,26 @@ class Database:
             return False
         
         try:
-            self.cursor.execute("SELECT itemName, quantity FROM inventory WHERE userID = ? and LOWER(itemName) = LOWER(?)", (userID, itemName))
-            result = self.cursor.fetchone()
+            with self.writes.mutation(userID) as conn:
+                result = conn.execute("SELECT itemName, quantity FROM inventory WHERE userID = ? and LOWER(itemName) = LOWER(?)", (userID, itemName)).fetchone()
 
-            if not result:
-                print(f"The item {itemName} has not been found in the inventory of {userID}")
-                return False
-            
-            actualItemName, currentQuantity = result
+                if not result:
+                    print(f"The item {itemName} has not been found in the inventory of {userID}")
+                    return False
+                
+                actualItemName, currentQuantity = result
 
-            if currentQuantity < quantity:
-                print(f"There is not enough quantity of {itemName} in inventory. You have: {currentQuantity}, need: {quantity}")
-                return False
-            
-            newQuantity = currentQuantity - quantity
+                if currentQuantity < quantity:
+                    print(f"There is not enough quantity of {itemName} in inventory. You have: {currentQuantity}, need: {quantity}")
+                    return False
+                
+                newQuantity = currentQuantity - quantity
 
-            if newQuantity <= 0:
-                self.cursor.execute("DELETE FROM inventory WHERE userID = ? AND itemName = ?", (userID, actualItemName))
-            
-            else:
-                self.cursor.execute("UPDATE inventory SET quantity = ? WHERE userID = ? AND itemName = ?", (newQuantity, userID, actualItemName))
-            
-            self.conn.commit()
+                if newQuantity <= 0:
+                    conn.execute("DELETE FROM inventory WHERE userID = ? AND itemName = ?", (userID, actualItemName))
+                
+                else:
+                    conn.execute("UPDATE inventory SET quantity = ? WHERE userID = ? AND itemName = ?", (newQuantity, userID, actualItemName))
             return True
         except sqlite3.Error as e:
             print(f"There was an error while removing the item {itemName} from the inventory of {userID}: {e}")
@@ -243,8 +178,8 @@ class Database:
     # === Equips an item to a character ===
     def equipItem(self, userID: str, slot: str, itemName: str) -> bool:
         try:
-            self.cursor.execute("INSERT OR REPLACE INTO equipment (userID, slot, itemName) VALUES (?, ?, ?)", (userID, slot, itemName))
-            self.conn.commit()
+            with self.writes.mutation(userID) as conn:
+                conn.execute("INSERT OR REPLACE INTO equipment (userID, slot, itemName) VALUES (?, ?, ?)", (userID, slot, itemName))
             return True
         except sqlite3.Error as e:
             print(f"There was an error while equipping the item; {e}")
@@ -253,8 +188,8 @@ class Database:
     # === Gets all the equipment items of a character ===
     def getEquipment(self, userID: str) -> dict[str, str]:
         try:
-            self.cursor.execute("SELECT slot, itemName FROM equipment WHERE userID = ?", (userID,))
-            return dict(self.cursor.fetchall())
+            with self.writes.readerFor(userID) as conn:
+                return dict(conn.execute("SELECT slot, itemName FROM equipment WHERE userID = ?", (userID,)).fetchall())
         except sqlite3.Error as e:
             print(f"There was an error while fetching the equipment of {userID}: {e}")
             return {}
@@ -262,8 +197,8 @@ class Database:
     # === unequips the item from a character ===
     def unequipItem(self, userID: str, slot: str) -> bool:
         try:
-            self.cursor.execute("DELETE FROM equipment WHERE userID = ? AND slot = ?", (userID, slot))
-            self.conn.commit()
+            with self.writes.mutation(userID) as conn:
+                conn.execute("DELETE FROM equipment WHERE userID = ? AND slot = ?", (userID, slot))
             return True
         except sqlite3.Error as e:
             print(f"There was an error while unequipping the item from {userID} in slot {slot}: {e}")
@@ -273,8 +208,8 @@ class Database:
     # === Initializes the fighting stat for chacteractes ===
     def initializeFightStats(self, userID: str) -> bool:
         try:
-            self.cursor.execute("INSERT OR IGNORE INTO fightStats (userID) VALUES (?)", (userID,))
-            self.conn.commit()
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("INSERT OR IGNORE INTO fightStats (userID) VALUES (?)", (userID,))
             return True
         except sqlite3.Error as e:
             print(f"There was an error initializing fight stats for {userID}: {e}")
@@ -283,8 +218,8 @@ class Database:
     # === Pulls the fight stats from the data base ===
     def getFightStats(self, userID: str) -> dict:
         try:
-            self.cursor.execute("SELECT totalFights, fightsSinceBoss, lastFightTimestamp FROM fightStats WHERE userID = ?", (userID,))
-            result = self.cursor.fetchone()
+            with self.writes.readerFor(userID) as conn:
+                result = conn.execute("SELECT totalFights, fightsSinceBoss, lastFightTimestamp FROM fightStats WHERE userID = ?", (userID,)).fetchone()
 
             if not result:
                 return None
@@ -304,24 +239,20 @@ class Database:
             return True
         
         try:
-            self.initializeFightStats(userID) # <= Makes sure the fight stats recods exists
-
-            setValues = ", ".join([f"{k} = ?" for k in updates.keys()])
-            query = f"UPDATE fightStats SET {setValues} WHERE userID = ?"
-            values = list(updates.values()) + [userID]
-
-            self.cursor.execute(query, values)
-            self.conn.commit()
-            return self.cursor.rowcount > 0
-        except sqlite3.Error as e:
+            with self.writes.mutation(userID, defer = True) as conn:
+                query, values = self.fightStatsUpdates.build(userID, updates) # <= Same as updateCharacter, a rejected update fails the unit
+                conn.execute("INSERT OR IGNORE INTO fightStats (userID) VALUES (?)", (userID,)) # <= Makes sure the fight stats recods exists
+                cursor = conn.execute(query, values)
+            return cursor.rowcount > 0
+        except (sqlite3.Error, ValueError, TypeError) as e:
             print(f"There was an error that occured while updating fight stats for {userID}: {e}")
             return False
         
     # === Sets the cooldowns for the skills ===
     def setSkillCooldown(self, userID: str, skillName: str, turns: int) -> bool:
         try:
-            self.cursor.execute("INSERT OR REPLACE INTO skillCooldowns (userID, skillName, turnsRemaining) VALUES (?, ?, ?)", (userID, skillName, turns ))
-            self.conn.commit()
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("INSERT OR REPLACE INTO skillCooldowns (userID, skillName, turnsRemaining) VALUES (?, ?, ?)", (userID, skillName, turns ))
             return True
         except sqlite3.Error as e:
             print(f"There was an error while setting the skil cooldowns for {userID}: {e}")
@@ -330,8 +261,8 @@ class Database:
     # === Gets the skill cooldowns for the characters ===
     def getSkillCooldown(self, userID: str, skillName: str) -> int:
         try:
-            self.cursor.execute("SELECT turnsRemaining FROM skillCooldowns WHERE userID = ? AND skillName = ?", (userID, skillName))
-            result = self.cursor.fetchone()
+            with self.writes.readerFor(userID) as conn:
+                result = conn.execute("SELECT turnsRemaining FROM skillCooldowns WHERE userID = ? AND skillName = ?", (userID, skillName)).fetchone()
             return result[0] if result else 0
         except sqlite3.Error as e:
             print(f"There was an error while getting the skill cooldowns for {userID}: {e}")
@@ -344,30 +275,229 @@ class Database:
     # === Updates the skill cooldown and reduces it by 1 turn
     def updateSkillCooldown(self, userID: str) -> bool:
         try:
-            self.cursor.execute("UPDATE skillCooldowns SET turnsRemaining = turnsRemaining - 1 WHERE userID = ? and turnsRemaining > 0", (userID,))
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("UPDATE skillCooldowns SET turnsRemaining = turnsRemaining - 1 WHERE userID = ? and turnsRemaining > 0", (userID,))
 
-            self.cursor.execute("DELETE FROM skillCooldowns WHERE userID = ? and turnsRemaining <= 0", (userID,))
-            self.conn.commit()
+                conn.execute("DELETE FROM skillCooldowns WHERE userID = ? and turnsRemaining <= 0", (userID,))
             return True
         except sqlite3.Error as e:
             print(f"There was an error while updating the skill cooldowns for {userID}: {e}")
             return False
         
+    # === Replaces all the skill cooldowns of the user in one write ===
+    def saveSkillCooldowns(self, userID: str, cooldowns: dict) -> bool:
+        try:
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("DELETE FROM skillCooldowns WHERE userID = ?", (userID,))
+                conn.executemany(
+                    "INSERT INTO skillCooldowns (userID, skillName, turnsRemaining) VALUES (?, ?, ?)",
+                    [(userID, skillName, turns) for skillName, turns in cooldowns.items() if turns > 0]
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while saving the skill cooldowns for {userID}: {e}")
+            return False
+
     # === Gets alss the skill cooldowns for the user ===
     def getALlSkillCooldown(self, userID: str) -> dict:
         try:
-            self.cursor.execute("SELECT skillName, turnsRemaining FROM skillCooldowns WHERE userID = ? and turnsRemaining > 0", (userID,))
-            return dict(self.cursor.fetchall())
+            with self.writes.readerFor(userID) as conn:
+                return dict(conn.execute("SELECT skillName, turnsRemaining FROM skillCooldowns WHERE userID = ? and turnsRemaining > 0", (userID,)).fetchall())
         except sqlite3.Error as e:
             print(f"There was an error while getting all the skill cooldowns for {userID}: {e}")
             return {} 
     
-    # === Self note: Add shop management methods here ===
+    # === Active combat checkpoint methods ===
+    # === Stores the serialized combat session of the user ===
+    def saveActiveCombat(self, userID: str, state: bytes) -> bool:
+        try:
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute(
+                    "INSERT INTO activeCombats (userID, state, updatedAt) VALUES (?, ?, ?) "
+                    "ON CONFLICT (userID) DO UPDATE SET state = excluded.state, updatedAt = excluded.updatedAt",
+                    (userID, state, int(time.time()))
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while saving the combat of {userID}: {e}")
+            return False
+
+    # === Gets the serialized combat session and when it was saved, None when the user isn't fighting ===
+    def getActiveCombat(self, userID: str):
+        try:
+            with self.writes.readerFor(userID) as conn:
+                return conn.execute("SELECT state, updatedAt FROM activeCombats WHERE userID = ?", (userID,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"There was an error while getting the combat of {userID}: {e}")
+            return None
+
+    def deleteActiveCombat(self, userID: str) -> bool:
+        try:
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("DELETE FROM activeCombats WHERE userID = ?", (userID,))
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while deleting the combat of {userID}: {e}")
+            return False
+
+    # === Combat log archive methods ===
+    # === Appends a batch of finished combat logs, rows are (userID, monster, outcome, turns, endedAt, events) ===
+    def archiveCombatLogs(self, rows: list) -> bool:
+        try:
+            with self.writes.mutation(defer = True) as conn:
+                conn.executemany(
+                    "INSERT INTO combatLogs (userID, monster, outcome, turns, endedAt, events) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while archiving {len(rows)} combat logs: {e}")
+            return False
+
+    # === Gets the newest combat logs of a user, newest first ===
+    def getCombatLogs(self, userID: str, limit: int = 10) -> list:
+        try:
+            with self.writes.readerFor(userID) as conn:
+                return conn.execute(
+                    "SELECT id, monster, outcome, turns, endedAt, events FROM combatLogs WHERE userID = ? ORDER BY id DESC LIMIT ?",
+                    (userID, limit)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"There was an error while getting the combat logs of {userID}: {e}")
+            return []
+
+    def getCombatLog(self, logID: int):
+        try:
+            with self.connections.reader() as conn:
+                return conn.execute("SELECT id, monster, outcome, turns, endedAt, events FROM combatLogs WHERE id = ?", (logID,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"There was an error while getting combat log {logID}: {e}")
+            return None
+
+    # === Dungeon run methods ===
+    # === Stores the checkpoint of a dungeon run, state is (seed, rollSeed, configHash, playerCell, visited, cleared) ===
+    def saveDungeon(self, userID: str, state: tuple) -> bool:
+        try:
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute(
+                    "INSERT INTO dungeonRuns (userID, seed, rollSeed, configHash, playerCell, visited, cleared, updatedAt) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (userID) DO UPDATE SET seed = excluded.seed, rollSeed = excluded.rollSeed, configHash = excluded.configHash, "
+                    "playerCell = excluded.playerCell, visited = excluded.visited, cleared = excluded.cleared, updatedAt = excluded.updatedAt",
+                    (userID, *state, int(time.time()))
+                )
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while saving the dungeon of {userID}: {e}")
+            return False
+
+    # === Gets the dungeon checkpoint and when it was saved, None when the user isn't in a dungeon ===
+    def getDungeon(self, userID: str):
+        try:
+            with self.writes.readerFor(userID) as conn:
+                row = conn.execute(
+                    "SELECT seed, rollSeed, configHash, playerCell, visited, cleared, updatedAt FROM dungeonRuns WHERE userID = ?",
+                    (userID,)
+                ).fetchone()
+                return (row[:6], row[6]) if row else None
+        except sqlite3.Error as e:
+            print(f"There was an error while getting the dungeon of {userID}: {e}")
+            return None
+
+    def deleteDungeon(self, userID: str) -> bool:
+        try:
+            with self.writes.mutation(userID, defer = True) as conn:
+                conn.execute("DELETE FROM dungeonRuns WHERE userID = ?", (userID,))
+            return True
+        except sqlite3.Error as e:
+            print(f"There was an error while deleting the dungeon of {userID}: {e}")
+            return False
+
+    # === Player snapshot methods ===
+    # === Reads the character, equipment, inventory, fight stats and cooldowns in one read transaction ===
+    def getPlayerSnapshot(self, userID: str) -> PlayerSnapshot:
+        snapshot = self.snapshotCache.get(userID)
+        if snapshot is not None:
+            return snapshot
+
+        try:
+            generation = self.snapshotCache.generation()
+            with self.writes.readerFor(userID) as conn:
+                ownTransaction = not conn.in_transaction # <= The writer might already be inside the write-behind transaction
+                if ownTransaction:
+                    conn.execute("BEGIN")
+                try:
+                    cursor = conn.execute("SELECT * FROM characters WHERE userID = ?", (userID,))
+                    result = cursor.fetchone()
+                    if not result:
+                        return None
+
+                    colums = [description[0] for description in cursor.description]
+                    character = dict(zip(colums, result))
+                    equipment = conn.execute("SELECT slot, itemName FROM equipment WHERE userID = ?", (userID,)).fetchall()
+                    inventory = conn.execute("SELECT itemName, quantity FROM inventory WHERE userID = ?", (userID,)).fetchall()
+                    cursor = conn.execute("SELECT totalFights, fightsSinceBoss, lastFightTimestamp FROM fightStats WHERE userID = ?", (userID,))
+                    result = cursor.fetchone()
+                    fightStats = dict(zip([description[0] for description in cursor.description], result)) if result else None
+                    skillCooldowns = conn.execute("SELECT skillName, turnsRemaining FROM skillCooldowns WHERE userID = ? and turnsRemaining > 0", (userID,)).fetchall()
+                finally:
+                    if ownTransaction:
+                        conn.commit()
+
+            snapshot = PlayerSnapshot.fromRows(character, equipment, inventory, fightStats, skillCooldowns)
+            self.snapshotCache.put(userID, snapshot, generation)
+            return snapshot
+        except sqlite3.Error as e:
+            print(f"There was a database error while fetching the snapshot of {userID}: {e}")
+            return None
+
+    # === Unit of work, every write inside the with block is committed once at the end ===
+    # === Usage: with db.transaction() as unit: ... then unit.failed tells if it was rolled back ===
+    def transaction(self, defer: bool = False):
+        return self.writes.transaction(defer)
+
+    # === The cached characters might hold writes that were just rolled back ===
+    def _onUnitRollback(self, users: set):
+        for userID in users:
+            self.characterCache.invalidate(userID)
+            self.snapshotCache.invalidate(userID)
+
+    # === Shop management methods ===
+    # === Buys an item, the coins and the item are written in one transaction ===
+    def buyItem(self, userID: str, itemName: str, price: int) -> bool:
+        with self.transaction() as unit:
+            character = self.getCharacter(userID)
+            if not character or character["coins"] < price:
+                return False
+
+            if not self.addItem(userID, itemName, 1):
+                return False
+            self.updateCharacter(userID, {"coins": character["coins"] - price})
+        return not unit.failed
+
+    # === Sells an item, the coins and the item are written in one transaction ===
+    def sellItem(self, userID: str, itemName: str, price: int) -> bool:
+        with self.transaction() as unit:
+            character = self.getCharacter(userID)
+            if not character or not self.removeItem(userID, itemName, 1):
+                return False
+
+            self.updateCharacter(userID, {"coins": character["coins"] + price})
+        return not unit.failed
+
+    # === Commits every write that is still waiting in the write-behind queue ===
+    def flush(self):
+        self.writes.flush()
+
+    # === Flushes the pending writes and closes all the database connections ===
+    def close(self):
+        if hasattr(self, 'connections'):
+            self.writes.close()
+            self.connections.close()
+            del self.connections
 
     # === Closes the database connection when the object is deleted ===
     def __del__(self):
         try:
-            if hasattr(self, 'conn'):
-                self.conn.close()
+            self.close()
         except:
-            pass # <= Ignores errors dring th cleanup proccess
\ No newline at end of file
+            pass # <= Ignores errors dring th cleanup proccess
@@ -1,7 +1,6 @@
 from dataclasses import dataclass, field
 from typing import Dict
 from .models import RoomType
-from .defaults import defaultRoomData
 
 @dataclass
 class RoomData:
@@ -17,6 +16,12 @@ class DungeonConfig:
     width: int = 9
     height: int = 7
     roomData: Dict[RoomType, RoomData] = field(default_factory = dict)
+    roomDensity: float = 0.55 # <= Share of the cells that become rooms, the rest is solid rock
+    branchChance: float = 0.35 # <= Chance a step starts a side branch instead of extending the newest corridor
+    loopChance: float = 0.05 # <= Chance a room gets an extra door to a neighbor, 0 keeps it a pure tree
+    deadEndChance: float = 0.25 # <= Chance a dead end on a side branch becomes the dead end room
+    goalRoom: RoomType = RoomType.TREASURE # <= Room at the end of the main path
+    deadEndRoom: RoomType = RoomType.TREASURE
 
     def __post_init__(self):
         if not self.roomData:
@@ -1,5 +1,5 @@
 from .models import RoomType
-from .config import RoomData
+from .config import DungeonConfig, RoomData
 
 entranceData = RoomData(
     emojiUnvisited = "⬛",
@@ -94,3 +94,5 @@ defaultRoomData = {
     RoomType.PUZZLE:   puzzleData,
     RoomType.EMPTY:    emptyData,
 }
+
+defaultDungeonConfig = DungeonConfig() # <= The 9x7 dungeon of .dungeon, one shared instance so the pool doesn't hash it on every take
@@ -0,0 +1,164 @@
+import zlib
+from dataclasses import astuple, dataclass
+from itertools import compress
+from typing import List
+from .config import DungeonConfig
+from .models import RoomType
+from .randomProvider import RandomProvider
+
+# === Connection bits of a cell, a room with every exit open is 0b1111 ===
+directionBits = {"north": 1, "east": 2, "south": 4, "west": 8}
+oppositeBits = (0, 4, 8, 0, 1, 0, 0, 0, 2) # <= Indexed by the direction bit
+freeBits = [tuple(bit for bit in (1, 2, 4, 8) if mask & bit) for mask in range(16)] # <= mask -> the directions in it
+branchMarker = bytes((0, 1)) + bytes(254) # <= translate table that keeps only the cells still marked 1
+roomTypeOrder: List[RoomType] = list(RoomType) # <= A cell stores index + 1 of its room type, 0 means there is no room
+
+generatorVersion = 1 # <= Bump it when the same seed and config would carve a different layout
+
+def roomTypeCode(roomType: RoomType) -> int:
+    return roomTypeOrder.index(roomType) + 1
+
+# === Identifies the layouts a config generates, a stored seed only gives back the same dungeon under the same hash ===
+def configHash(config: DungeonConfig) -> int:
+    key = (
+        generatorVersion,
+        config.width, config.height, config.roomDensity, config.branchChance, config.loopChance, config.deadEndChance,
+        config.goalRoom.value, config.deadEndRoom.value,
+        [(roomType.value,) + astuple(data) for roomType, data in config.roomData.items()],
+        [roomType.value for roomType in roomTypeOrder]
+    )
+    return zlib.crc32(repr(key).encode())
+
+# === The generated grid as flat arrays, cell index is y * width + x ===
+@dataclass
+class DungeonLayout:
+    width: int
+    height: int
+    connections: bytearray # <= Connection bits per cell
+    roomTypes: bytearray # <= Room type code per cell, 0 for solid rock
+    depth: List[int] # <= Steps from the entrance along the spanning tree
+    entrance: int
+    goal: int # <= The deepest room, the end of the main path
+    roomCount: int
+
+    def position(self, cell: int):
+        return cell % self.width, cell // self.width
+
+# === Growing tree generator: carves a spanning tree from the entrance, so every room can be reached ===
+class DungeonGenerator:
+    def __init__(self, config: DungeonConfig, rng: RandomProvider):
+        if config.width < 2 or config.height < 1:
+            raise ValueError("A dungeon needs at least 2 cells")
+        self.config = config
+        self.rng = rng
+
+    def generate(self) -> DungeonLayout:
+        width, height = self.config.width, self.config.height
+        cellCount = width * height
+        target = max(2, min(cellCount, round(cellCount * self.config.roomDensity)))
+        rand = self.rng.random
+
+        connections = bytearray(cellCount)
+        roomTypes = bytearray(cellCount)
+        depth = [0] * cellCount
+        parent = [-1] * cellCount
+
+        entrance = self.rng.randint(0, height - 1) * width # <= Always on the west edge, like the old layout
+        roomTypes[entrance] = 1 # <= Placeholder, the real types are picked once the layout is done
+        active = [entrance]
+        carved = 1
+
+        # === Carving, the newest cell makes long corridors, a random cell starts a new branch ===
+        branchChance = self.config.branchChance
+        lastColumn = width - 1
+        lastRow = cellCount - width
+        offsets = (0, -width, 1, 0, width, 0, 0, 0, -1) # <= Indexed by the direction bit
+        while carved < target and active:
+            roll = rand()
+            index = int(roll / branchChance * len(active)) if roll < branchChance else -1 # <= One roll picks both the mode and the cell
+            cell = active[index]
+            x = cell % width
+
+            free = 0 # <= Bits of the neighbors that are still solid rock
+            if cell >= width and not roomTypes[cell - width]:
+                free = 1
+            if x < lastColumn and not roomTypes[cell + 1]:
+                free |= 2
+            if cell < lastRow and not roomTypes[cell + width]:
+                free |= 4
+            if x and not roomTypes[cell - 1]:
+                free |= 8
+
+            if not free:
+                active[index] = active[-1] # <= O(1) removal, the order of the active list doesn't matter
+                active.pop()
+                continue
+
+            choices = freeBits[free]
+            bit = choices[int(rand() * len(choices))] if len(choices) > 1 else choices[0]
+            neighbor = cell + offsets[bit]
+            connections[cell] |= bit
+            connections[neighbor] = oppositeBits[bit]
+            roomTypes[neighbor] = 1
+            depth[neighbor] = depth[cell] + 1
+            parent[neighbor] = cell
+            active.append(neighbor)
+            carved += 1
+
+        goal = depth.index(max(depth)) # <= The deepest cell is always a dead end of the tree
+
+        # === Main path from the goal back to the entrance, marked with a 2 so only the branch rooms keep their 1 ===
+        pathCells = []
+        cell = parent[goal]
+        while cell != entrance:
+            pathCells.append(cell)
+            roomTypes[cell] = 2
+            cell = parent[cell]
+        roomTypes[entrance] = roomTypes[goal] = 2
+        rooms = list(compress(range(cellCount), roomTypes)) # <= compress and translate keep these passes out of the Python loop
+        branchCells = list(compress(range(cellCount), roomTypes.translate(branchMarker)))
+
+        self._assignRoomTypes(pathCells, branchCells, connections, roomTypes, entrance, goal)
+        self._addLoops(rooms, connections, roomTypes, width, entrance, goal)
+        return DungeonLayout(width, height, connections, roomTypes, depth, entrance, goal, len(rooms))
+
+    # === Weighted room types, side branches only get the types that can be a branch ===
+    def _assignRoomTypes(self, pathCells: List[int], branchCells: List[int], connections: bytearray, roomTypes: bytearray, entrance: int, goal: int):
+        roomData = self.config.roomData
+        pathTypes = [roomType for roomType, data in roomData.items() if data.generationWeight > 0]
+        branchTypes = [roomType for roomType in pathTypes if roomData[roomType].canBeBranch]
+
+        for cells, types in ((pathCells, pathTypes), (branchCells, branchTypes or pathTypes)):
+            if not cells:
+                continue
+            codes = [roomTypeCode(roomType) for roomType in types]
+            picked = self.rng.choices(codes, weights = [roomData[roomType].generationWeight for roomType in types], k = len(cells))
+            for cell, code in zip(cells, picked):
+                roomTypes[cell] = code
+
+        roomTypes[entrance] = roomTypeCode(RoomType.ENTRANCE)
+        roomTypes[goal] = roomTypeCode(self.config.goalRoom)
+
+        # Dead ends of the side branches are worth the detour, as long as the room there can be replaced
+        deadEndCode = roomTypeCode(self.config.deadEndRoom)
+        chance = self.config.deadEndChance
+        for cell in branchCells:
+            if len(freeBits[connections[cell]]) == 1 and self.rng.random() < chance: # <= One exit means a dead end
+                if roomData[roomTypeOrder[roomTypes[cell] - 1]].canBeReplaced:
+                    roomTypes[cell] = deadEndCode
+
+    # === Opens a few extra doors between neighboring rooms, so not every route is a dead end ===
+    def _addLoops(self, rooms: List[int], connections: bytearray, roomTypes: bytearray, width: int, entrance: int, goal: int):
+        loops = round(len(rooms) * self.config.loopChance)
+        cellCount = len(connections)
+        for _ in range(loops):
+            cell = rooms[self.rng.randint(0, len(rooms) - 1)] # <= Only the rooms that get a door are rolled
+            if cell == entrance or cell == goal:
+                continue
+            x = cell % width
+            if x < width - 1 and roomTypes[cell + 1] and not connections[cell] & 2 and cell + 1 != goal:
+                connections[cell] |= 2
+                connections[cell + 1] |= 8
+            elif cell + width < cellCount and roomTypes[cell + width] and not connections[cell] & 4 and cell + width != goal:
+                connections[cell] |= 4
+                connections[cell + width] |= 1
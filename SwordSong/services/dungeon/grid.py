@@ -0,0 +1,114 @@
+from typing import Dict, Iterator, Mapping, Optional
+from .config import RoomData
+from .generator import DungeonLayout, directionBits, roomTypeOrder
+from .models import Position, Room, RoomType
+
+rockEmoji = "🟫"
+
+# === Flat row-major dungeon, a byte per cell for the room type and the connections and a bit per cell for visited/cleared ===
+class DungeonGrid:
+    __slots__ = ("width", "height", "roomTypes", "connections", "visited", "cleared", "roomData", "roomCount", "offsets", "emojis", "dirtyRows")
+
+    def __init__(self, width: int, height: int, roomTypes: bytearray, connections: bytearray, roomData: Dict[RoomType, RoomData]):
+        cellCount = width * height
+        self.width = width
+        self.height = height
+        self.roomTypes = roomTypes # <= Code of roomTypeOrder + 1 per cell, 0 is solid rock
+        self.connections = connections # <= directionBits per cell
+        self.visited = bytearray((cellCount + 7) // 8)
+        self.cleared = bytearray((cellCount + 7) // 8)
+        self.roomData = roomData
+        self.roomCount = cellCount - roomTypes.count(0)
+        self.offsets = {"north": -width, "south": width, "east": 1, "west": -1}
+        self.dirtyRows = set() # <= Rows whose visited or cleared bits changed since the map was last drawn
+
+        # (unvisited, visited, cleared) emoji per room type code, so drawing a cell is two lookups
+        self.emojis = [(rockEmoji, rockEmoji, rockEmoji)] + [
+            (roomData[roomType].emojiUnvisited, roomData[roomType].emojiVisited, roomData[roomType].emojiCleared)
+            for roomType in roomTypeOrder
+        ]
+
+    @classmethod
+    def fromLayout(cls, layout: DungeonLayout, roomData: Dict[RoomType, RoomData]) -> "DungeonGrid":
+        return cls(layout.width, layout.height, layout.roomTypes, layout.connections, roomData)
+
+    # === Cells ===
+    def cellAt(self, x: int, y: int) -> Optional[int]:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return None
+
+    def position(self, cell: int) -> Position:
+        return Position(cell % self.width, cell // self.width)
+
+    def isRoom(self, cell: int) -> bool:
+        return self.roomTypes[cell] != 0
+
+    def roomType(self, cell: int) -> Optional[RoomType]:
+        code = self.roomTypes[cell]
+        return roomTypeOrder[code - 1] if code else None
+
+    def room(self, cell: int) -> Optional[Room]:
+        return Room(self, cell) if self.roomTypes[cell] else None
+
+    # === Connections ===
+    def hasConnection(self, cell: int, direction: str) -> bool:
+        return bool(self.connections[cell] & directionBits.get(direction, 0))
+
+    def setConnection(self, cell: int, direction: str, canTravel: bool):
+        bit = directionBits[direction]
+        if canTravel:
+            self.connections[cell] |= bit
+        else:
+            self.connections[cell] &= ~bit & 0xF
+
+    # === The cell behind a door, None when there is no door that way ===
+    def neighbor(self, cell: int, direction: str) -> Optional[int]:
+        if not self.hasConnection(cell, direction):
+            return None
+        target = cell + self.offsets[direction]
+        return target if self.roomTypes[target] else None # <= The generator only opens doors between rooms, so this stays in the grid
+
+    # === Visited and cleared bits ===
+    def isVisited(self, cell: int) -> bool:
+        return bool(self.visited[cell >> 3] & (1 << (cell & 7)))
+
+    def visit(self, cell: int):
+        self.visited[cell >> 3] |= 1 << (cell & 7)
+        self.dirtyRows.add(cell // self.width)
+
+    def isCleared(self, cell: int) -> bool:
+        return bool(self.cleared[cell >> 3] & (1 << (cell & 7)))
+
+    def clear(self, cell: int):
+        self.cleared[cell >> 3] |= 1 << (cell & 7)
+        self.dirtyRows.add(cell // self.width)
+
+    def emoji(self, cell: int) -> str:
+        unvisited, visited, cleared = self.emojis[self.roomTypes[cell]]
+        if not self.isVisited(cell):
+            return unvisited
+        return cleared if self.isCleared(cell) else visited
+
+    # === Bytes held by the arrays of the grid ===
+    def nbytes(self) -> int:
+        return len(self.roomTypes) + len(self.connections) + len(self.visited) + len(self.cleared)
+
+# === Read only Position -> Room mapping over the grid, for the code that still looks rooms up by position ===
+class RoomMap(Mapping):
+    __slots__ = ("grid",)
+
+    def __init__(self, grid: DungeonGrid):
+        self.grid = grid
+
+    def __getitem__(self, position: Position) -> Room:
+        cell = self.grid.cellAt(position.x, position.y)
+        if cell is None or not self.grid.roomTypes[cell]:
+            raise KeyError(position)
+        return Room(self.grid, cell)
+
+    def __iter__(self) -> Iterator[Position]:
+        return (self.grid.position(cell) for cell, code in enumerate(self.grid.roomTypes) if code)
+
+    def __len__(self) -> int:
+        return self.grid.roomCount
@@ -0,0 +1,58 @@
+from typing import List, Optional, Tuple
+from .grid import DungeonGrid, rockEmoji
+
+playerEmoji = "👤"
+
+# === Draws the fog-of-war map from cached rows, only the rows a visit or clear touched are drawn again ===
+class MapRenderer:
+    def __init__(self, grid: DungeonGrid, viewWidth: int = 9, viewHeight: int = 7):
+        self.grid = grid
+        self.viewWidth = min(viewWidth, grid.width) # <= The map is cropped around the player, so big dungeons stay inside the embed limits
+        self.viewHeight = min(viewHeight, grid.height)
+        self.cells: List[Optional[List[str]]] = [None] * grid.height # <= Emoji per cell of every row, None when it has to be drawn again
+        self.lines: List[Optional[Tuple[int, str]]] = [None] * grid.height # <= (first column, joined row) of the last viewport
+        self.rowsDrawn = 0
+
+    # === Throws every cached row away, after the bitmaps were replaced wholesale ===
+    def invalidate(self):
+        self.cells = [None] * self.grid.height
+        self.lines = [None] * self.grid.height
+        self.grid.dirtyRows.clear()
+
+    def _drawRow(self, y: int) -> List[str]:
+        grid = self.grid
+        rowStart = y * grid.width
+        self.rowsDrawn += 1
+        return [grid.emoji(cell) if grid.isVisited(cell) else rockEmoji for cell in range(rowStart, rowStart + grid.width)]
+
+    # === First column and row of the viewport, centered on the player and clamped to the grid ===
+    def viewport(self, playerCell: int) -> Tuple[int, int]:
+        width = self.grid.width
+        x, y = playerCell % width, playerCell // width
+        left = min(max(x - self.viewWidth // 2, 0), width - self.viewWidth)
+        top = min(max(y - self.viewHeight // 2, 0), self.grid.height - self.viewHeight)
+        return left, top
+
+    def render(self, playerCell: int) -> str:
+        grid = self.grid
+        for y in grid.dirtyRows:
+            self.cells[y] = None
+            self.lines[y] = None
+        grid.dirtyRows.clear()
+
+        left, top = self.viewport(playerCell)
+        right = left + self.viewWidth
+        playerX, playerY = playerCell % grid.width, playerCell // grid.width
+        out = []
+        for y in range(top, top + self.viewHeight):
+            cells = self.cells[y]
+            if cells is None:
+                cells = self.cells[y] = self._drawRow(y)
+            if y == playerY:
+                out.append("".join(cells[left:playerX]) + playerEmoji + "".join(cells[playerX + 1:right])) # <= The player moves every turn, so its row isn't cached
+                continue
+            line = self.lines[y]
+            if line is None or line[0] != left:
+                line = self.lines[y] = (left, "".join(cells[left:right]))
+            out.append(line[1])
+        return "\n".join(out)
@@ -1,80 +1,88 @@
-import random
-from typing import Dict, Optional
-from dataclasses import dataclass
+from typing import Optional, Tuple
+from dataclasses import dataclass, field
 from .config import DungeonConfig
+from .generator import DungeonGenerator, configHash
+from .grid import DungeonGrid, RoomMap
+from .mapRenderer import MapRenderer
 from .randomProvider import StandardRandomProvider, RandomProvider
-from .models import Position, Room, RoomType
+from .models import Position, Room
 
 @dataclass
 class MiniDungeon:
-    size: int = 4
+    size: Optional[int] = None # <= Shortcut for a square dungeon, the config decides the size otherwise
     config: DungeonConfig = None
     rng: RandomProvider = None
-    rooms: Dict[Position, Room] = None
-    playerPos: Position = None
+    seed: Optional[int] = None # <= Only used when no rng is given
+    rollSeed: Optional[int] = field(default = None, init = False) # <= Seed of the rolls inside the dungeon since the last checkpoint
+    grid: DungeonGrid = field(default = None, init = False)
+    renderer: MapRenderer = field(default = None, init = False, repr = False)
+    playerCell: int = field(default = 0, init = False)
 
     def __post_init__(self):
         if self.config is None:
-            self.config = DungeonConfig(width = self.size, height = self.size)
+            self.config = DungeonConfig() if self.size is None else DungeonConfig(width = self.size, height = self.size)
         if self.rng is None:
-            self.rng = StandardRandomProvider()
+            self.rng = StandardRandomProvider(self.seed)
         self.generateGrid()
+
+    @property
+    def width(self) -> int:
+        return self.config.width
+
+    @property
+    def height(self) -> int:
+        return self.config.height
     
     def generateGrid(self):
-        self.rooms = {}
-        y0 = self.rng.randint(1, self.size - 2)
-        y1 = self.rng.randint(1, self.size - 2)
-        entrance = Position(0, y0)
-        treasure = Position(self.size - 1, y1)
-        roomData = self.config.roomData
-        self.rooms[entrance] = Room(RoomType.ENTRANCE, entrance, roomData[RoomType.ENTRANCE])
-        self.rooms[treasure] = Room(RoomType.TREASURE, treasure, roomData[RoomType.TREASURE])
-        self.playerPos = entrance
-        self.rooms[entrance].visit()
+        layout = DungeonGenerator(self.config, self.rng).generate()
+        self.grid = DungeonGrid.fromLayout(layout, self.config.roomData) # <= Only the flat arrays are kept, the rest of the layout is dropped
+        self.playerCell = layout.entrance
+        self.grid.visit(self.playerCell)
+        self.renderer = MapRenderer(self.grid)
+
+    # === Reseeds the rolls and returns the few values the run needs to come back, the layout itself is regenerated from the seed ===
+    def checkpoint(self) -> Tuple[int, int, int, int, bytes, bytes]:
+        self.rollSeed = self.rng.randint(0, 2 ** 32 - 1) # <= From its own stream, so a resumed run rolls what this one would have
+        self.rng = StandardRandomProvider(self.rollSeed)
+        return (self.seed, self.rollSeed, configHash(self.config), self.playerCell, bytes(self.grid.visited), bytes(self.grid.cleared))
 
-        for x in range(1, self.size - 1):
-            for y in range(1, self.size - 1):
-                pos = Position(x, y)
-                roomType = self.rng.choices(
-                    [RoomType.COMBAT, RoomType.TRAP, RoomType.PUZZLE, RoomType.EMPTY],
-                    weights = [40, 15, 10, 35]
-                )[0]
-                configRoomData = self.config.roomData[roomType]
-                self.rooms[pos] = Room(roomType, pos, configRoomData)
-        
-        for pos, room in list(self.rooms.items()):
-            for direction, neighbor in pos.neighbors().items():
-                if neighbor in self.rooms:
-                    room.setConnection(direction, True)
+    # === Regenerates a checkpointed run, None when the config doesn't generate the same layout anymore ===
+    @classmethod
+    def restore(cls, config: DungeonConfig, seed: int, rollSeed: int, savedHash: int, playerCell: int, visited: bytes, cleared: bytes) -> Optional["MiniDungeon"]:
+        if savedHash != configHash(config):
+            return None
+        dungeon = cls(config = config, seed = seed)
+        grid = dungeon.grid
+        if len(visited) != len(grid.visited) or len(cleared) != len(grid.cleared) or not 0 <= playerCell < len(grid.roomTypes) or not grid.isRoom(playerCell):
+            return None
+        grid.visited[:] = visited
+        grid.cleared[:] = cleared
+        dungeon.renderer.invalidate()
+        dungeon.playerCell = playerCell
+        dungeon.rollSeed = rollSeed
+        dungeon.rng = StandardRandomProvider(rollSeed)
+        return dungeon
+
+    @property
+    def rooms(self) -> RoomMap:
+        return RoomMap(self.grid)
+
+    @property
+    def playerPos(self) -> Position:
+        return self.grid.position(self.playerCell)
     
     def movePlayer(self, direction: str) -> bool:
-        current = self.playerPos
-        room = self.rooms.get(current)
-        if not room or not room.connections.get(direction, False):
+        target = self.grid.neighbor(self.playerCell, direction)
+        if target is None:
             return False
-        
-        target = current.neighbors()[direction]
-        if target in self.rooms:
-            self.playerPos = target
-            self.rooms[target].visit()
-            return True
-        return False
+        self.playerCell = target
+        self.grid.visit(target)
+        return True
     
     @property
     def currentRoom(self) -> Room:
-        return self.rooms.get(self.playerPos)
+        return self.grid.room(self.playerCell)
     
+    # === The map around the player, only the rows changed since the last call are drawn again ===
     def getASCII(self) -> str:
-        out = []
-        for y in range(self.size):
-            line = ""
-            for x in range(self.size):
-                pos = Position(x, y)
-                if pos == self.playerPos:
-                    line += "👤"
-                elif pos in self.rooms and self.rooms[pos].visited:
-                    line += self.rooms[pos].getEmoji()
-                else:
-                    line += "🟫"
-            out.append(line)
-        return "\n".join(out)
\ No newline at end of file
+        return self.renderer.render(self.playerCell)
@@ -4,6 +4,7 @@ from typing import Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .config import RoomData
+    from .grid import DungeonGrid
 
 class RoomType(Enum):
     ENTRANCE = "entrance"
@@ -29,29 +30,47 @@ class Position:
             "west": Position(self.x - 1, self.y)
         }
 
+# === Room-like view over one cell of a DungeonGrid, the grid holds the actual data ===
 class Room:
-    def __init__(self, roomType: RoomType, position: Position, config: RoomData):
-        self.roomType = roomType
-        self.position = position
-        self.config = config
-        self.visited = False
-        self.cleared = False
-        self.connections: Dict[str, bool] = {d: False for d in ("north", "south", "east", "west")}
+    __slots__ = ("grid", "cell")
+
+    def __init__(self, grid: "DungeonGrid", cell: int):
+        self.grid = grid
+        self.cell = cell
+
+    @property
+    def roomType(self) -> RoomType:
+        return self.grid.roomType(self.cell)
+
+    @property
+    def position(self) -> Position:
+        return self.grid.position(self.cell)
+
+    @property
+    def config(self) -> "RoomData":
+        return self.grid.roomData[self.roomType]
+
+    @property
+    def visited(self) -> bool:
+        return self.grid.isVisited(self.cell)
+
+    @property
+    def cleared(self) -> bool:
+        return self.grid.isCleared(self.cell)
+
+    # === Built on demand from the connection bits, only for the code that still wants a dict ===
+    @property
+    def connections(self) -> Dict[str, bool]:
+        return {direction: self.grid.hasConnection(self.cell, direction) for direction in ("north", "south", "east", "west")}
 
     def visit(self) -> None:
-        self.visited = True
+        self.grid.visit(self.cell)
     
     def clear(self) -> None:
-        self.cleared = True
+        self.grid.clear(self.cell)
     
     def setConnection(self, direction: str, canTravel: bool) -> None:
-        if direction in self.connections:
-            self.connections[direction] = canTravel
+        self.grid.setConnection(self.cell, direction, canTravel)
 
     def getEmoji(self) -> str:
-        if not self.visited:
-            return self.config.emojiUnvisited
-        elif self.cleared:
-            return self.config.emojiCleared
-        else:
-            return self.config.emojiVisited    
+        return self.grid.emoji(self.cell)
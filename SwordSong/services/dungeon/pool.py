@@ -0,0 +1,158 @@
+import asyncio
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Dict, Optional, Tuple
+from .config import DungeonConfig
+from .generator import configHash
+from .miniTest import MiniDungeon
+from .randomProvider import RandomProvider, StandardRandomProvider
+
+# === Runs in the worker process, the dungeon comes back pickled exactly as MiniDungeon(config, seed) would build it ===
+def buildDungeon(config: DungeonConfig, seed: int) -> MiniDungeon:
+    return MiniDungeon(config = config, seed = seed)
+
+# === Keeps a few dungeons per config generated ahead of time, so starting one is a pop instead of a generation ===
+class DungeonPool:
+    def __init__(self, seedSource: RandomProvider, size: int = 4, workers: int = 1, executor: Optional[Executor] = None):
+        self.seeds = StandardRandomProvider(seedSource.randint(0, 2 ** 32 - 1)) # <= Own stream, drawn once from the root so the take(), refiller and worker threads never touch the root rng
+        self.size = size # <= Dungeons kept ready per config
+        self.executor = executor or ProcessPoolExecutor(max_workers = workers)
+        self.ready: Dict[int, Deque[MiniDungeon]] = {} # <= configHash -> dungeons ready to be taken
+        self.configs: Dict[int, DungeonConfig] = {}
+        self.pending: Dict[int, int] = {} # <= configHash -> refills still running in a worker
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.refillTimes: Deque[float] = deque(maxlen = 256) # <= Seconds from submit until the dungeon was ready
+        self._keys: Dict[int, Tuple[DungeonConfig, int]] = {} # <= id(config) -> (config, configHash), the config is held so its id can't be reused
+        self._lock = threading.Lock()
+        self._seedLock = threading.Lock() # <= random.Random is not safe to share between threads, every seed is drawn under it
+        self._closed = False
+        self._refills = queue.SimpleQueue() # <= Keys that need a top up, take() only leaves a note here
+        self._refiller = None
+
+    # === Starts keeping dungeons of this config ready, the first refill is submitted right away so the workers fork now ===
+    def warm(self, config: DungeonConfig):
+        self._refill(self._register(config))
+        self._startRefiller()
+
+    # === Started after the first submit, so the workers are forked before the pool has a thread of its own ===
+    def _startRefiller(self):
+        if self._refiller is None:
+            self._refiller = threading.Thread(target = self._refillLoop, name = "swordsong-dungeon-pool", daemon = True)
+            self._refiller.start()
+
+    def _register(self, config: DungeonConfig) -> int:
+        cached = self._keys.get(id(config))
+        if cached is not None:
+            return cached[1]
+
+        key = configHash(config)
+        with self._lock:
+            self._keys[id(config)] = (config, key)
+            if key not in self.configs:
+                self.configs[key] = config
+                self.ready[key] = deque()
+                self.pending[key] = 0
+        return key
+
+    # === A ready dungeon of the config, a pop plus a note for the refiller. When the pool ran dry it's built in a worker ===
+    async def take(self, config: DungeonConfig) -> MiniDungeon:
+        key = self._register(config)
+        with self._lock:
+            dungeon = self.ready[key].popleft() if self.ready[key] else None
+            if dungeon is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        self._startRefiller()
+        self._refills.put(key)
+
+        if dungeon is None:
+            dungeon = await self._build(config)
+        return dungeon
+
+    def _nextSeed(self) -> int:
+        with self._seedLock:
+            return self.seeds.randint(0, 2 ** 32 - 1)
+
+    # === Builds one dungeon off the event loop, on a thread when the process pool is gone ===
+    async def _build(self, config: DungeonConfig) -> MiniDungeon:
+        loop = asyncio.get_running_loop()
+        seed = self._nextSeed()
+        try:
+            return await loop.run_in_executor(self.executor, buildDungeon, config, seed)
+        except RuntimeError as e:
+            print(f"The dungeon pool could not build a dungeon: {e}")
+            return await loop.run_in_executor(None, buildDungeon, config, seed)
+
+    def _refillLoop(self):
+        while True:
+            key = self._refills.get()
+            if key is None:
+                return
+            self._refill(key)
+
+    # === Tops the pool of the config up, every missing dungeon is its own job so the workers share them ===
+    def _refill(self, key: int):
+        with self._lock:
+            if self._closed:
+                return
+            config = self.configs[key]
+            missing = self.size - len(self.ready[key]) - self.pending[key]
+            self.pending[key] += max(missing, 0)
+
+        for _ in range(missing):
+            seed = self._nextSeed()
+            try:
+                future = self.executor.submit(buildDungeon, config, seed)
+            except RuntimeError as e: # <= The pool was shut down or a worker died, take() falls back to building on the spot
+                print(f"Could not refill the dungeon pool: {e}")
+                with self._lock:
+                    self.pending[key] -= 1
+                    self.failures += 1
+                continue
+            submitted = time.perf_counter()
+            future.add_done_callback(lambda done, submitted = submitted: self._onReady(key, submitted, done))
+
+    # === Runs on the thread of the executor once a worker is done ===
+    def _onReady(self, key: int, submitted: float, future: Future):
+        with self._lock:
+            self.pending[key] -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is not None:
+                self.failures += 1
+            else:
+                self.ready[key].append(future.result())
+                self.refillTimes.append(time.perf_counter() - submitted)
+        if error is not None:
+            print(f"A dungeon pool worker failed: {error}")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            takes = self.hits + self.misses
+            refills = list(self.refillTimes)
+            return {
+                "ready": sum(len(dungeons) for dungeons in self.ready.values()),
+                "pending": sum(self.pending.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "failures": self.failures,
+                "hitRate": self.hits / takes if takes else 0.0,
+                "refillAvgMs": sum(refills) / len(refills) * 1000 if refills else 0.0,
+                "refillMaxMs": max(refills) * 1000 if refills else 0.0
+            }
+
+    # === Stops the refiller first so nothing is submitted anymore, then waits for the jobs the workers already started ===
+    def close(self):
+        with self._lock:
+            self._closed = True
+        if self._refiller is not None:
+            self._refills.put(None)
+            self._refiller.join()
+        self.executor.shutdown(wait = True, cancel_futures = True)
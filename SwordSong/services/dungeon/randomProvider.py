@@ -6,6 +6,8 @@ class RandomProvider(Protocol):
         ...   
     def randint(self, a: int, b: int) -> int: # <- Random integer between a and b
         ...  
+    def uniform(self, a: float, b: float) -> float: # <- Random float between a and b
+        ...
     def choice(self, sequence: List[Any]) -> Any: # <- Choose a random element from sequence
         ... 
     def choices(self, population: List[Any], weights: List[float], k: int = 1) -> List[Any]: # <- Choses a sequences in place
@@ -23,6 +25,9 @@ class StandardRandomProvider:
     def randint(self, a: int, b: int) -> int:
         return self._random.randint(a, b)
     
+    def uniform(self, a: float, b: float) -> float:
+        return self._random.uniform(a, b)
+    
     def choice(self, sequence: List[Any]) -> Any:
         return self._random.choice(sequence)
     
@@ -0,0 +1,83 @@
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+levelsPath = Path(__file__).parent.parent / "data" / "levels.json"
+
+# === Level progression from levels.json, precomputed once so any XP reward is one bisect ===
+class LevelCurve:
+    def __init__(self, levelsData: Dict):
+        self.maxLevel = int(levelsData.get("maxLevel", 100))
+        if self.maxLevel < 1:
+            raise ValueError("maxLevel has to be at least 1")
+
+        base = levelsData["xpToLevel"]["base"]
+        perLevel = levelsData["xpToLevel"]["perLevel"]
+        defaultGains = levelsData["statGains"]
+        overrides = levelsData.get("levelOverrides", {}) # <= "level" -> {"xpToLevel": ..., "statGains": {...}} for hand tuned levels
+
+        # Index 0 is unused so the tables can be read by level
+        self.xpToLevelTable: List[int] = [0] * (self.maxLevel + 1) # <= XP needed to go from this level to the next one
+        self.totalXP: List[int] = [0] * (self.maxLevel + 1) # <= XP earned since level 1 at the start of this level
+        self.gainTotals: List[Dict[str, int]] = [dict.fromkeys(defaultGains, 0) for _ in range(self.maxLevel + 1)] # <= Stats gained since level 1
+
+        xpToLevel = base
+        for level in range(1, self.maxLevel + 1):
+            if level > 1:
+                xpToLevel += level * perLevel # <= Same scaling the old incremental level up used
+                gains = overrides.get(str(level), {}).get("statGains", defaultGains)
+                self.gainTotals[level] = {stat: self.gainTotals[level - 1][stat] + gains.get(stat, 0) for stat in defaultGains}
+                self.totalXP[level] = self.totalXP[level - 1] + self.xpToLevelTable[level - 1]
+            self.xpToLevelTable[level] = overrides.get(str(level), {}).get("xpToLevel", xpToLevel)
+            if self.xpToLevelTable[level] <= 0:
+                raise ValueError(f"Level {level} needs a positive xpToLevel")
+
+    @classmethod
+    def load(cls, path: Path = levelsPath) -> "LevelCurve":
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+    def xpToLevel(self, level: int) -> int:
+        return self.xpToLevelTable[min(max(level, 1), self.maxLevel)]
+
+    # === The level a character is at after earning this much XP since level 1 ===
+    def levelFor(self, totalXP: int) -> int:
+        return max(1, min(bisect_right(self.totalXP, totalXP, 1) - 1, self.maxLevel))
+
+    # === Stats that a level gives on top of the level 1 stats ===
+    def statGains(self, fromLevel: int, toLevel: int) -> Dict[str, int]:
+        start, end = self.gainTotals[fromLevel], self.gainTotals[toLevel]
+        return {stat: end[stat] - start[stat] for stat in end}
+
+    # === Adds the XP to the character and returns the column updates plus the level up info, or None without a level up ===
+    def applyXP(self, character: Dict, xpGained: int) -> Tuple[Dict, Optional[Dict]]:
+        level = min(character["level"], self.maxLevel)
+        totalXP = self.totalXP[level] + character["xp"] + xpGained
+        newLevel = self.levelFor(totalXP)
+        if newLevel <= level:
+            return {"xp": character["xp"] + xpGained}, None
+
+        gains = self.statGains(level, newLevel)
+        maxHealth = character["maxHealth"] + gains.get("maxHealth", 0)
+        maxMana = character.get("maxMana", 50) + gains.get("maxMana", 0)
+        updates = {
+            "level": newLevel,
+            "xp": totalXP - self.totalXP[newLevel],
+            "xpToLevel": self.xpToLevel(newLevel),
+            "maxHealth": maxHealth,
+            "health": maxHealth, # <= refreshes the health back to full
+            "attack": character["attack"] + gains.get("attack", 0),
+            "defense": character["defense"] + gains.get("defense", 0),
+            "maxMana": maxMana,
+            "mana": maxMana # <= Refreses the mana back to full
+        }
+        levelUP = {
+            "newLevel": newLevel,
+            "levelsGained": newLevel - level,
+            "healthIncrease": gains.get("maxHealth", 0),
+            "attackIncrease": gains.get("attack", 0),
+            "defenseIncrease": gains.get("defense", 0),
+            "manaIncrease": gains.get("maxMana", 0)
+        }
+        return updates, levelUP
@@ -0,0 +1,186 @@
+import sqlite3
+
+# === Every migration brings the schema up by one version, never edit one that already shipped. Add a new one instead ===
+def _v1CreateTables(cursor: sqlite3.Cursor):
+    # === Creates a character table ===
+    cursor.execute(''' 
+        CREATE TABLE IF NOT EXISTS characters (
+            userID TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            level INTEGER DEFAULT 1,
+            xp INTEGER DEFAULT 0,
+            xpToLevel INTEGER DEFAULT 100,
+            health INTEGER DEFAULT 100,
+            maxHealth INTEGER DEFAULT 100,
+            attack INTEGER DEFAULT 10,
+            defense INTEGER DEFAULT 5,
+            coins INTEGER DEFAULT 0,
+            currentArea TEXT DEFAULT 'forest'
+        )''')
+    
+    # === Creates the inventory table ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS inventory (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            userID TEXT,
+            itemName TEXT,
+            quantity INTEGER DEFAULT 1,
+            FOREIGN KEY (userID) REFERENCES characters(userID)
+        )''')
+    
+    # === Created the equipment table ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS equipment (
+            userID TEXT,
+            slot TEXT,
+            itemName TEXT,
+            FOREIGN KEY (userID) REFERENCES characters(userID),
+            PRIMARY KEY (userID, slot)
+        )''')
+    
+    # === Creates the monster table ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monsters (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            area TEXT,
+            health INTEGER,
+            attack INTEGER,
+            defense INTEGER,
+            xpReward INTEGER,
+            type TEXT,
+            effect TEXT,
+            description TEXT
+        )''')
+    
+    # === Creates the shop items table ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS shopItems (
+            itemName TEXT PRIMARY KEY,
+            buyPrice INTEGER,
+            sellPrice INTEGER,
+            type TEXT,
+            effect TEXT,
+            description TEXT
+        )''')
+    
+    # === Creates a table to track the amount of fights the character did ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fightStats (
+            userID TEXT PRIMARY KEY,
+            totalFights INTEGER DEFAULT 0,
+            fightsSinceBoss INTEGER DEFAULT 0,
+            lastFightTimestamp INTEGER DEFAULT 0,
+            FOREIGN KEY (userID) REFERENCES characters(userID)
+        )''')
+    
+    # === A table to track the cooldowns of the skills of the character ===
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skillCooldowns (
+            userID TEXT,
+            skillName TEXT,
+            turnsRemaining INTEGER DEFAULT 0,
+            PRIMARY KEY (userID, skillName),
+            FOREIGN KEY (userID) REFERENCES characters(userID)
+        )''')
+
+    # === Add a mana colums to already existing characters before i added mana ===
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(characters)")]
+    if "mana" not in columns:
+        cursor.execute("ALTER TABLE characters ADD COLUMN mana INTEGER DEFAULT 50")
+    if "maxMana" not in columns:
+        cursor.execute("ALTER TABLE characters ADD COLUMN maxMana INTEGER DEFAULT 50")
+
+def _v2UniqueItemStacks(cursor: sqlite3.Cursor):
+    # Merges item stacks that were split over multiple rows by older versions into the oldest row
+    cursor.execute('''
+        UPDATE inventory SET quantity = (
+            SELECT SUM(dupe.quantity) FROM inventory AS dupe
+            WHERE dupe.userID = inventory.userID AND dupe.itemName = inventory.itemName
+        )
+        WHERE id IN (SELECT MIN(id) FROM inventory GROUP BY userID, itemName HAVING COUNT(*) > 1)''')
+    cursor.execute("DELETE FROM inventory WHERE id NOT IN (SELECT MIN(id) FROM inventory GROUP BY userID, itemName)")
+
+    # One stack per item, so the inventory writes can be a single upsert
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_user_item ON inventory (userID, itemName)")
+
+def _v3LookupIndexes(cursor: sqlite3.Cursor):
+    # Covers getInventory so it never has to touch the table itself
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_inventory_user_item_quantity ON inventory (userID, itemName, quantity)")
+
+    # Expression index for the case insensitive item lookup in removeItem
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_inventory_user_lower_item ON inventory (userID, LOWER(itemName))")
+
+    # Covers getEquipment
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_equipment_user_slot_item ON equipment (userID, slot, itemName)")
+
+    # Covers getALlSkillCooldown
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_skill_cooldowns_user_turns ON skillCooldowns (userID, turnsRemaining, skillName)")
+
+def _v4ActiveCombats(cursor: sqlite3.Cursor):
+    # One compact checkpoint per fight in progress, so a restart doesn't drop them
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS activeCombats (
+            userID TEXT PRIMARY KEY,
+            state BLOB NOT NULL,
+            updatedAt INTEGER NOT NULL,
+            FOREIGN KEY (userID) REFERENCES characters (userID)
+        )''')
+
+def _v5CombatLogs(cursor: sqlite3.Cursor):
+    # Archive of finished fights, the events column is the packed log from services/combatLog.py
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS combatLogs (
+            id INTEGER PRIMARY KEY,
+            userID TEXT NOT NULL,
+            monster TEXT NOT NULL,
+            outcome INTEGER NOT NULL,
+            turns INTEGER NOT NULL,
+            endedAt INTEGER NOT NULL,
+            events BLOB NOT NULL
+        )''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_combatLogs_user ON combatLogs (userID, id)")
+
+def _v6DungeonRuns(cursor: sqlite3.Cursor):
+    # A dungeon in progress, the layout is regenerated from the seed so only the progress through it is stored
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS dungeonRuns (
+            userID TEXT PRIMARY KEY,
+            seed INTEGER NOT NULL,
+            rollSeed INTEGER NOT NULL,
+            configHash INTEGER NOT NULL,
+            playerCell INTEGER NOT NULL,
+            visited BLOB NOT NULL,
+            cleared BLOB NOT NULL,
+            updatedAt INTEGER NOT NULL,
+            FOREIGN KEY (userID) REFERENCES characters (userID)
+        )''')
+
+migrations = [
+    _v1CreateTables,
+    _v2UniqueItemStacks,
+    _v3LookupIndexes,
+    _v4ActiveCombats,
+    _v5CombatLogs,
+    _v6DungeonRuns
+]
+schemaVersion = len(migrations)
+
+# === Brings the database up to the latest schema version ===
+def runMigrations(conn: sqlite3.Connection) -> int:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= schemaVersion:
+        return version # <= Warm start, the schema is already up to date so no DDL has to run
+
+    for nextVersion in range(version + 1, schemaVersion + 1):
+        try:
+            conn.execute("BEGIN")
+            migrations[nextVersion - 1](conn.cursor())
+            conn.execute(f"PRAGMA user_version = {nextVersion}")
+            conn.commit()
+            print(f"Migrated the database to schema version {nextVersion}")
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+
+    return schemaVersion
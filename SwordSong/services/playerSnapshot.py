@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+@dataclass(frozen = True)
+class PlayerSnapshot:
+    character: Mapping # <= Read only view over the character row
+    equipment: Tuple[Tuple[str, Optional[str]], ...] # <= (slot, itemName) pairs, itemName is None for an empty slot
+    inventory: Tuple[Tuple[str, int], ...] # <= (itemName, quantity) pairs
+    fightStats: Optional[Mapping]
+    skillCooldowns: Tuple[Tuple[str, int], ...] # <= (skillName, turnsRemaining) pairs
+
+    # === Builds the snapshot from the rows of one read transaction ===
+    @classmethod
+    def fromRows(cls, character: dict, equipment: list, inventory: list, fightStats: Optional[dict], skillCooldowns: list) -> "PlayerSnapshot":
+        return cls(
+            character = MappingProxyType(dict(character)),
+            equipment = tuple(map(tuple, equipment)),
+            inventory = tuple(map(tuple, inventory)),
+            fightStats = MappingProxyType(dict(fightStats)) if fightStats else None,
+            skillCooldowns = tuple(map(tuple, skillCooldowns))
+        )
+
+    @property
+    def userID(self) -> str:
+        return self.character["userID"]
+
+    @property
+    def name(self) -> str:
+        return self.character["name"]
+
+    def quantityOf(self, itemName: str) -> int:
+        itemName = itemName.lower()
+        return next((quantity for name, quantity in self.inventory if name.lower() == itemName), 0)
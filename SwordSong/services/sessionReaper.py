@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Hashable, List
+from .timerWheel import TimerWheel
+
+# === Evicts combat and dungeon sessions that nobody touched for a while, even when their discord view is gone ===
+class SessionReaper:
+    def __init__(self, timeout: float = 300.0, tickSeconds: float = 1.0, slots: int = 512, clock = time.monotonic):
+        self.timeout = timeout # <= Idle seconds before a session is reaped, longer than the view timeouts so those still end it normally
+        self.tickSeconds = tickSeconds
+        self.clock = clock
+        self.wheel = TimerWheel(tickSeconds, slots, clock())
+        self.handlers: Dict[str, Callable[[List[Hashable]], Awaitable]] = {} # <= kind -> async handler that ends a batch of sessions
+        self.live: Dict[str, int] = {}
+        self.reaped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._task = None
+
+    def register(self, kind: str, handler: Callable[[List[Hashable]], Awaitable]):
+        self.handlers[kind] = handler
+        self.live.setdefault(kind, 0)
+        self.reaped.setdefault(kind, 0)
+
+    # === Starts or restarts the idle timer of a session ===
+    def track(self, kind: str, key: Hashable, timeout: float = None):
+        with self._lock:
+            if (kind, key) not in self.wheel:
+                self.live[kind] = self.live.get(kind, 0) + 1
+            self.wheel.schedule((kind, key), self.timeout if timeout is None else timeout, self.clock())
+
+    touch = track
+
+    # === The session ended on its own, so it doesn't have to be reaped ===
+    def release(self, kind: str, key: Hashable):
+        with self._lock:
+            if self.wheel.cancel((kind, key)):
+                self.live[kind] -= 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {kind: {"live": self.live.get(kind, 0), "reaped": self.reaped.get(kind, 0)} for kind in self.live.keys() | self.reaped.keys()}
+
+    # === Hands every expired session to the handler of its kind, one batch per kind ===
+    async def reapExpired(self) -> int:
+        with self._lock:
+            expired = self.wheel.advance(self.clock())
+            batches: Dict[str, List[Hashable]] = {}
+            for kind, key in expired:
+                batches.setdefault(kind, []).append(key)
+            for kind, keys in batches.items():
+                self.live[kind] -= len(keys)
+                self.reaped[kind] = self.reaped.get(kind, 0) + len(keys)
+
+        for kind, keys in batches.items():
+            handler = self.handlers.get(kind)
+            if handler is None:
+                print(f"There is no reaper handler for {kind}, {len(keys)} sessions were dropped")
+                continue
+            try:
+                await handler(keys)
+            except Exception as e:
+                print(f"Error reaping {len(keys)} {kind} sessions: {e}")
+        return len(expired)
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.tickSeconds)
+            await self.reapExpired()
+
+    # === Needs a running event loop ===
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name = "swordsong-session-reaper")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,187 @@
+# Headless combat simulator for balance testing, runs whole batches of fights at once with numpy
+# Run from the SwordSong folder: python -m services.simulator --area forest --levels 1-5 --fights 1000000
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .combadsys import combatSystem, baseDamage, damageRoll
+from .levelCurve import LevelCurve
+
+dataDir = Path(__file__).parent.parent / "data"
+
+# === Level 1 character, the same defaults as the characters table ===
+baseStats = {"maxHealth": 100, "attack": 10, "defense": 5, "maxMana": 50}
+levelCurve = LevelCurve.load() # <= The stat gains distributeRewards gives, from levels.json
+
+policies = ("attack", "skills")
+
+def statsAtLevel(level: int) -> Dict[str, int]:
+    gains = levelCurve.statGains(1, level)
+    return {stat: value + gains.get(stat, 0) for stat, value in baseStats.items()}
+
+# === Same rounding as calculateDamage: truncate and at least 1 ===
+def rollDamage(rng: np.random.Generator, attack, defense, multiplier = 1.0) -> np.ndarray:
+    size = np.shape(multiplier) or np.shape(attack) or np.shape(defense)
+    damage = baseDamage(attack, defense, multiplier) * rng.uniform(*damageRoll, size = size)
+    return np.maximum(1, np.trunc(damage)).astype(np.int64)
+
+# === Simulates a batch of fights of one character against one monster, mirrors processPlayerAttack and processMonsterTurn ===
+def simulateBatch(player: Dict[str, int], monster: Dict, skills: Dict[str, Dict], fights: int, policy: str, rng: np.random.Generator, maxTurns: int = 200) -> Dict[str, np.ndarray]:
+    skillNames = list(skills)
+    won = np.zeros(fights, dtype = bool)
+    turnsTaken = np.full(fights, maxTurns, dtype = np.int32)
+    finalHealth = np.zeros(fights, dtype = np.int64)
+
+    # The working arrays only hold the fights that are still going on
+    ids = np.arange(fights)
+    playerHP = np.full(fights, player["maxHealth"], dtype = np.int64)
+    monsterHP = np.full(fights, monster["health"], dtype = np.int64)
+    mana = np.full(fights, player["maxMana"], dtype = np.int64)
+    cooldowns = np.zeros((fights, len(skillNames)), dtype = np.int16)
+    stance = np.zeros(fights, dtype = np.int16)
+
+    for turn in range(1, maxTurns + 1):
+        if ids.size == 0:
+            break
+        count = ids.size
+
+        # === Player turn ===
+        action = np.full(count, -1, dtype = np.int8) # <= -1 is a normal attack, otherwise the index of the skill
+        if policy == "skills":
+            def canUse(skillName):
+                index = skillNames.index(skillName)
+                return (cooldowns[:, index] == 0) & (mana >= skills[skillName].get("manaCost", 0)) & (action == -1)
+
+            if "Healing Pulse" in skills:
+                heal = canUse("Healing Pulse") & (playerHP < player["maxHealth"] * 0.4)
+                action[heal] = skillNames.index("Healing Pulse")
+            for skillName in sorted((name for name, data in skills.items() if "damageMultiplier" in data and name != "Defensive Stance"), key = lambda name: -skills[name]["damageMultiplier"]):
+                action[canUse(skillName)] = skillNames.index(skillName) # <= Strongest attack skill that is ready
+
+        multiplier = np.ones(count)
+        attacking = np.ones(count, dtype = bool)
+        for index, skillName in enumerate(skillNames):
+            used = action == index
+            if not used.any():
+                continue
+            skillData = skills[skillName]
+            mana[used] -= skillData["manaCost"]
+            cooldowns[used, index] = skillData["cooldown"]
+
+            if skillName == "Healing Pulse":
+                playerHP[used] = np.minimum(player["maxHealth"], playerHP[used] + int(player["maxHealth"] * skillData["healPercent"]))
+                attacking[used] = False
+            elif skillName == "Defensive Stance":
+                stance[used] = skillData["duration"]
+                attacking[used] = False
+            else:
+                multiplier[used] = skillData.get("damageMultiplier", 1.0)
+
+        hits = rollDamage(rng, player["attack"], monster["defense"], multiplier)
+        monsterHP -= np.where(attacking, hits, 0)
+
+        killed = monsterHP <= 0
+        won[ids[killed]] = True
+        turnsTaken[ids[killed]] = turn
+        finalHealth[ids[killed]] = playerHP[killed]
+
+        # === Monster turn ===
+        hits = rollDamage(rng, monster["attack"], player["defense"], np.ones(count))
+        hits = np.where(stance > 0, np.trunc(hits * 0.5).astype(np.int64), hits)
+        stance = np.maximum(0, stance - 1)
+        playerHP -= np.where(killed, 0, hits)
+
+        dead = ~killed & (playerHP <= 0)
+        turnsTaken[ids[dead]] = turn
+        finalHealth[ids[dead]] = playerHP[dead]
+
+        # === The survivors tick their cooldowns and go on to the next round ===
+        keep = ~(killed | dead)
+        ids, playerHP, monsterHP, mana, stance = ids[keep], playerHP[keep], monsterHP[keep], mana[keep], stance[keep]
+        cooldowns = np.maximum(0, cooldowns[keep] - 1).astype(np.int16)
+
+    finalHealth[ids] = playerHP # <= Fights that hit maxTurns count as a loss
+    return {
+        "won": won,
+        "turns": turnsTaken,
+        "hpLost": np.clip(player["maxHealth"] - finalHealth, 0, player["maxHealth"])
+    }
+
+# === Runs the fights in batches so millions of them fit in memory ===
+def simulate(player: Dict[str, int], monster: Dict, skills: Dict[str, Dict], fights: int, policy: str = "skills", seed: Optional[int] = None, batchSize: int = 250000, maxTurns: int = 200) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    results = [
+        simulateBatch(player, monster, skills, min(batchSize, fights - start), policy, rng, maxTurns)
+        for start in range(0, fights, batchSize)
+    ]
+    won = np.concatenate([result["won"] for result in results])
+    turns = np.concatenate([result["turns"] for result in results])
+    hpLost = np.concatenate([result["hpLost"] for result in results])
+
+    winTurns = turns[won]
+    winHPLost = hpLost[won] / player["maxHealth"]
+    return {
+        "fights": fights,
+        "winRate": float(won.mean()),
+        "turnsMean": float(winTurns.mean()) if winTurns.size else float("nan"),
+        "turnsP50": float(np.percentile(winTurns, 50)) if winTurns.size else float("nan"),
+        "turnsP90": float(np.percentile(winTurns, 90)) if winTurns.size else float("nan"),
+        "hpLostMean": float(winHPLost.mean()) if winHPLost.size else float("nan"),
+        "hpLostP50": float(np.percentile(winHPLost, 50)) if winHPLost.size else float("nan"),
+        "hpLostP90": float(np.percentile(winHPLost, 90)) if winHPLost.size else float("nan")
+    }
+
+def parseLevels(text: str) -> List[int]:
+    levels = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-", 1)
+            levels.extend(range(int(low), int(high) + 1))
+        else:
+            levels.append(int(part))
+    return levels
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description = "Simulates fights against the monsters of an area and reports the balance numbers")
+    parser.add_argument("--area", default = "forest", help = "Area from areas.json")
+    parser.add_argument("--monster", action = "append", help = "Only simulate this monster, can be given more than once")
+    parser.add_argument("--levels", default = "1-5", help = "Character levels, like 1-5 or 1,3,10")
+    parser.add_argument("--fights", type = int, default = 100000, help = "Fights per level and monster")
+    parser.add_argument("--policy", choices = policies, default = "skills", help = "attack only, or use the skills when they are ready")
+    parser.add_argument("--max-turns", type = int, default = 200)
+    parser.add_argument("--batch-size", type = int, default = 250000)
+    parser.add_argument("--seed", type = int, default = None)
+    parser.add_argument("--areas-file", type = Path, default = dataDir / "areas.json")
+    args = parser.parse_args(argv)
+
+    with open(args.areas_file, "r") as f:
+        areasData = json.load(f)
+    if args.area not in areasData["areas"]:
+        parser.error(f"Unknown area: {args.area}")
+
+    skills = combatSystem(None, areasData, {}).defaultSkills # <= The same skill table the live combat uses
+    monsters = areasData["areas"][args.area]["monsters"]
+    if args.monster:
+        wanted = {name.lower() for name in args.monster}
+        monsters = [monster for monster in monsters if monster["name"].lower() in wanted]
+        if not monsters:
+            parser.error(f"None of the monsters were found in {args.area}")
+
+    print(f"{args.fights} fights per row, policy: {args.policy}, area: {args.area}")
+    print(f"{'level':>5}  {'monster':<16} {'rarity':<10} {'win %':>7} {'turns':>6} {'p50':>4} {'p90':>4} {'hp lost':>8} {'p50':>6} {'p90':>6}")
+    for level in parseLevels(args.levels):
+        player = statsAtLevel(level)
+        for monster in monsters:
+            seed = None if args.seed is None else args.seed + level * 1000 + monsters.index(monster)
+            stats = simulate(player, monster, skills, args.fights, args.policy, seed, args.batch_size, args.max_turns)
+            print(
+                f"{level:>5}  {monster['name']:<16} {monster['rarity']:<10} {stats['winRate'] * 100:>6.1f}% "
+                f"{stats['turnsMean']:>6.2f} {stats['turnsP50']:>4.0f} {stats['turnsP90']:>4.0f} "
+                f"{stats['hpLostMean'] * 100:>7.1f}% {stats['hpLostP50'] * 100:>5.0f}% {stats['hpLostP90'] * 100:>5.0f}%"
+            )
+
+if __name__ == "__main__":
+    main()
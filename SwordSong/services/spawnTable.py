@@ -0,0 +1,71 @@
+import random
+from typing import Dict, List, Optional, Sequence
+
+# === Walker/Vose alias table, picks a weighted index in O(1) no matter how many entries there are ===
+class AliasSampler:
+    __slots__ = ("probability", "alias", "size")
+
+    def __init__(self, weights: Sequence[float]):
+        self.size = len(weights)
+        if self.size == 0:
+            raise ValueError("The alias sampler needs at least one weight")
+
+        total = float(sum(weights))
+        if total <= 0 or any(weight < 0 for weight in weights):
+            raise ValueError("The weights have to be positive")
+
+        self.probability = [0.0] * self.size
+        self.alias = [0] * self.size
+
+        scaled = [weight * self.size / total for weight in weights] # <= The average bucket ends up at exactly 1
+        small = [index for index, weight in enumerate(scaled) if weight < 1.0]
+        large = [index for index, weight in enumerate(scaled) if weight >= 1.0]
+
+        # Every small bucket is topped up by a large one, which then becomes its alias
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] = (scaled[more] + scaled[less]) - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # What is left over is only off by the float rounding, so those buckets are full
+        for index in large + small:
+            self.probability[index] = 1.0
+
+    def sample(self, rng = random) -> int:
+        index = int(rng.random() * self.size)
+        if rng.random() < self.probability[index]:
+            return index
+        return self.alias[index]
+
+# === The compiled spawn table of one area, regular monsters by rarity and the bosses in their own bucket ===
+class SpawnTable:
+    def __init__(self, monsters: List[Dict], rarityWeight: Dict[str, int]):
+        self.source = monsters # <= The area list it was compiled from, a new list means the area data changed
+        self.sourceSize = len(monsters)
+        self.regular = [monster for monster in monsters if monster["rarity"] != "boss"]
+        self.bosses = [monster for monster in monsters if monster["rarity"] == "boss"]
+        self.sampler = AliasSampler([rarityWeight[monster["rarity"]] for monster in self.regular]) if self.regular else None
+
+    # === Tells if the area data still looks like what this table was compiled from ===
+    def isCurrent(self, monsters: List[Dict]) -> bool:
+        return monsters is self.source and len(monsters) == self.sourceSize
+
+    def spawnRegular(self, rng = random) -> Optional[Dict]:
+        if self.sampler is None:
+            return None
+        return self.regular[self.sampler.sample(rng)]
+
+    def spawnBoss(self, rng = random) -> Optional[Dict]:
+        if not self.bosses:
+            return None
+        return rng.choice(self.bosses)
+
+# === Compiles the spawn table of every area ===
+def compileSpawnTables(areasData: Dict, rarityWeight: Dict[str, int]) -> Dict[str, SpawnTable]:
+    return {areaName: SpawnTable(area["monsters"], rarityWeight) for areaName, area in areasData["areas"].items()}
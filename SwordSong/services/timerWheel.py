@@ -0,0 +1,61 @@
+import math
+import threading
+from typing import Dict, Hashable, List
+
+# === Hashed timer wheel, scheduling, touching and cancelling a timer are O(1) no matter how many are running ===
+class TimerWheel:
+    def __init__(self, tickSeconds: float = 1.0, slots: int = 512, now: float = 0.0):
+        if tickSeconds <= 0 or slots < 1:
+            raise ValueError("The timer wheel needs a positive tick and at least one slot")
+
+        self.tickSeconds = tickSeconds
+        self.slots = slots
+        self.currentTick = int(now // tickSeconds) # <= Last tick that was processed
+        self._wheel: List[Dict[Hashable, int]] = [{} for _ in range(slots)] # <= slot -> {key: deadlineTick}
+        self._slotOf: Dict[Hashable, int] = {} # <= key -> slot it is waiting in
+        self._lock = threading.Lock() # <= The combat system schedules from the database executor threads
+
+    def __len__(self) -> int:
+        return len(self._slotOf)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slotOf
+
+    # === Starts the timer of a key, or moves it when the key is already running ===
+    def schedule(self, key: Hashable, delay: float, now: float):
+        # Always at least one tick ahead, so the slot that is being processed right now is never reused
+        deadlineTick = max(int(math.ceil((now + delay) / self.tickSeconds)), self.currentTick + 1)
+        slot = deadlineTick % self.slots
+        with self._lock:
+            oldSlot = self._slotOf.get(key)
+            if oldSlot is not None:
+                del self._wheel[oldSlot][key]
+            self._wheel[slot][key] = deadlineTick # <= Deadlines more than one turn of the wheel away just stay for the next rounds
+            self._slotOf[key] = slot
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._lock:
+            slot = self._slotOf.pop(key, None)
+            if slot is None:
+                return False
+            del self._wheel[slot][key]
+            return True
+
+    # === Moves the wheel up to now and hands back every key whose deadline passed ===
+    def advance(self, now: float) -> List[Hashable]:
+        targetTick = int(now // self.tickSeconds)
+        expired = []
+        with self._lock:
+            # After a long pause every slot is due at most once
+            ticks = min(targetTick - self.currentTick, self.slots)
+            for tick in range(targetTick - ticks + 1, targetTick + 1):
+                bucket = self._wheel[tick % self.slots]
+                if not bucket:
+                    continue
+                due = [key for key, deadline in bucket.items() if deadline <= targetTick]
+                for key in due:
+                    del bucket[key]
+                    del self._slotOf[key]
+                expired.extend(due)
+            self.currentTick = max(self.currentTick, targetTick)
+        return expired
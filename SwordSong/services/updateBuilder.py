@@ -0,0 +1,50 @@
+import sqlite3
+from typing import Dict, List, Tuple
+
+# === Maps the declared sqlite column types to the python types we accept for them ===
+columnTypes = {
+    "INTEGER": (int,),
+    "TEXT": (str,),
+    "REAL": (int, float)
+}
+
+class UpdateBuilder:
+    def __init__(self, table: str, keyColumn: str, columns: Dict[str, tuple]):
+        self.table = table
+        self.keyColumn = keyColumn
+        self.columns = {name: types for name, types in columns.items() if name != keyColumn} # <= The key can never be updated
+        self._statements: Dict[frozenset, Tuple[str, Tuple[str, ...]]] = {} # <= Set of columns -> (sql, columns in canonical order)
+
+    # === Builds the whitelist from the columns that really exist in the table ===
+    @classmethod
+    def fromSchema(cls, conn: sqlite3.Connection, table: str, keyColumn: str) -> "UpdateBuilder":
+        columns = {}
+        for _, name, declaredType, *_ in conn.execute(f"PRAGMA table_info({table})"):
+            columns[name] = columnTypes.get(declaredType.upper(), (int, float, str))
+        if not columns:
+            raise ValueError(f"The table {table} does not exist")
+        return cls(table, keyColumn, columns)
+
+    # === Returns the UPDATE statement and its values, the same set of columns always gives the exact same sql ===
+    def build(self, key, updates: Dict) -> Tuple[str, List]:
+        columnSet = frozenset(updates)
+        statement = self._statements.get(columnSet)
+        if statement is None:
+            unknown = sorted(name for name in columnSet if name not in self.columns)
+            if unknown:
+                raise ValueError(f"Unknown column(s) for {self.table}: {', '.join(unknown)}")
+
+            orderedColumns = tuple(sorted(columnSet))
+            setValues = ", ".join(f"{name} = ?" for name in orderedColumns)
+            statement = (f"UPDATE {self.table} SET {setValues} WHERE {self.keyColumn} = ?", orderedColumns)
+            self._statements[columnSet] = statement
+
+        query, orderedColumns = statement
+        values = []
+        for name in orderedColumns:
+            value = updates[name]
+            if value is not None and (isinstance(value, bool) or not isinstance(value, self.columns[name])):
+                raise TypeError(f"{self.table}.{name} can't be set to {type(value).__name__}")
+            values.append(value)
+        values.append(key)
+        return query, values
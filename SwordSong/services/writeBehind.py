@@ -0,0 +1,158 @@
+import threading
+from contextlib import contextmanager
+from .connectionManager import ConnectionManager
+
+class UnitOfWork:
+    def __init__(self, changesBefore: int):
+        self.failed = False # <= Set when one of the writes in the unit failed, the whole unit is rolled back then
+        self.users = set()
+        self.changesBefore = changesBefore
+
+class WriteBehindQueue:
+    def __init__(self, connections: ConnectionManager, durability: str = "grouped", flushInterval: float = 0.25, maxPending: int = 100):
+        if durability not in ("grouped", "immediate"):
+            raise ValueError(f"Unknown durability mode: {durability}")
+
+        self.connections = connections
+        self.durability = durability # <= "grouped" batches deferred writes, "immediate" commits every write right away
+        self.flushInterval = flushInterval
+        self.maxPending = max(1, maxPending)
+
+        self.pending = 0 # <= Deferred mutations that are waiting in the open transaction
+        self.dirtyUsers = set() # <= Users with uncommitted writes, their reads have to go through the writer
+        self.commitCount = 0
+        self.mutationCount = 0
+        self.onRollback = None # <= Called with the users of a unit of work that got rolled back
+        self.onMutation = None # <= Called with the user of every mutation that went through
+
+        self._units = [] # <= Stack of open units of work, only the thread holding the writer touches it
+
+        self._stopEvent = threading.Event()
+        self._flusher = None
+        if self.durability == "grouped":
+            self._flusher = threading.Thread(target = self._flushLoop, name = "swordsong-db-flusher", daemon = True)
+            self._flusher.start()
+
+    # === Runs one mutation on the writer inside its own savepoint ===
+    @contextmanager
+    def mutation(self, userID: str = None, defer: bool = False):
+        with self.connections.writer() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            changesBefore = conn.total_changes
+            conn.execute("SAVEPOINT mutation")
+            try:
+                yield conn
+            except BaseException:
+                # Only undo this mutation, the deferred writes of other players stay in the transaction
+                conn.execute("ROLLBACK TO mutation")
+                conn.execute("RELEASE mutation")
+                if self._units:
+                    self._units[-1].failed = True
+                elif self.pending == 0:
+                    conn.rollback()
+                raise
+
+            conn.execute("RELEASE mutation")
+            if userID is not None and self.onMutation is not None:
+                self.onMutation(userID)
+
+            if self._units:
+                # The unit of work commits once when the outermost one ends
+                if userID is not None:
+                    self._units[-1].users.add(userID)
+                    self.dirtyUsers.add(userID)
+                self.mutationCount += 1
+                return
+
+            if conn.total_changes == changesBefore and self.pending == 0:
+                conn.rollback() # <= Nothing changed, so there is nothing to commit
+                return
+
+            self.mutationCount += 1
+            self.pending += 1
+            if userID is not None:
+                self.dirtyUsers.add(userID)
+
+            if not defer or self.durability == "immediate" or self.pending >= self.maxPending:
+                self._commit(conn)
+
+    # === Groups every write inside it into one commit, units can be nested ===
+    # === A deferred unit is still all or nothing, but its commit is left to the flusher like a deferred mutation ===
+    @contextmanager
+    def transaction(self, defer: bool = False):
+        with self.connections.writer() as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            unit = UnitOfWork(conn.total_changes)
+            self._units.append(unit)
+            savepoint = f"unitOfWork{len(self._units)}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+            try:
+                yield unit
+            except BaseException:
+                unit.failed = True
+                raise
+            finally:
+                self._units.pop()
+                if unit.failed:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                    if self._units:
+                        self._units[-1].failed = True # <= A failed inner unit takes the outer one down with it
+                    if self.onRollback is not None:
+                        self.onRollback(unit.users)
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+                    if self._units:
+                        self._units[-1].users |= unit.users
+
+                if not self._units:
+                    changed = not unit.failed and conn.total_changes != unit.changesBefore
+                    if self.pending == 0 and not changed:
+                        conn.rollback() # <= Nothing is left to commit
+                    elif defer and self.durability == "grouped":
+                        if changed:
+                            self.pending += 1
+                        if self.pending >= self.maxPending:
+                            self._commit(conn)
+                    else:
+                        self._commit(conn)
+
+    # === Gives a connection that can see the uncommitted writes of the user ===
+    @contextmanager
+    def readerFor(self, userID: str):
+        if userID in self.dirtyUsers:
+            with self.connections.writer() as conn:
+                yield conn
+        else:
+            with self.connections.reader() as conn:
+                yield conn
+
+    def _commit(self, conn):
+        conn.commit()
+        self.commitCount += 1
+        self.pending = 0
+        self.dirtyUsers.clear()
+
+    # === Commits every deferred write ===
+    def flush(self):
+        with self.connections.writer() as conn:
+            if conn.in_transaction:
+                self._commit(conn)
+
+    def _flushLoop(self):
+        while not self._stopEvent.wait(self.flushInterval):
+            if self.pending:
+                try:
+                    self.flush()
+                except Exception as e:
+                    print(f"There was an error while flushing the pending database writes: {e}")
+
+    # === Stops the flusher and writes out everything that is still pending ===
+    def close(self):
+        self._stopEvent.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
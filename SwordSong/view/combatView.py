@@ -1,7 +1,6 @@
 import discord
 from discord.ext import commands
 import asyncio
-import random
 
 class CombatView(discord.ui.View):
     def __init__(self, bot, userID):
@@ -19,7 +18,7 @@ class CombatView(discord.ui.View):
         return True
     
     async def on_timeout(self):
-        self.combat.endCombat(self.userID)
+        await self.db.run(self.combat.endCombat, self.userID)
         for item in self.children:
             item.disabled = True
 
@@ -48,25 +47,25 @@ class CombatView(discord.ui.View):
         if len(self.combatLog) > 4:
             self.combatLog.pop(0)
 
-    def updateEmbed(self, include_log = True):
+    async def updateEmbed(self, include_log = True):
         combatState = self.combat.getCombatState(self.userID)
-        character = self.db.getCharacter(self.userID)
-        if not combatState or not character:
+        if not combatState or not combatState.character:
             return None
+        character = combatState.character # <= The fight holds the live health and mana
         
-        monster = combatState["monster"]
+        monster = combatState.monster
         embed = discord.Embed(
             title = "❗ Combat in Progress ❗",
-            description = f"Fighting: **{monster['name']}**\n\n"
-                          f"{monster['description']}",
+            description = f"Fighting: **{monster.name}**\n\n"
+                          f"{monster.description}",
             color = discord.Color.dark_red()  
         )
         embed.add_field(
             name = "Monster's Stats",
-            value = f"❤️ Health: {monster['currentHealth']}/{monster['maxHealth']}\n"
-                    f"⚔️ Attack: {monster['attack']}\n"
-                    f"🛡️ Defense: {monster['defense']}\n"
-                    f"🌟 Rarity: {monster['rarity']}",
+            value = f"❤️ Health: {combatState.monsterHealth}/{monster.health}\n"
+                    f"⚔️ Attack: {monster.attack}\n"
+                    f"🛡️ Defense: {monster.defense}\n"
+                    f"🌟 Rarity: {monster.rarity}",
             inline = True
         )
         embed.add_field(
@@ -86,7 +85,7 @@ class CombatView(discord.ui.View):
                 inline = False
             )
 
-        if combatState["turn"] == "player":
+        if combatState.turn == "player":
             embed.set_footer(text = "🟢 Your turn - Choose an action!")
         else:
             embed.set_footer(text = "🔴 Monster's turn - Prepare to defend!")
@@ -97,7 +96,7 @@ class CombatView(discord.ui.View):
         await interaction.response.defer()
 
         combatState = self.combat.getCombatState(self.userID)
-        if not combatState or combatState["turn"] != "player":
+        if not combatState or combatState.turn != "player":
             return
         
         await self.processAttack(interaction)
@@ -113,7 +112,7 @@ class CombatView(discord.ui.View):
         await self.processFlee(interaction)
     
     async def processAttack(self, interaction):
-        result = self.combat.processPlayerAttack(self.userID)
+        result = await self.db.run(self.combat.processPlayerAttack, self.userID)
         combatState = self.combat.getCombatState(self.userID)
 
         if "error" in result:
@@ -125,9 +124,9 @@ class CombatView(discord.ui.View):
             await interaction.followup.send(embed = embed, ephemeral = True)
             return
         
-        monster = combatState["monster"]
+        monster = combatState.monster
         self.addToCombatLog(
-            f"You dealt {result['damage']} damage to {monster['name']}! ({monster['currentHealth']}/{monster['maxHealth']} HP)",
+            f"You dealt {result['damage']} damage to {monster.name}! ({combatState.monsterHealth}/{monster.health} HP)",
             "playerAttack"
         )
 
@@ -135,7 +134,7 @@ class CombatView(discord.ui.View):
             await self.handleVictory(interaction, monster)
             return
         
-        updatedEmbed = self.updateEmbed()
+        updatedEmbed = await self.updateEmbed()
         if updatedEmbed:
             await interaction.edit_original_response(embed = updatedEmbed, view = self)
         
@@ -144,51 +143,49 @@ class CombatView(discord.ui.View):
     
     async def processMonsterTurn(self, interaction):
         combatState = self.combat.getCombatState(self.userID)
-        character = self.db.getCharacter(self.userID)
-        monsterResult = self.combat.processMonsterTurn(self.userID)
-        character = self.db.getCharacter(self.userID)
+        monsterResult = await self.db.run(self.combat.processMonsterTurn, self.userID)
 
         if "error" in monsterResult:
             self.addToCombatLog(f"Monster's attack failed: {monsterResult['error']}", "info")
         else:
-            monster = combatState["monster"]
+            monster = combatState.monster
             self.addToCombatLog(
-                f"{monster['name']} dealt {monsterResult['damage']} to you! ({monsterResult['playerHealth']}/{character['maxHealth']} HP)",
+                f"{monster.name} dealt {monsterResult['damage']} to you! ({monsterResult['playerHealth']}/{combatState.character['maxHealth']} HP)",
                 "monsterAttack"
             )
 
         if monsterResult.get("playerDefeated"):
             self.addToCombatLog("You have been defeated!", "info")
-            defeatedEmbed = self.updateEmbed()
+            defeatedEmbed = await self.updateEmbed()
             defeatedEmbed.title = "💀 Defeat! 💀"
             defeatedEmbed.description = "You were unfortunately defeated by the monster. Go get some rest before you go back hunting monsters."
             defeatedEmbed.color = discord.Color.red()
 
             await interaction.edit_original_response(embed = defeatedEmbed, view = None)
-            self.combat.endCombat(self.userID)
+            await self.db.run(self.combat.endCombat, self.userID)
             self.stop()
             return False
         
-        updatedEmbed = self.updateEmbed()
+        updatedEmbed = await self.updateEmbed()
         if updatedEmbed:
             await interaction.edit_original_response(embed = updatedEmbed, view = self)
         return True
     
     async def processFlee(self, interaction):
-        if random.randint(1, 100) <= 70:
+        if await self.db.run(self.combat.attemptFlee, self.userID): # <= Takes the session lock, so it stays off the event loop
             self.addToCombatLog("You successfully escaped from the monster!", "flee")
 
-            fleeEmbed = self.updateEmbed()
+            fleeEmbed = await self.updateEmbed()
             fleeEmbed.title = "💨 You successfully ran away! 💨"
             fleeEmbed.description = "You manged to distract the monster and run away from it!"
             fleeEmbed.color = discord.Color.green()
 
             await interaction.edit_original_response(embed = fleeEmbed, view = None)
-            self.combat.endCombat(self.userID)
+            await self.db.run(self.combat.endCombat, self.userID)
             self.stop()
         else:
             self.addToCombatLog("You failed to escape! The monster is enraged!", "info")
-            updatedEmbed = self.updateEmbed()
+            updatedEmbed = await self.updateEmbed()
             if updatedEmbed:
                 await interaction.edit_original_response(embed = updatedEmbed, view = self)
             
@@ -196,8 +193,9 @@ class CombatView(discord.ui.View):
             await self.processMonsterTurn(interaction)
     
     async def showSkillMenu(self, interaction):
-        character = self.db.getCharacter(self.userID)
-        availableSkills = self.combat.getAvailableSkills(self.userID)
+        combatState = self.combat.getCombatState(self.userID)
+        character = combatState.character if combatState else await self.db.getCharacter(self.userID)
+        availableSkills = await self.db.run(self.combat.getAvailableSkills, self.userID)
         skillView = SkillSelectionView(self.bot, self.userID, self, availableSkills)
 
         embed = discord.Embed(
@@ -219,20 +217,34 @@ class CombatView(discord.ui.View):
         await interaction.followup.send(embed = embed, view = skillView, ephemeral = True)
     
     async def handleVictory(self, interaction, monster):
-        rewards = self.combat.distributeRewards(self.userID, monster)
-        self.addToCombatLog(f"Victory! You defeated {monster['name']}!", "info")
+        rewards = await self.db.run(self.combat.distributeRewards, self.userID, monster)
+        self.addToCombatLog(f"Victory! You defeated {monster.name}!", "info")
 
-        victoryEmbed = self.updateEmbed()
+        victoryEmbed = await self.updateEmbed()
         victoryEmbed.title = "🎉 Victory! 🎉"
         victoryEmbed.color = discord.Color.green()
 
+        if "error" in rewards:
+            victoryEmbed.add_field(
+                name = "❌ No Rewards ❌",
+                value = f"{rewards['error']}. Please try again later.",
+                inline = False
+            )
+            await interaction.edit_original_response(embed = victoryEmbed, view = None)
+            await self.db.run(self.combat.endCombat, self.userID)
+            self.stop()
+            return
+
         rewardsText = f"**Rewards Earned:**\n• {rewards['xp']} XP\n• {rewards['coins']} coins"
         if rewards.get("items"):
             lootList = [f"• {item['quantity']}x {item['name']}" for item in rewards["items"]]
             rewardsText += f"\n• **Loot** {', '.join([item['name'] for item in rewards['items']])}"
 
         if rewards.get("levelUP"):
-            rewardsText += f"\n• **🎊 LEVEL UP! 🎊 You reached level {rewards['levelUP']['newLevel']}!"
+            levelUP = rewards["levelUP"]
+            rewardsText += f"\n• **🎊 LEVEL UP! 🎊 You reached level {levelUP['newLevel']}!"
+            if levelUP.get("levelsGained", 1) > 1:
+                rewardsText += f" That's {levelUP['levelsGained']} levels at once!"
 
         victoryEmbed.add_field(
             name = "🏆 Fangs of Fortune 🏆",
@@ -241,7 +253,7 @@ class CombatView(discord.ui.View):
         ) 
 
         await interaction.edit_original_response(embed = victoryEmbed, view = None)
-        self.combat.endCombat(self.userID)
+        await self.db.run(self.combat.endCombat, self.userID)
         self.stop()
 
 class SkillSelectionView(discord.ui.View):
@@ -284,10 +296,10 @@ class SkillSelectionView(discord.ui.View):
     
     async def useSkill(self, interaction, skillName):
         combatState = self.combatView.combat.getCombatState(self.userID)
-        if not combatState or combatState["turn"] != "player":
+        if not combatState or combatState.turn != "player":
             return
 
-        result = self.combatView.combat.processPlayerAttack(self.userID, skillName)
+        result = await self.combatView.db.run(self.combatView.combat.processPlayerAttack, self.userID, skillName)
         if "error" in result:
             embed = discord.Embed(
                 title = "Skill Failed!",
@@ -300,9 +312,9 @@ class SkillSelectionView(discord.ui.View):
         await interaction.delete_original_response()
         if result.get("damage", 0) > 0:
             CombatState = self.combatView.combat.getCombatState(self.userID)
-            monster = CombatState["monster"]
+            monster = CombatState.monster
             self.combatView.addToCombatLog(
-                f"Used {skillName}! Dealth {result['damage']} damage to {monster['name']}",
+                f"Used {skillName}! Dealth {result['damage']} damage to {monster.name}",
                 "skill"
             )
         elif skillName == "Healing Pulse":
@@ -318,10 +330,10 @@ class SkillSelectionView(discord.ui.View):
         if result.get("monsterDefeated"):
             combatState = self.combatView.combat.getCombatState(self.userID)
             if combatState:
-                await self.combatView.handleVictory(interaction, combatState["monster"])
+                await self.combatView.handleVictory(interaction, combatState.monster)
                 return
         
-        updateEmbed = self.combatView.updateEmbed()
+        updateEmbed = await self.combatView.updateEmbed()
         if updateEmbed:
             await interaction.message.edit(embed = updateEmbed, view = self.combatView)
         
@@ -101,7 +101,7 @@ class StartView(discord.ui.View):
     async def joinGuild(self, interaction: discord.Interaction, button: discord.ui.Button):
         userID = str(interaction.user.id)
 
-        if self.bot.db.getCharacter(userID):
+        if await self.bot.db.getCharacter(userID):
             embed = discord.Embed(
                 title = "You're already part of the guild!",
                 description = "You're already a member of SwordSong. Use `.profile` to view your character stats.",
@@ -134,7 +134,7 @@ class NameInputModal(discord.ui.Modal, title = "Join SwordSong"):
         characterName = self.name.value.strip()
 
         try:
-            if self.bot.db.createCharacter(userID, characterName):
+            if await self.bot.db.createCharacter(userID, characterName):
                 embed = discord.Embed(
                     title = "Welcome to SwordSong!",
                     description = f"Welcome, {characterName}! You adventure across Azefarnia begins now.",
@@ -163,106 +163,112 @@ class NameInputModal(discord.ui.Modal, title = "Join SwordSong"):
 
         await interaction.response.send_message(embed = embed, ephemeral = True)
 
-class ProfileView(discord.ui.View):
-    def __init__(self, bot, character):
-        super().__init__(timeout = 120)
-        self.bot = bot
-        self.character = character
-
-    @discord.ui.button(label = "View Inventory", style = discord.ButtonStyle.secondary, emoji = "🎒")
-    async def viewInventory(self, interaction: discord.Interaction, button: discord.ui.Button):
-        userID = str(interaction.user.id)
-        equipment = self.bot.db.getEquipment(userID)
-        items = self.bot.db.getInventory(userID)
-        inventoryView = InventoryView(self.bot, self.character)
-
-        embed = discord.Embed(
-            title = f"{self.character['name']}'s Inventory",
-            color = discord.Color.blue()
-        )
+# === Shared embed builders, the profile and inventory screens all render from a player snapshot ===
+def profileEmbed(snapshot) -> discord.Embed:
+    character = snapshot.character
+    embed = discord.Embed(
+        title = f"{character['name']}'s Profile",
+        color = discord.Color.blue()
+    )
+    embed.add_field(name = "📈 Level", value = character["level"], inline = True)
+    embed.add_field(name = "✨ XP", value = f"{character['xp']}/{character['xpToLevel']}", inline = True)
+    embed.add_field(name = "🌲 Area", value = character.get("currentArea", "forest").capitalize(), inline = True)
+
+    embed.add_field(name = "❤️ Health", value = f"{character['health']}/{character['maxHealth']}", inline = True)
+    embed.add_field(name = "⚔️ Attack", value = character["attack"], inline = True)
+    embed.add_field(name = "🛡️ Defense", value = character["defense"], inline = True)
+
+    embed.add_field(name = "💰 Coins", value = f"{character['coins']} coins", inline = True)
+    embed.add_field(name = "🔮 Mana", value = f"{character.get('mana', 50)}/{character.get('maxMana', 50)}", inline = True)
+    embed.add_field(name = "\u200b", value = "\u200b", inline = True) # <- Temp empty field for alignment
+    return embed
+
+def inventoryEmbed(snapshot, coinsInline: bool = True) -> discord.Embed:
+    character = snapshot.character
+    embed = discord.Embed(
+        title = f"{character['name']}'s Inventory",
+        color = discord.Color.blue()
+    )
 
-        equipText = "\n".join([f"{slot.title()}: {item or 'Empty'}" for slot, item in equipment.items()])
-        embed.add_field(
-            name = "🛡️ Equipment 🛡️",
-            value = equipText or "No Equipment",
-            inline = False
-        )
+    equipText = "\n".join([f"{slot.title()}: {item or 'Empty'}" for slot, item in snapshot.equipment])
+    embed.add_field(
+        name = "🛡️ Equipment 🛡️",
+        value = equipText or "No Equipment",
+        inline = False
+    )
 
-        if items:
-            itemsList = [f"{name}: {qty}" for name, qty in items]
-            if len(itemsList) > 10:
-                mid = len(itemsList) // 2
-                firstHalf = "\n".join(itemsList[:mid])
-                secondHalf = "\n".join(itemsList[mid:])
+    if snapshot.inventory:
+        itemsList = [f"{name}: {qty}" for name, qty in snapshot.inventory]
+        if len(itemsList) > 10:
+            mid = len(itemsList) // 2
+            firstHalf = "\n".join(itemsList[:mid])
+            secondHalf = "\n".join(itemsList[mid:])
 
-                embed.add_field(
-                    name = "🎒 Items ",
-                    value = firstHalf,
-                    inline = True
-                )
-                embed.add_field(
-                    name = " Items 🎒",
-                    value = secondHalf,
-                    inline = True
-                )
-            else:
-                embed.add_field(
-                    name = "🎒 Items 🎒",
-                    value = "\n".join(itemsList),
-                    inline = True
-                )
-            
             embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{self.character['coins']} coins",
-                inline = False
+                name = "🎒 Items ",
+                value = firstHalf,
+                inline = True
             )
-        else:
             embed.add_field(
-                name = "🎒 Items 🎒",
-                value = "Empty",
+                name = " Items 🎒",
+                value = secondHalf,
                 inline = True
             )
+        else:
             embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{self.character['coins']} coins",
-                inline = False
+                name = "🎒 Items 🎒",
+                value = "\n".join(itemsList),
+                inline = True
             )
+    else:
+        embed.add_field(
+            name = "🎒 Items 🎒",
+            value = "Empty",
+            inline = True
+        )
+
+    embed.add_field(
+        name = "💰 Coins 💰",
+        value = f"{character['coins']} coins",
+        inline = coinsInline # <= The .inventory command shows the coins next to the items, the inventory buttons below them
+    )
+    embed.set_footer(text = f"Current Area: {character.get('currentArea', 'forest').capitalize()}")
+    return embed
+
+def missingCharacterEmbed() -> discord.Embed:
+    return discord.Embed(
+        title = "Error",
+        description = "We could not retrieve your character data.",
+        color = discord.Color.red()
+    )
+
+class ProfileView(discord.ui.View):
+    def __init__(self, bot, snapshot):
+        super().__init__(timeout = 120)
+        self.bot = bot
+        self.snapshot = snapshot
+
+    @discord.ui.button(label = "View Inventory", style = discord.ButtonStyle.secondary, emoji = "🎒")
+    async def viewInventory(self, interaction: discord.Interaction, button: discord.ui.Button):
+        userID = str(interaction.user.id)
+        self.snapshot = await self.bot.db.getPlayerSnapshot(userID)
+        if not self.snapshot:
+            await interaction.response.edit_message(embed = missingCharacterEmbed(), view = self)
+            return
 
-        embed.set_footer(text = f"Current Area: {self.character.get('currentArea', 'forest').capitalize()}")
-        await interaction.response.edit_message(embed = embed, view = inventoryView)
+        inventoryView = InventoryView(self.bot, self.snapshot)
+        await interaction.response.edit_message(embed = inventoryEmbed(self.snapshot, coinsInline = False), view = inventoryView)
     
     @discord.ui.button(label = "Refresh Stats", style = discord.ButtonStyle.primary, emoji = "🔄")
     async def refreshProfile(self, interaction: discord.Interaction, button: discord.ui.Button):
         userID = str(interaction.user.id)
-        self.character = self.bot.db.getCharacter(userID)
+        self.snapshot = await self.bot.db.getPlayerSnapshot(userID) # <= Served from the snapshot cache until the player changes
 
-        if not self.character:
-            embed = discord.Embed(
-                title = "Error",
-                description = "We could not retrieve your character data.",
-                color = discord.Color.red()
-            )
-            await interaction.response.edit_message(embed = embed, view = self)
+        if not self.snapshot:
+            await interaction.response.edit_message(embed = missingCharacterEmbed(), view = self)
             return
-        
-        embed = discord.Embed(
-            title = f"{self.character['name']}'s Profile",
-            color = discord.Color.blue()
-        )
-        embed.add_field(name = "📈 Level", value = self.character["level"], inline = True)
-        embed.add_field(name = "✨ XP", value = f"{self.character['xp']}/{self.character['xpToLevel']}", inline = True)
-        embed.add_field(name = "🌲 Area", value = self.character.get("currentArea", "forest").capitalize(), inline = True)
 
-        embed.add_field(name = "❤️ Health", value = f"{self.character['health']}/{self.character['maxHealth']}", inline = True)
-        embed.add_field(name = "⚔️ Attack", value = self.character["attack"], inline = True)
-        embed.add_field(name = "🛡️ Defense", value = self.character["defense"], inline = True)
-
-        embed.add_field(name = "💰 Coins", value = f"{self.character['coins']} coins", inline = True)
-        embed.add_field(name = "🔮 Mana", value = f"{self.character.get('mana', 50)}/{self.character.get('maxMana', 50)}", inline = True)
-        embed.add_field(name = "\u200b", value = "\u200b", inline = True) # <- Temp empty field for alignment
-
-        await interaction.response.edit_message(embed = embed, view = self)
+        await interaction.response.edit_message(embed = profileEmbed(self.snapshot), view = self)
     
     async def on_timeout(self):
         try:
@@ -281,95 +287,30 @@ class ProfileView(discord.ui.View):
                 pass
 
 class InventoryView(discord.ui.View):
-    def __init__(self, bot, character):
+    def __init__(self, bot, snapshot):
         super().__init__(timeout = 120)
         self.bot = bot
-        self.character = character
+        self.snapshot = snapshot
 
     async def showInventory(self, interaction: discord.Interaction):
         userID = str(interaction.user.id)
-        equipment = self.bot.db.getEquipment(userID)
-        items = self.bot.db.getInventory(userID)
-
-        embed = discord.Embed(
-            title = f"{self.character['name']}'s Inventory",
-            color = discord.Color.blue()
-        )
-
-        equipText = "\n".join([f"{slot.title()}: {item or 'Empty'}" for slot, item in equipment.items()])
-        embed.add_field(
-            name = "🛡️ Equipment 🛡️",
-            value = equipText or "No Equipment",
-            inline = False
-        )
-
-        if items:
-            itemsList = [f"{name}: {qty}" for name, qty in items]
-            if len(itemsList) > 10:
-                mid = len(itemsList) // 2
-                firstHalf = "\n".join(itemsList[:mid])
-                secondHalf = "\n".join(itemsList[mid:])
-
-                embed.add_field(
-                    name = "🎒 Items ",
-                    value = firstHalf,
-                    inline = True
-                )
-                embed.add_field(
-                    name = " Items 🎒",
-                    value = secondHalf,
-                    inline = True
-                )
-            else:
-                embed.add_field(
-                    name = "🎒 Items 🎒",
-                    value = "\n".join(itemsList),
-                    inline = True
-                )
-            
-            embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{self.character['coins']} coins",
-                inline = False
-            )
-        else:
-            embed.add_field(
-                name = "🎒 Items 🎒",
-                value = "Empty",
-                inline = True
-            )
-            embed.add_field(
-                name = "💰 Coins 💰",
-                value = f"{self.character['coins']} coins",
-                inline = False
-            )
+        self.snapshot = await self.bot.db.getPlayerSnapshot(userID)
+        if not self.snapshot:
+            await interaction.response.edit_message(embed = missingCharacterEmbed(), view = self)
+            return
 
-        embed.set_footer(text = f"Current Area: {self.character.get('currentArea', 'forest').capitalize()}")
-        await interaction.response.edit_message(embed = embed, view = self)
+        await interaction.response.edit_message(embed = inventoryEmbed(self.snapshot, coinsInline = False), view = self)
     
     @discord.ui.button(label = "Back to Profile", style = discord.ButtonStyle.gray, emoji = "👤")
     async def backToProfile(self, interaction: discord.Interaction, button: discord.ui.Button):
         userID = str(interaction.user.id)
-        self.character = self.bot.db.getCharacter(userID)
-        profileView = ProfileView(self.bot, self.character)
-
-        embed = discord.Embed(
-            title = f"{self.character['name']}'s Profile",
-            color = discord.Color.blue()
-        )
-        embed.add_field(name = "📈 Level", value = self.character["level"], inline = True)
-        embed.add_field(name = "✨ XP", value = f"{self.character['xp']}/{self.character['xpToLevel']}", inline = True)
-        embed.add_field(name = "🌲 Area", value = self.character.get("currentArea", "forest").capitalize(), inline = True)
-
-        embed.add_field(name = "❤️ Health", value = f"{self.character['health']}/{self.character['maxHealth']}", inline = True)
-        embed.add_field(name = "⚔️ Attack", value = self.character["attack"], inline = True)
-        embed.add_field(name = "🛡️ Defense", value = self.character["defense"], inline = True)
-
-        embed.add_field(name = "💰 Coins", value = f"{self.character['coins']} coins", inline = True)
-        embed.add_field(name = "🔮 Mana", value = f"{self.character.get('mana', 50)}/{self.character.get('maxMana', 50)}", inline = True)
-        embed.add_field(name = "\u200b", value = "\u200b", inline = True) # <- Temp empty field for alignment
+        self.snapshot = await self.bot.db.getPlayerSnapshot(userID)
+        if not self.snapshot:
+            await interaction.response.edit_message(embed = missingCharacterEmbed(), view = self)
+            return
 
-        await interaction.response.edit_message(embed = embed, view = profileView)
+        profileView = ProfileView(self.bot, self.snapshot)
+        await interaction.response.edit_message(embed = profileEmbed(self.snapshot), view = profileView)
 
     @discord.ui.button(label = "Refresh", style = discord.ButtonStyle.primary, emoji = "🔄")
     async def refreshInventory(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -400,7 +341,7 @@ class LeaveGuildView(discord.ui.View):
     async def confirmLeave(self, interaction: discord.Interaction, button: discord.ui.Button):
         userID = str(interaction.user.id)
 
-        if self.bot.db.deleteCharacter(userID):
+        if await self.bot.db.deleteCharacter(userID):
             embed = discord.Embed(
                 title = "You left the guild.",
                 description = "You successfully left SwordSong. If you wish to rejoin in the future, use `.start` to join again",
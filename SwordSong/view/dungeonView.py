@@ -1,10 +1,23 @@
 import discord
 from discord.ext import commands
 import asyncio
-import random
 from services.dungeon.miniTest import MiniDungeon
+from services.dungeon.defaults import defaultDungeonConfig
 from services.dungeon.models import RoomType
 
+# === Built once, createDungeonEmbed runs on every button press ===
+roomDescriptions = {
+    RoomType.ENTRANCE: "The entrance to the dungeon. You are able to rest safely here as there is no threat around.",
+    RoomType.COMBAT: "Its a dangerous room that is filled with monsters!",
+    RoomType.TREASURE: "A room that containes a lot of value treasures!",
+    RoomType.TRAP: "Watch out! This room is full with deadly traps.",
+    RoomType.BOSS: "This is the boss chamber. You better stay aware of your surroundings as the boss is hiding here somewhere.",
+    RoomType.SHOP: "A mysterious merchant has set up shop here. Nobody knows why he's here.",
+    RoomType.HEALING: "Its a peaceful room with water that seems to revitalize the people that drink it.",
+    RoomType.PUZZLE: "These kind of rooms are full with ancient puzzles to solve.",
+    RoomType.EMPTY: "It's a empty room. There seems to be nothing interesting here."
+}
+
 class DungeonView(discord.ui.View):
     def __init__(self, bot, userID, dungeon: MiniDungeon, timeout = 180):
         super().__init__(timeout = timeout)
@@ -14,6 +27,7 @@ class DungeonView(discord.ui.View):
         self.db = bot.db
         self.message = None
         self.actionLog = []
+        self.roomLock = asyncio.Lock() # <= The room effects await the database before the room is cleared, so a double click waits here
 
     async def interaction_check(self, interaction: discord.Interaction):
         if str(interaction.user.id) != self.userID:
@@ -34,15 +48,22 @@ class DungeonView(discord.ui.View):
             await self.message.edit(embed = embed, view = self)
         except:
             pass
+        await self.db.deleteDungeon(self.userID) # <= The rescue ends the run, so it can't be resumed anymore
+    
+    # === Checkpoints the run, a few dozen bytes so it survives a restart ===
+    async def saveProgress(self):
+        state = self.dungeon.checkpoint()
+        if state[0] is not None:
+            await self.db.saveDungeon(self.userID, state)
     
     def addToActionLog(self, message: str):
         self.actionLog.append(f"• {message}")
         if len(self.actionLog) > 4:
             self.actionLog.pop(0)
     
-    def createDungeonEmbed(self) -> discord.Embed:
+    async def createDungeonEmbed(self) -> discord.Embed:
         currentRoom = self.dungeon.currentRoom
-        character = self.db.getCharacter(self.userID)
+        character = await self.db.getCharacter(self.userID)
 
         embed = discord.Embed(
             title = "🪨 Dungeon Adventure 🪨",
@@ -58,18 +79,6 @@ class DungeonView(discord.ui.View):
             inline = False
         )
 
-        roomDescriptions = {
-            RoomType.ENTRANCE: "The entrance to the dungeon. You are able to rest safely here as there is no threat around.",
-            RoomType.COMBAT: "Its a dangerous room that is filled with monsters!",
-            RoomType.TREASURE: "A room that containes a lot of value treasures!",
-            RoomType.TRAP: "Watch out! This room is full with deadly traps.",
-            RoomType.BOSS: "This is the boss chamber. You better stay aware of your surroundings as the boss is hiding here somewhere.",
-            RoomType.SHOP: "A mysterious merchant has set up shop here. Nobody knows why he's here.",
-            RoomType.HEALING: "Its a peaceful room with water that seems to revitalize the people that drink it.",
-            RoomType.PUZZLE: "These kind of rooms are full with ancient puzzles to solve.",
-            RoomType.EMPTY: "It's a empty room. There seems to be nothing interesting here."
-        }
-
         embed.add_field(
             name = "📍 Current Room 📍",
             value = roomDescriptions.get(currentRoom.roomType, "An unknow room..."),
@@ -123,7 +132,7 @@ class DungeonView(discord.ui.View):
     
     @discord.ui.button(label = "Interact", style = discord.ButtonStyle.primary, emoji = "🔍", row = 1)
     async def interactButton(self, interaction: discord.Interaction, button: discord.ui.Button):
-        self.interactWithRoom(interaction)
+        await self.interactWithRoom(interaction)
     
     @discord.ui.button(label = "Leave Dungeon", style = discord.ButtonStyle.danger, emoji = "🚪", row = 3)
     async def leaveButton(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -145,7 +154,8 @@ class DungeonView(discord.ui.View):
         if self.dungeon.movePlayer(direction):
             newRoom = self.dungeon.currentRoom
             self.addToActionLog(f"Moved {direction} to a {newRoom.roomType.value} room.")
-            embed = self.createDungeonEmbed()
+            await self.saveProgress()
+            embed = await self.createDungeonEmbed()
             await interaction.edit_original_response(embed = embed, view = self)
         else:
             embed = discord.Embed(
@@ -157,9 +167,12 @@ class DungeonView(discord.ui.View):
     
     async def interactWithRoom(self, interaction: discord.Interaction):
         await interaction.response.defer()
+        async with self.roomLock:
+            await self._interactWithRoom(interaction)
 
+    async def _interactWithRoom(self, interaction: discord.Interaction):
         currentRoom = self.dungeon.currentRoom
-        character = self.db.getCharacter(self.userID)
+        character = await self.db.getCharacter(self.userID)
 
         if currentRoom.cleared:
             embed = discord.Embed(
@@ -197,10 +210,29 @@ class DungeonView(discord.ui.View):
             )
             await interaction.followup.send(embed = embed, ephemeral = True)
     
+    # === Room effects, each one is a single unit of work on a fresh read of the character ===
+    def _addCoins(self, db, amount: int):
+        character = db.getCharacter(self.userID)
+        db.updateCharacter(self.userID, {"coins": character["coins"] + amount})
+
+    def _takeDamage(self, db, damage: int) -> int:
+        character = db.getCharacter(self.userID)
+        newHealth = max(1, character["health"] - damage)
+        db.updateCharacter(self.userID, {"health": newHealth})
+        return newHealth
+
+    def _heal(self, db, amount: int) -> int:
+        character = db.getCharacter(self.userID)
+        healAmount = min(amount, character["maxHealth"] - character["health"])
+        if healAmount > 0:
+            db.updateCharacter(self.userID, {"health": character["health"] + healAmount})
+        return healAmount
+
     async def handleTreasureRoom(self, interaction: discord.Interaction, room, character):
-        coinsFound = random.randint(20, 100)
-        self.db.updateCharacter(self.userID, {"coins": character["coins"] + coinsFound})
+        coinsFound = self.dungeon.rng.randint(20, 100)
+        await self.db.runInTransaction(self._addCoins, coinsFound)
         room.clear()
+        await self.saveProgress()
         self.addToActionLog(f"Found {coinsFound} coins in a treasure chest!")
         embed = discord.Embed(
             title = "💰 Treasure Found! 💰",
@@ -209,11 +241,11 @@ class DungeonView(discord.ui.View):
         )
         await interaction.followup.send(embed = embed, ephemeral = True)
 
-        updatedEmbed = self.createDungeonEmbed()
+        updatedEmbed = await self.createDungeonEmbed()
         await interaction.edit_original_response(embed = updatedEmbed, view = self)
     
     async def handleCombatRoom(self, interaction: discord.Interaction, room, character):
-        if hasattr(self.bot, "combatSystem") and self.bot.combatSystem.isInCombat(self.userID):
+        if hasattr(self.bot, "combatSystem") and self.bot.combatSystem.getCombatState(self.userID):
             embed = discord.Embed(
                 title = "⚔️ Already in Combat! ⚔️",
                 description = "You're already fighting a monster! Finish your current fight first before exploring a dungeon!",
@@ -230,7 +262,7 @@ class DungeonView(discord.ui.View):
         await interaction.followup.send(embed = embed, ephemeral = True)
 
     async def handleTrapRoom(self, interaction: discord.Interaction, room, character):
-        if random.randint(1, 100) <= 30:
+        if self.dungeon.rng.randint(1, 100) <= 30:
             embed = discord.Embed(
                 title = "🕳️ Trap Avoided! 🕳️",
                 description = "You carefully navigated around the traps in this room.",
@@ -238,9 +270,8 @@ class DungeonView(discord.ui.View):
             )
             self.addToActionLog("You successfully avoided the traps!")
         else:
-            damage = random.randint(5, 15)
-            newHealth = max(1, character["health"] - damage)
-            self.db.updateCharacter(self.userID, {"health": newHealth})
+            damage = self.dungeon.rng.randint(5, 15)
+            await self.db.runInTransaction(self._takeDamage, damage)
             self.addToActionLog(f"You triggered a trap! You lost {damage} health!")
 
             embed = discord.Embed(
@@ -250,15 +281,14 @@ class DungeonView(discord.ui.View):
             )
         
         room.clear()
+        await self.saveProgress()
         await interaction.followup.send(embed = embed, ephemeral = True)
-        updatedEmbed = self.createDungeonEmbed()
+        updatedEmbed = await self.createDungeonEmbed()
         await interaction.edit_original_response(embed = updatedEmbed, view = self)
 
     async def handleHealingRoom(self, interaction: discord.Interaction, room, character):
-        healAmount = min(30, character["maxHealth"] - character["health"])
+        healAmount = await self.db.runInTransaction(self._heal, 30)
         if healAmount > 0:
-            newHealth = character["health"] + healAmount
-            self.db.updateCharacter(self.userID, {"health": newHealth})
             self.addToActionLog(f"You healed for {healAmount} health at the spring!")
 
             embed = discord.Embed(
@@ -274,8 +304,9 @@ class DungeonView(discord.ui.View):
             )
         
         room.clear()
+        await self.saveProgress()
         await interaction.followup.send(embed = embed, ephemeral = True)
-        updatedEmbed = self.createDungeonEmbed()
+        updatedEmbed = await self.createDungeonEmbed()
         await interaction.edit_original_response(embed = updatedEmbed, view = self)
 
     async def handleShopRoom(self, interaction: discord.Interaction, room, character):
@@ -286,13 +317,13 @@ class DungeonView(discord.ui.View):
         )
         await interaction.followup.send(embed = embed, ephemeral = True)
     
-    async def handlePuzzleRoom(self, interaction: discord.Interactions, room, character):
-        correctAnswer = random.randint(1, 3)
-        userGuess = random.randint(1, 3)
+    async def handlePuzzleRoom(self, interaction: discord.Interaction, room, character):
+        correctAnswer = self.dungeon.rng.randint(1, 3)
+        userGuess = self.dungeon.rng.randint(1, 3)
 
         if userGuess == correctAnswer:
-            reward = random.randint(10, 30)
-            self.db.updateCharacter(self.userID, {"coins": character["coins"] + reward})
+            reward = self.dungeon.rng.randint(10, 30)
+            await self.db.runInTransaction(self._addCoins, reward)
             self.addToActionLog(f"You solved the puzzle! You gained {reward} coins.")
 
             embed = discord.Embed(
@@ -308,8 +339,9 @@ class DungeonView(discord.ui.View):
             )
         
         room.clear()
+        await self.saveProgress()
         await interaction.followup.send(embed = embed, ephemeral = True)
-        updatedEmbed = self.createDungeonEmbed()
+        updatedEmbed = await self.createDungeonEmbed()
         await interaction.edit_original_response(embed = updatedEmbed, view = self)
     
     async def leaveDungeon(self, interaction: discord.Interaction):
@@ -324,7 +356,13 @@ class DungeonView(discord.ui.View):
         
         await interaction.response.edit_message(embed = embed, view = self)
         self.stop()
+        await self.db.deleteDungeon(self.userID)
+
+async def dungeonView(bot, userID: str) -> DungeonView:
+    dungeon = await bot.dungeonPool.take(defaultDungeonConfig) # <= Generated ahead of time by the pool worker
+    return DungeonView(bot, userID, dungeon)
 
-def dungeonView(bot, userID: str) -> DungeonView:
-    dungeon = MiniDungeon(size = 4)
-    return DungeonView(bot, userID, dungeon)
\ No newline at end of file
+# === Rebuilds the view of a checkpointed run, None when the run can't be regenerated anymore ===
+def resumeDungeonView(bot, userID: str, state: tuple) -> DungeonView:
+    dungeon = MiniDungeon.restore(defaultDungeonConfig, *state)
+    return DungeonView(bot, userID, dungeon) if dungeon else None
\ No newline at end of file
@@ -27,8 +27,8 @@ class ShopView(discord.ui.View):
         endIDX = startIDX + self.itemsPerPage
         return self.bot.shopItems[startIDX:endIDX]
     
-    def createEmbed(self):
-        character = self.bot.db.getCharacter(self.userID)
+    async def createEmbed(self):
+        character = await self.bot.db.getCharacter(self.userID)
         if not character:
             return discord.Embed(
                 title = "You're not in the guild!",
@@ -75,7 +75,7 @@ class ShopView(discord.ui.View):
         if self.page > 1:
             self.page -= 1
             self.updateButtons()
-            embed = self.createEmbed()
+            embed = await self.createEmbed()
             await interaction.response.edit_message(embed = embed, view = self)
     
     @discord.ui.button(label = "Next ▶", style = discord.ButtonStyle.primary, custom_id = "nextPage")
@@ -83,7 +83,7 @@ class ShopView(discord.ui.View):
         if self.page < self.totalPages:
             self.page += 1
             self.updateButtons()
-            embed = self.createEmbed()
+            embed = await self.createEmbed()
             await interaction.response.edit_message(embed = embed, view = self)
     
     @discord.ui.button(label = "🛒 Buy Item", style = discord.ButtonStyle.primary)
@@ -137,7 +137,7 @@ class BuyItemModal(discord.ui.Modal, title = "Buy Item"):
     )
 
     async def on_submit(self, interaction: discord.Interaction):
-        character = self.bot.db.getCharacter(self.userID)
+        character = await self.bot.db.getCharacter(self.userID)
         if not character:
             embed = discord.Embed(
                 title = "You're not in the guild.",
@@ -147,7 +147,7 @@ class BuyItemModal(discord.ui.Modal, title = "Buy Item"):
             await interaction.response.send_message(embed = embed, ephemeral = True, delete_after = 3)
             return
 
-        item = next((item for item in self.bot.shopItems if item["name"].lower() == self.itemName.value.lower()), None)
+        item = self.bot.catalog.shopItem(self.itemName.value)
         if not item:
             embed = discord.Embed(
                 title = f"We don't have {self.itemName.value} in the store!",
@@ -166,10 +166,8 @@ class BuyItemModal(discord.ui.Modal, title = "Buy Item"):
             await interaction.response.send_message(embed = embed, ephemeral = True)
             return
         
-        if self.bot.db.addItem(self.userID, item["name"], 1):
-            newCoins = character["coins"] - item["buyPrice"]
-            self.bot.db.updateCharacter(self.userID, {"coins": newCoins})
-            shopEmbed = self.shopView.createEmbed()
+        if await self.bot.db.buyItem(self.userID, item["name"], item["buyPrice"]):
+            shopEmbed = await self.shopView.createEmbed()
             shopEmbed.add_field(
                 name = "✅ Purchase Successful! ✅",
                 value = f"You bought **{item['name']}** for {item['buyPrice']} coins!",
@@ -181,7 +179,7 @@ class BuyItemModal(discord.ui.Modal, title = "Buy Item"):
             await asyncio.sleep(2)
 
             try:
-                normalEmbed = self.shopView.createEmbed()
+                normalEmbed = await self.shopView.createEmbed()
                 await interaction.edit_original_response(embed = normalEmbed, view = self.shopView)
             except:
                 pass
@@ -209,7 +207,7 @@ class SellItemModal(discord.ui.Modal, title = "Sell Item"):
     )
 
     async def on_submit(self, interaction: discord.Interaction):
-        character = self.bot.db.getCharacter(self.userID)
+        character = await self.bot.db.getCharacter(self.userID)
 
         if not character:
             embed = discord.Embed(
@@ -220,7 +218,7 @@ class SellItemModal(discord.ui.Modal, title = "Sell Item"):
             await interaction.response.send_message(embed = embed, ephemeral = True)
             return
         
-        inventory = self.bot.db.getInventory(self.userID)
+        inventory = await self.bot.db.getInventory(self.userID)
         inventoryDict = dict(inventory) if inventory else {}    
         actualItemName = None
 
@@ -238,25 +236,7 @@ class SellItemModal(discord.ui.Modal, title = "Sell Item"):
             await interaction.response.send_message(embed = embed, ephemeral = True)
             return
         
-        item = None
-        for shopItem in self.bot.shopItems:
-            if shopItem["name"].lower() == actualItemName.lower():
-                item = shopItem
-                break
-
-        if not item:
-            for area in self.bot.areas.values():
-                for monster in area["monsters"]:
-                    loot = monster["lootTable"].get(actualItemName)
-                    if loot:
-                        item = {
-                            "name": actualItemName,
-                            "sellPrice": loot["sellPrice"],
-                            "description": loot["description"]
-                        }
-                        break
-                if item:
-                    break
+        item = self.bot.catalog.sellableItem(actualItemName)
         if not item:
             embed = discord.Embed(
                 title = "That item can't be sold!",
@@ -276,12 +256,9 @@ class SellItemModal(discord.ui.Modal, title = "Sell Item"):
             await interaction.response.send_message(embed = embed, ephemeral = True)
             return
         
-        removalSuccess = self.bot.db.removeItem(self.userID, actualItemName, 1)
-        if removalSuccess:
-            newCoins = character["coins"] + sellPrice
-            self.bot.db.updateCharacter(self.userID, {"coins": newCoins})
-
-            shopEmbed = self.shopView.createEmbed()
+        saleSuccess = await self.bot.db.sellItem(self.userID, actualItemName, sellPrice)
+        if saleSuccess:
+            shopEmbed = await self.shopView.createEmbed()
             shopEmbed.add_field(
                 name = "💰 Sale Successful! 💰",
                 value = f"You sold **{actualItemName}** for {sellPrice} coins!",
@@ -292,7 +269,7 @@ class SellItemModal(discord.ui.Modal, title = "Sell Item"):
             await asyncio.sleep(2)
 
             try:
-                normalEmbed = self.shopView.createEmbed()
+                normalEmbed = await self.shopView.createEmbed()
                 await interaction.edit_original_response(embed = normalEmbed, view = self.shopView)
             except:
                 pass